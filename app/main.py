@@ -4,8 +4,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from sqlalchemy import text
 from app.database import engine, Base, SessionLocal
-from app.routers import professionals, projects, offers, auth
+from app.migrations import run_migrations
+from app.routers import professionals, projects, offers, auth, jobs, exports
 from app.dependencies import get_current_user
+from app.services.calendar_service import (
+    get_calendar_service,
+    get_calendar_cache_stats,
+)
 import os
 import logging
 import sys
@@ -24,10 +29,16 @@ logger.info("Starting Consultancy Pricing API")
 try:
     Base.metadata.create_all(bind=engine)
     logger.info("Database tables created/verified successfully")
+    applied_migrations = run_migrations(engine)
+    if applied_migrations:
+        logger.info(f"Database migrations applied: {applied_migrations}")
 except Exception as e:
-    logger.error(f"Failed to create database tables: {str(e)}")
+    logger.error(f"Failed to create or migrate database tables: {str(e)}")
     raise
 
+# Build the shared business-day calendar once per worker, before the first request
+get_calendar_service(country_code="BR")
+
 app = FastAPI(title="Consultancy Pricing API")
 
 # CORS configuration based on environment
@@ -87,6 +98,14 @@ app.include_router(
     projects.router, tags=["Projects"],
     dependencies=[Depends(get_current_user)]
 )
+app.include_router(
+    jobs.router, tags=["Jobs"],
+    dependencies=[Depends(get_current_user)]
+)
+app.include_router(
+    exports.router, tags=["Exports"],
+    dependencies=[Depends(get_current_user)]
+)
 logger.info("API routers registered successfully")
 
 frontend_dir = os.path.join(os.path.dirname(__file__), "../frontend")
@@ -117,3 +136,9 @@ def health_check():
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
         return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
+
+
+@app.get("/metrics")
+def metrics():
+    """In-process cache counters for monitoring systems."""
+    return {"weekly_breakdown_cache": get_calendar_cache_stats()}
@@ -0,0 +1,114 @@
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.manage migrate
+    python -m app.manage check-totals [--project-id ID ...]
+    python -m app.manage rebuild-totals [--project-id ID ...]
+    python -m app.manage repack-weekly [--project-id ID ...]
+"""
+
+import argparse
+import logging
+import sys
+
+from sqlalchemy import select
+
+from app.database import SessionLocal, engine
+from app.migrations import run_migrations
+from app.models import models
+from app.services.pricing_service import PricingService
+from app.services.project_allocation_service import ProjectAllocationService
+
+logger = logging.getLogger(__name__)
+
+
+def migrate(args) -> int:
+    applied = run_migrations(engine)
+    print(f"Migrations applied: {applied or 'none'}")
+    return 0
+
+
+def check_totals(args) -> int:
+    db = SessionLocal()
+    try:
+        mismatches = PricingService(db).check_totals(args.project_id)
+    finally:
+        db.close()
+
+    for mismatch in mismatches:
+        print(
+            f"Project {mismatch['project_id']}: "
+            f"stored={mismatch['stored']} expected={mismatch['expected']}"
+        )
+    print(f"{len(mismatches)} project(s) with inconsistent totals")
+    return 1 if mismatches else 0
+
+
+def rebuild_totals(args) -> int:
+    db = SessionLocal()
+    try:
+        PricingService(db).rebuild_totals(args.project_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print("Pricing totals rebuilt")
+    return 0
+
+
+def repack_weekly(args) -> int:
+    db = SessionLocal()
+    try:
+        project_ids = (
+            args.project_id
+            or db.scalars(select(models.Project.id).order_by(models.Project.id)).all()
+        )
+        service = ProjectAllocationService(db)
+        repacked = 0
+        # One transaction per project keeps the UPDATE batches bounded
+        for project_id in project_ids:
+            repacked += service.repack_weekly_hours(project_id=project_id)
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print(f"Weekly hours repacked for {repacked} allocation(s)")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser(
+        "migrate", help="Apply pending schema migrations"
+    )
+    migrate_parser.set_defaults(handler=migrate)
+    for name, handler, help_text in [
+        ("check-totals", check_totals, "Compare stored pricing totals with weeks"),
+        ("rebuild-totals", rebuild_totals, "Recompute stored pricing totals"),
+        ("repack-weekly", repack_weekly, "Rewrite packed weekly hours from rows"),
+    ]:
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument(
+            "--project-id", type=int, action="append", help="Restrict to project(s)"
+        )
+        subparser.set_defaults(handler=handler)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
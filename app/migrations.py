@@ -0,0 +1,150 @@
+"""
+Schema migrations for existing databases.
+
+Base.metadata.create_all only creates missing tables, so columns, constraints
+and indexes added to tables that already exist are applied here, in order and
+once per database (tracked in the schema_migrations table).
+"""
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for pg_advisory_xact_lock, serializing workers that start together
+MIGRATION_LOCK_KEY = 7_215_001
+
+MIGRATIONS: list[tuple[str, list[str]]] = [
+    (
+        "0001_pricing_totals",
+        [
+            "ALTER TABLE project_allocations "
+            "ADD COLUMN IF NOT EXISTS total_hours DOUBLE PRECISION NOT NULL DEFAULT 0, "
+            "ADD COLUMN IF NOT EXISTS total_cost DOUBLE PRECISION NOT NULL DEFAULT 0, "
+            "ADD COLUMN IF NOT EXISTS total_selling DOUBLE PRECISION NOT NULL DEFAULT 0",
+            "ALTER TABLE projects "
+            "ADD COLUMN IF NOT EXISTS total_hours DOUBLE PRECISION NOT NULL DEFAULT 0, "
+            "ADD COLUMN IF NOT EXISTS total_cost DOUBLE PRECISION NOT NULL DEFAULT 0, "
+            "ADD COLUMN IF NOT EXISTS total_selling DOUBLE PRECISION NOT NULL DEFAULT 0",
+            """
+            UPDATE project_allocations pa SET
+                total_hours = t.hours,
+                total_cost = t.hours * pa.cost_hourly_rate,
+                total_selling = t.hours * pa.selling_hourly_rate
+            FROM (
+                SELECT allocation_id, SUM(hours_allocated) AS hours
+                FROM weekly_allocations GROUP BY allocation_id
+            ) t
+            WHERE t.allocation_id = pa.id
+            """,
+            """
+            UPDATE projects p SET
+                total_hours = t.hours,
+                total_cost = t.cost,
+                total_selling = t.selling
+            FROM (
+                SELECT project_id,
+                       SUM(total_hours) AS hours,
+                       SUM(total_cost) AS cost,
+                       SUM(total_selling) AS selling
+                FROM project_allocations GROUP BY project_id
+            ) t
+            WHERE t.project_id = p.id
+            """,
+        ],
+    ),
+    (
+        "0002_cascade_project_deletes",
+        [
+            "ALTER TABLE project_allocations "
+            "DROP CONSTRAINT IF EXISTS project_allocations_project_id_fkey, "
+            "ADD CONSTRAINT project_allocations_project_id_fkey "
+            "FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE",
+            "ALTER TABLE weekly_allocations "
+            "DROP CONSTRAINT IF EXISTS weekly_allocations_allocation_id_fkey, "
+            "ADD CONSTRAINT weekly_allocations_allocation_id_fkey "
+            "FOREIGN KEY (allocation_id) REFERENCES project_allocations (id) "
+            "ON DELETE CASCADE",
+            "CREATE INDEX IF NOT EXISTS ix_project_allocations_project_id "
+            "ON project_allocations (project_id)",
+            "CREATE INDEX IF NOT EXISTS ix_weekly_allocations_allocation_id "
+            "ON weekly_allocations (allocation_id)",
+        ],
+    ),
+    (
+        # Filled by `python -m app.manage repack-weekly`; allocations without
+        # a packed value are read from their rows
+        "0003_weekly_hours_packed",
+        [
+            "ALTER TABLE project_allocations "
+            "ADD COLUMN IF NOT EXISTS weekly_hours_packed BYTEA",
+        ],
+    ),
+    (
+        "0004_lower_name_keyset_indexes",
+        [
+            "CREATE INDEX IF NOT EXISTS ix_professionals_lower_name_id "
+            "ON professionals (lower(name), id)",
+            "CREATE INDEX IF NOT EXISTS ix_projects_lower_name_id "
+            "ON projects (lower(name), id)",
+        ],
+    ),
+    (
+        # Trigram indexes for app/services/search_service.py. They live only
+        # here (not in the models) because create_all runs before the
+        # extension exists on a fresh database.
+        "0005_trigram_search_indexes",
+        [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            *[
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm "
+                f"ON {table} USING gin ({column} gin_trgm_ops)"
+                for table, column in [
+                    ("professionals", "name"),
+                    ("professionals", "pid"),
+                    ("professionals", "role"),
+                    ("professionals", "level"),
+                    ("projects", "name"),
+                ]
+            ],
+        ],
+    ),
+]
+
+
+def run_migrations(engine: Engine) -> list[str]:
+    """Apply pending migrations and return the versions applied."""
+    if engine.dialect.name != "postgresql":
+        # Other dialects are only used for fresh databases built by create_all
+        logger.info(f"Skipping migrations for dialect: {engine.dialect.name}")
+        return []
+
+    applied_now = []
+    with engine.begin() as conn:
+        conn.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                "version VARCHAR PRIMARY KEY, "
+                "applied_at TIMESTAMP NOT NULL DEFAULT now())"
+            )
+        )
+        applied = set(conn.scalars(text("SELECT version FROM schema_migrations")))
+
+        for version, statements in MIGRATIONS:
+            if version in applied:
+                continue
+            logger.info(f"Applying migration: {version}")
+            for statement in statements:
+                conn.execute(text(statement))
+            conn.execute(
+                text("INSERT INTO schema_migrations (version) VALUES (:version)"),
+                {"version": version},
+            )
+            applied_now.append(version)
+
+    return applied_now
@@ -1,6 +1,20 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Float, Date
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Index,
+    func,
+    Column,
+    Integer,
+    String,
+    Boolean,
+    ForeignKey,
+    Float,
+    Date,
+    DateTime,
+    JSON,
+    LargeBinary,
+)
+from sqlalchemy.orm import deferred, relationship
 from app.database import Base
+from datetime import datetime
 
 
 class Professional(Base):
@@ -18,6 +32,9 @@ class Professional(Base):
         "ProjectAllocation", back_populates="professional"
     )
 
+    # Keyset pagination order of the listings (app/pagination.py)
+    __table_args__ = (Index("ix_professionals_lower_name_id", func.lower(name), id),)
+
 
 class Offer(Base):
     __tablename__ = "offers"
@@ -51,15 +68,32 @@ class Project(Base):
     tax_rate = Column(Float, default=0.0, nullable=False)
     margin_rate = Column(Float, default=0.0, nullable=False)
     locked = Column(Boolean, default=False, nullable=False)
+    # Running totals maintained by ProjectAllocationService (see PricingService.rebuild_totals)
+    total_hours = Column(Float, default=0.0, nullable=False)
+    total_cost = Column(Float, default=0.0, nullable=False)
+    total_selling = Column(Float, default=0.0, nullable=False)
+
+    allocations = relationship(
+        "ProjectAllocation",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
-    allocations = relationship("ProjectAllocation", back_populates="project")
+    # Keyset pagination order of the listings (app/pagination.py)
+    __table_args__ = (Index("ix_projects_lower_name_id", func.lower(name), id),)
 
 
 class ProjectAllocation(Base):
     __tablename__ = "project_allocations"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(
+        Integer,
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
     professional_id = Column(Integer, ForeignKey("professionals.id"), nullable=False)
     cost_hourly_rate = Column(
         Float, default=0.0, nullable=False
@@ -67,11 +101,21 @@ class ProjectAllocation(Base):
     selling_hourly_rate = Column(
         Float, default=0.0, nullable=False
     )  # Fixed selling rate for this professional in this project
+    # Running totals of the weekly allocations below, at this allocation's rates
+    total_hours = Column(Float, default=0.0, nullable=False)
+    total_cost = Column(Float, default=0.0, nullable=False)
+    total_selling = Column(Float, default=0.0, nullable=False)
+    # Packed copy of the weekly allocations below (see app/serializers.py);
+    # deferred so it is only loaded by the compact read path
+    weekly_hours_packed = deferred(Column(LargeBinary, nullable=True))
 
     project = relationship("Project", back_populates="allocations")
     professional = relationship("Professional", back_populates="project_allocations")
     weekly_allocations = relationship(
-        "WeeklyAllocation", back_populates="allocation", cascade="all, delete-orphan"
+        "WeeklyAllocation",
+        back_populates="allocation",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
 
@@ -80,7 +124,10 @@ class WeeklyAllocation(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     allocation_id = Column(
-        Integer, ForeignKey("project_allocations.id"), nullable=False
+        Integer,
+        ForeignKey("project_allocations.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
     )
     week_number = Column(Integer, nullable=False)  # Sequential: 1, 2, 3...
     hours_allocated = Column(Float, default=0.0, nullable=False)
@@ -89,3 +136,21 @@ class WeeklyAllocation(Base):
     )  # Business hours available in this week
 
     allocation = relationship("ProjectAllocation", back_populates="weekly_allocations")
+
+
+class BackgroundJob(Base):
+    """Status of a job run by app/services/job_runner.py, shared by all workers."""
+
+    __tablename__ = "background_jobs"
+
+    id = Column(String(32), primary_key=True)
+    kind = Column(String, nullable=False)
+    status = Column(
+        String, default="queued", nullable=False
+    )  # queued, running, succeeded, failed
+    progress = Column(JSON, default=dict, nullable=False)
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,71 @@
+"""
+Keyset (cursor) pagination for listings ordered by (lower(name), id).
+
+The cursor is an opaque URL-safe token wrapping the sort key of the last item
+of a page; the next page starts right after it, so deep pages cost the same
+as the first one (served by the (lower(name), id) expression indexes).
+"""
+
+import base64
+import binascii
+import json
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """Decode a cursor token or raise 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError, binascii.Error):
+        payload = None
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    return payload
+
+
+def paginate_by_name(
+    query: Query,
+    model,
+    *,
+    limit: int,
+    skip: int = 0,
+    cursor: str | None = None,
+) -> tuple[list, str | None]:
+    """
+    Page of query ordered by (lower(name), id), starting after cursor (and
+    then skipping skip rows, kept for offset-based clients).
+    Returns the items and the cursor of the next page (None on the last page).
+    """
+    sort_key = (func.lower(model.name), model.id)
+    if cursor:
+        payload = decode_cursor(cursor)
+        if not isinstance(payload.get("name"), str) or not isinstance(
+            payload.get("id"), int
+        ):
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        query = query.filter(tuple_(*sort_key) > tuple_(payload["name"], payload["id"]))
+
+    # lower(name) is read back from the database so the cursor matches the
+    # database collation rather than Python's str.lower
+    query = query.add_columns(sort_key[0]).order_by(*sort_key)
+    if skip:
+        query = query.offset(skip)
+    # One extra row tells whether there is a next page without a count
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last, last_name = rows[-1]
+        next_cursor = encode_cursor({"name": last_name, "id": last.id})
+    return [row[0] for row in rows], next_cursor
@@ -0,0 +1,182 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from datetime import datetime
+import logging
+
+from app.database import get_db
+from app.models import models
+from app.schemas import schemas
+from app.services.excel_service import iter_file
+from app.services.export_cache import get_export_cache
+from app.services.job_runner import get_export_job_runner
+from app.services.portfolio_export_service import PortfolioExportService
+from app.services.project_export_service import EXPORT_FORMATS, run_export_job
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+EXPORT_JOB_KIND = "project_export"
+
+
+def _ensure_export_cache_enabled() -> None:
+    if not get_export_cache().enabled:
+        raise HTTPException(
+            status_code=400,
+            detail="Exportação assíncrona requer o cache de exportações (EXPORT_CACHE_MAX_BYTES maior que 0)",
+        )
+
+
+def _get_export_job_or_404(job_id: str) -> models.BackgroundJob:
+    job = get_export_job_runner().get(job_id)
+    if job is None or job.kind != EXPORT_JOB_KIND:
+        logger.warning(f"Export job not found: id={job_id}")
+        raise HTTPException(status_code=404, detail="Exportação não encontrada")
+    return job
+
+
+@router.post(
+    "/projects/exports/zip",
+    responses={400: {"model": schemas.ErrorResponse}},
+)
+def export_projects_zip(
+    request: schemas.ProjectBulkExportRequest, db: Session = Depends(get_db)
+):
+    """
+    Export several projects (by id or by a search over the name) as one ZIP
+    with a file per project. Files are rendered in parallel in the export
+    process pool (cached exports are reused) and the archive is streamed as
+    they are ready. Projects that could not be exported are listed in
+    erros.txt inside the archive.
+    """
+    _ensure_export_cache_enabled()
+    portfolio_service = PortfolioExportService(db)
+    project_ids = portfolio_service.resolve_project_ids(
+        request.project_ids, request.search
+    )
+    logger.info(
+        f"Exporting projects as ZIP: projects={len(project_ids)}, format={request.format}"
+    )
+    chunks = portfolio_service.zip_exports(project_ids, request.format)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return StreamingResponse(
+        chunks,
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename=projetos_{timestamp}.zip"
+        },
+    )
+
+
+@router.post(
+    "/projects/exports/portfolio",
+    responses={400: {"model": schemas.ErrorResponse}},
+)
+def export_portfolio_workbook(
+    request: schemas.ProjectSelection, db: Session = Depends(get_db)
+):
+    """
+    Export several projects (by id or by a search over the name) as one
+    Excel workbook: a summary sheet with the pricing totals of each project
+    and one allocation table sheet per project.
+    """
+    portfolio_service = PortfolioExportService(db)
+    project_ids = portfolio_service.resolve_project_ids(
+        request.project_ids, request.search
+    )
+    logger.info(f"Exporting portfolio workbook: projects={len(project_ids)}")
+    file = portfolio_service.portfolio_workbook(project_ids)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return StreamingResponse(
+        iter_file(file),
+        media_type=EXPORT_FORMATS["xlsx"][0],
+        headers={
+            "Content-Disposition": f"attachment; filename=portfolio_{timestamp}.xlsx"
+        },
+    )
+
+
+@router.post(
+    "/projects/{project_id}/exports",
+    status_code=202,
+    responses={
+        400: {"model": schemas.ErrorResponse},
+        404: {"model": schemas.ErrorResponse},
+    },
+)
+def create_project_export(
+    project_id: int, format: str = "xlsx", db: Session = Depends(get_db)
+):
+    """
+    Queue an Excel or PNG export of a project, rendered in a separate
+    process (at most EXPORT_MAX_WORKERS at a time per worker).
+    Poll GET /exports/{job_id} and download from GET /exports/{job_id}/download.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400, detail="Formato inválido. Use 'xlsx' ou 'png'."
+        )
+    _ensure_export_cache_enabled()
+    if db.get(models.Project, project_id) is None:
+        logger.warning(f"Project not found: id={project_id}")
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+
+    job_id = get_export_job_runner().submit(
+        EXPORT_JOB_KIND, run_export_job, project_id, format
+    )
+    logger.info(
+        f"Export queued: project_id={project_id}, format={format}, job_id={job_id}"
+    )
+    return {"message": "Exportação enfileirada", "job_id": job_id}
+
+
+@router.get(
+    "/exports/{job_id}",
+    response_model=schemas.Job,
+    responses={404: {"model": schemas.ErrorResponse}},
+)
+def read_export(job_id: str):
+    """Status of an export job; once it succeeds, result has the filename."""
+    return _get_export_job_or_404(job_id)
+
+
+@router.get(
+    "/exports/{job_id}/download",
+    responses={
+        404: {"model": schemas.ErrorResponse},
+        409: {"model": schemas.ErrorResponse},
+        410: {"model": schemas.ErrorResponse},
+    },
+)
+def download_export(job_id: str):
+    """Download the file of a finished export job."""
+    job = _get_export_job_or_404(job_id)
+    if job.status == "failed":
+        raise HTTPException(status_code=409, detail=f"Exportação falhou: {job.error}")
+    if job.status != "succeeded":
+        raise HTTPException(
+            status_code=409,
+            detail=f"Exportação ainda não concluída (status: {job.status})",
+        )
+
+    # The file lives in the export cache and may have been evicted since
+    path = get_export_cache().get(job.result["cache_key"])
+    if path is None:
+        logger.warning(f"Export file evicted: job_id={job_id}")
+        raise HTTPException(
+            status_code=410, detail="Arquivo de exportação expirado, gere novamente"
+        )
+
+    logger.info(
+        f"Export downloaded: job_id={job_id}, filename={job.result['filename']}"
+    )
+    return StreamingResponse(
+        iter_file(open(path, "rb")),
+        media_type=job.result["media_type"],
+        headers={
+            "ETag": f'"{job.result["cache_key"]}"',
+            "Content-Disposition": f"attachment; filename={job.result['filename']}",
+        },
+    )
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, HTTPException
+import logging
+
+from app.schemas import schemas
+from app.services.job_runner import get_job_runner
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=schemas.Job,
+    responses={404: {"model": schemas.ErrorResponse}},
+)
+def read_job(job_id: str):
+    """
+    Status of a background job: rows processed, created/updated/error counts
+    and per-line errors are in progress (and in result once it succeeds).
+    """
+    job = get_job_runner().get(job_id)
+    if job is None:
+        logger.warning(f"Job not found: id={job_id}")
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    return job
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
@@ -8,6 +9,7 @@ import logging
 from app.database import get_db
 from app.models import models
 from app.schemas import schemas
+from app import serializers
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -93,7 +95,9 @@ def create_offer(offer: schemas.OfferCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=f"Erro ao criar oferta: {str(e)}")
 
 
-@router.get("/offers/", response_model=List[schemas.Offer])
+@router.get(
+    "/offers/", response_model=List[schemas.Offer], response_class=ORJSONResponse
+)
 def read_offers(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """List all offer templates"""
     offers = (
@@ -105,7 +109,9 @@ def read_offers(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
         .all()
     )
     logger.debug(f"Retrieved {len(offers)} offers (skip={skip}, limit={limit})")
-    return offers
+    return serializers.trusted_response(
+        [serializers.offer_to_dict(offer) for offer in offers], List[schemas.Offer]
+    )
 
 
 @router.get(
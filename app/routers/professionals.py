@@ -1,15 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 from typing import Optional
 import csv
 import io
 import logging
+import shutil
+import tempfile
 
 from app.database import get_db
 from app.models import models
 from app.schemas import schemas
+from app.pagination import paginate_by_name
+from app.services.job_runner import get_job_runner
+from app.services.professional_import_service import (
+    ProfessionalImportService,
+    run_import_job,
+)
+from app.services.search_service import SearchService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -75,39 +83,47 @@ def create_professional(
     "/professionals/", response_model=schemas.PaginatedResponse[schemas.Professional]
 )
 def read_professionals(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
     search: str = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: Session = Depends(get_db),
 ):
     """
     List all professionals with pagination.
 
     Args:
-        skip: Number of records to skip
+        skip: Number of records to skip (kept for backward compatibility; prefer cursor)
         limit: Maximum number of records to return
-        search: Optional search term to filter professionals by name
+        search: Optional fuzzy search over name, pid, role and level (ranked by similarity)
+        cursor: next_cursor of the previous page
+        include_total: Whether to count the matching records
 
     Returns:
-        PaginatedResponse[Professional]: {"items": List[Professional], "total": int}
+        PaginatedResponse[Professional]: {"items": List[Professional], "total": int | None, "next_cursor": str | None}
     """
     # Base query
     base_query = db.query(models.Professional)
 
-    # Aplicar filtro de busca se fornecido
     if search:
-        base_query = base_query.filter(models.Professional.name.ilike(f"%{search}%"))
-
-    # Calcula total antes de aplicar offset/limit (considerando filtro de busca)
-    total_count = base_query.count()
+        # Busca por similaridade (trigramas), ordenada por relevância
+        professionals, total_count, next_cursor = SearchService(db).search_page(
+            base_query,
+            models.Professional,
+            search,
+            limit=limit,
+            skip=skip,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    else:
+        total_count = base_query.count() if include_total else None
 
-    # Busca profissionais
-    professionals = (
-        base_query.order_by(func.lower(models.Professional.name))
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+        # Busca profissionais a partir do cursor, ordenados por (lower(name), id)
+        professionals, next_cursor = paginate_by_name(
+            base_query, models.Professional, limit=limit, skip=skip, cursor=cursor
+        )
 
     logger.debug(
         "Retrieved %s professionals (skip=%s, limit=%s, total=%s, search=%s)",
@@ -117,7 +133,9 @@ def read_professionals(
         total_count,
         search,
     )
-    return schemas.PaginatedResponse(items=professionals, total=total_count)
+    return schemas.PaginatedResponse(
+        items=professionals, total=total_count, next_cursor=next_cursor
+    )
 
 
 @router.get("/professionals/{professional_id}", response_model=schemas.Professional)
@@ -193,97 +211,67 @@ def delete_professional(professional_id: int, db: Session = Depends(get_db)):
     }
 
 
-@router.post("/professionals/import-csv")
-async def import_professionals_csv(
-    file: UploadFile = File(...), db: Session = Depends(get_db)
+@router.post(
+    "/professionals/import-csv",
+    responses={202: {"description": "Importação enfileirada (async=true)"}},
+)
+def import_professionals_csv(
+    response: Response,
+    file: UploadFile = File(...),
+    run_async: bool = Query(False, alias="async"),
+    db: Session = Depends(get_db),
 ):
     """
     Import professionals from CSV file.
     Expected CSV format: pid,name,role,level,is_template,hourly_cost
     If a professional with the same pid exists, it will be updated.
     Otherwise, a new professional will be created.
+
+    The upload is read incrementally (UTF-8 decoder + csv reader) and written
+    in batches of CSV_IMPORT_BATCH_SIZE rows, each committed on its own, so
+    memory stays constant regardless of the file size. Starlette spools the
+    multipart body to a temporary file before the handler runs, so writing
+    starts once the upload has been received.
+
+    With async=true the upload is copied to a temporary file and imported by
+    a background job; the response (202) carries the job id to poll at
+    GET /jobs/{job_id}.
     """
     if not file.filename.endswith(".csv"):
         logger.warning(f"Invalid file type for CSV import: {file.filename}")
         raise HTTPException(status_code=400, detail="Arquivo deve ser um CSV")
 
+    if run_async:
+        # The spooled upload is closed with the request; the job reads a copy
+        with tempfile.NamedTemporaryFile(
+            prefix="professionals_import_", suffix=".csv", delete=False
+        ) as upload_copy:
+            shutil.copyfileobj(file.file, upload_copy)
+        job_id = get_job_runner().submit(
+            "professionals_csv_import", run_import_job, upload_copy.name, file.filename
+        )
+        logger.info(f"CSV import queued: file={file.filename}, job_id={job_id}")
+        response.status_code = 202
+        return {"message": "Importação enfileirada", "job_id": job_id}
+
     logger.info(f"Starting CSV import from file: {file.filename}")
-    content = await file.read()
-    decoded_content = content.decode("utf-8")
-    csv_reader = csv.DictReader(io.StringIO(decoded_content))
-
-    created_count = 0
-    updated_count = 0
-    error_count = 0
-    errors = []
-
-    # Read all rows into a list to allow for re-indexing if needed, though DictReader is used
-    rows = list(csv_reader)
-
-    for row_num, row in enumerate(
-        rows, start=2
-    ):  # Start at 2 for 1-based line numbers in CSV, assuming header is line 1
-        try:
-            if (
-                not row.get("pid")
-                or not row.get("name")
-                or not row.get("role")
-                or not row.get("level")
-            ):
-                errors.append(
-                    f"Linha {row_num}: Campos obrigatórios faltando (pid, name, role, level)"
-                )
-                error_count += 1
-                continue
-
-            pid = row["pid"].strip()
-            name = row["name"].strip()
-            role = row["role"].strip()
-            level = row["level"].strip()
-
-            # Parse is_template (default to False if not provided or invalid)
-            is_template_str = row.get("is_template", "false").strip().lower()
-            is_template = is_template_str in ["true", "1", "yes", "sim", "verdadeiro"]
-
-            # Parse hourly_cost (default to 0.0 if not provided or invalid)
-            try:
-                hourly_cost = float(row.get("hourly_cost", "0.0").strip())
-            except ValueError:
-                hourly_cost = 0.0
-
-            existing_prof = (
-                db.query(models.Professional)
-                .filter(models.Professional.pid == pid)
-                .first()
-            )
-
-            if existing_prof:
-                existing_prof.name = name
-                existing_prof.role = role
-                existing_prof.level = level
-                existing_prof.is_template = is_template
-                existing_prof.hourly_cost = hourly_cost
-                updated_count += 1
-            else:
-                new_prof = models.Professional(
-                    pid=pid,
-                    name=name,
-                    role=role,
-                    level=level,
-                    is_template=is_template,
-                    hourly_cost=hourly_cost,
-                )
-                db.add(new_prof)
-                created_count += 1
-
-        except Exception as e:
-            errors.append(f"Linha {row_num}: {str(e)}")
-            error_count += 1
+    text_stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    csv_reader = csv.DictReader(text_stream)
 
+    import_service = ProfessionalImportService(db)
     try:
-        db.commit()
+        result = import_service.import_rows(csv_reader, commit=True)
         logger.info(
-            f"CSV import completed: created={created_count}, updated={updated_count}, errors={error_count}"
+            f"CSV import completed: created={result['created']}, updated={result['updated']}, errors={result['errors']}"
+        )
+    except UnicodeDecodeError:
+        db.rollback()
+        logger.warning(
+            f"CSV import stopped on invalid UTF-8: file={file.filename}, {import_service.result()}"
+        )
+        raise HTTPException(
+            status_code=400,
+            detail="Arquivo deve estar codificado em UTF-8 (lotes gravados antes do erro foram mantidos)",
         )
     except Exception as e:
         db.rollback()
@@ -291,14 +279,11 @@ async def import_professionals_csv(
         raise HTTPException(
             status_code=500, detail=f"Erro ao salvar no banco de dados: {str(e)}"
         )
+    finally:
+        # Keep the spooled upload open for Starlette to close it
+        text_stream.detach()
 
-    if error_count > 0:
-        logger.warning(f"CSV import had {error_count} errors")
+    if result["errors"] > 0:
+        logger.warning(f"CSV import had {result['errors']} errors")
 
-    return {
-        "message": "Importação concluída",
-        "created": created_count,
-        "updated": updated_count,
-        "errors": error_count,
-        "error_details": errors,
-    }
+    return {"message": "Importação concluída", **result}
@@ -1,21 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload, undefer
+from sqlalchemy import delete, select, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm.exc import StaleDataError
-from typing import List
+from typing import List, Literal, Optional
 
 import logging
 
 from app.database import get_db
 from app.models import models
 from app.schemas import schemas
+from app import serializers
+from app.pagination import paginate_by_name
 from app.services.pricing_service import PricingService
-from app.services.excel_service import ExcelExportService
-from app.services.png_export_service import PNGExportService
+from app.services.excel_service import iter_file
 from app.services.project_allocation_service import ProjectAllocationService
-from datetime import datetime
+from app.services.project_export_service import (
+    EXPORT_FORMATS,
+    ProjectExportService,
+    generate_export_filename,
+)
+from app.services.search_service import SearchService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -48,6 +53,48 @@ def _get_project_or_404(db: Session, project_id: int) -> models.Project:
     return project
 
 
+def _allocation_graph_loader(packed: bool):
+    """
+    Batched (selectin) loader for project allocations and their professionals,
+    plus either the packed weeks or the weekly allocation rows.
+    """
+    weeks = (
+        undefer(models.ProjectAllocation.weekly_hours_packed)
+        if packed
+        else selectinload(models.ProjectAllocation.weekly_allocations)
+    )
+    return selectinload(models.Project.allocations).options(
+        joinedload(models.ProjectAllocation.professional), weeks
+    )
+
+
+def _get_project_with_packed_weeks_or_404(
+    db: Session, project_id: int
+) -> models.Project:
+    """Fetch project with allocations and their packed weeks (no weekly rows)."""
+    project = (
+        db.query(models.Project)
+        .options(_allocation_graph_loader(packed=True))
+        .filter(models.Project.id == project_id)
+        .first()
+    )
+    if not project:
+        logger.warning(f"Project not found: id={project_id}")
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+    return project
+
+
+def _get_project_without_allocations_or_404(
+    db: Session, project_id: int
+) -> models.Project:
+    """Fetch project row only (no allocation graph) or raise 404."""
+    project = db.query(models.Project).filter(models.Project.id == project_id).first()
+    if not project:
+        logger.warning(f"Project not found: id={project_id}")
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+    return project
+
+
 def _get_professional_or_404(db: Session, professional_id: int) -> models.Professional:
     """Fetch professional or raise 404."""
     professional = (
@@ -61,6 +108,20 @@ def _get_professional_or_404(db: Session, professional_id: int) -> models.Profes
     return professional
 
 
+def _get_professionals_by_id(
+    db: Session, professional_ids: List[int]
+) -> dict[int, models.Professional]:
+    """Fetch several professionals with a single IN query, keyed by id."""
+    if not professional_ids:
+        return {}
+    return {
+        professional.id: professional
+        for professional in db.query(models.Professional).filter(
+            models.Professional.id.in_(set(professional_ids))
+        )
+    }
+
+
 def _get_offer_or_404(db: Session, offer_id: int) -> models.Offer:
     offer = (
         db.query(models.Offer)
@@ -75,16 +136,16 @@ def _get_offer_or_404(db: Session, offer_id: int) -> models.Offer:
 
 
 def _get_allocation_or_404(
-    db: Session, project_id: int, allocation_id: int
+    db: Session, project_id: int, allocation_id: int, for_update: bool = False
 ) -> models.ProjectAllocation:
-    allocation = (
-        db.query(models.ProjectAllocation)
-        .filter(
-            models.ProjectAllocation.id == allocation_id,
-            models.ProjectAllocation.project_id == project_id,
-        )
-        .first()
+    query = db.query(models.ProjectAllocation).filter(
+        models.ProjectAllocation.id == allocation_id,
+        models.ProjectAllocation.project_id == project_id,
     )
+    if for_update:
+        # Locked until commit, so its stored totals can't change meanwhile
+        query = query.with_for_update(of=models.ProjectAllocation)
+    allocation = query.first()
     if not allocation:
         logger.warning(
             f"Allocation not found: project_id={project_id}, allocation_id={allocation_id}"
@@ -93,64 +154,6 @@ def _get_allocation_or_404(
     return allocation
 
 
-def _get_weekly_allocation_or_404(
-    db: Session, project_id: int, weekly_allocation_id: int
-) -> models.WeeklyAllocation:
-    weekly_alloc = (
-        db.query(models.WeeklyAllocation)
-        .join(
-            models.ProjectAllocation,
-            models.ProjectAllocation.id == models.WeeklyAllocation.allocation_id,
-        )
-        .filter(
-            models.WeeklyAllocation.id == weekly_allocation_id,
-            models.ProjectAllocation.project_id == project_id,
-        )
-        .first()
-    )
-    if not weekly_alloc:
-        logger.warning(
-            f"Weekly allocation not found: project_id={project_id}, weekly_allocation_id={weekly_allocation_id}"
-        )
-        raise HTTPException(
-            status_code=404,
-            detail="Alocação semanal não pertence a este projeto ou não existe",
-        )
-    return weekly_alloc
-
-
-def get_project_with_allocations(db: Session, project_id: int) -> models.Project:
-    """Get project with all allocations and related data for exports"""
-    project = (
-        db.query(models.Project)
-        .options(
-            joinedload(models.Project.allocations).joinedload(
-                models.ProjectAllocation.professional
-            ),
-            joinedload(models.Project.allocations).joinedload(
-                models.ProjectAllocation.weekly_allocations
-            ),
-        )
-        .filter(models.Project.id == project_id)
-        .first()
-    )
-    if not project:
-        logger.warning(f"Project not found: id={project_id}")
-        raise HTTPException(status_code=404, detail="Projeto não encontrado")
-    return project
-
-
-def generate_export_filename(
-    project_name: str, extension: str, prefix: str = ""
-) -> str:
-    """Generate standardized export filename with timestamp"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    clean_name = project_name.replace(" ", "_")
-    if prefix:
-        return f"{prefix}_{clean_name}_{timestamp}.{extension}"
-    return f"{clean_name}_{timestamp}.{extension}"
-
-
 @router.post("/projects/", response_model=schemas.Project)
 def create_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)):
     """Create a new project"""
@@ -175,20 +178,35 @@ def create_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)
         # Generate weeks structure
         weeks = allocation_service.get_project_weeks(db_project)
 
+        professionals = _get_professionals_by_id(
+            db, [allocation.professional_id for allocation in project.allocations]
+        )
+        new_allocations = []
         for allocation in project.allocations:
-            prof = _get_professional_or_404(db, allocation.professional_id)
+            prof = professionals.get(allocation.professional_id)
+            if not prof:
+                logger.warning(
+                    f"Professional not found: id={allocation.professional_id}"
+                )
+                raise HTTPException(
+                    status_code=404, detail="Profissional não encontrado"
+                )
 
             selling_rate = allocation_service.calculate_selling_rate(
                 db_project, prof, allocation.selling_hourly_rate
             )
-            allocation_service.create_allocation(
-                project=db_project,
-                professional=prof,
-                selling_hourly_rate=selling_rate,
-                allocation_percentage=0.0,
-                weeks=weeks,
+            new_allocations.append(
+                {
+                    "professional": prof,
+                    "selling_hourly_rate": selling_rate,
+                    "allocation_percentage": 0.0,
+                }
             )
 
+        allocation_service.create_allocations(
+            project=db_project, allocations=new_allocations, weeks=weeks
+        )
+
         db.commit()
         db.refresh(db_project)
         # Ensure allocations and related data are loaded for the response
@@ -212,11 +230,6 @@ def _clone_project_logic(project: schemas.ProjectCreate, db: Session) -> models.
 
     original = (
         db.query(models.Project)
-        .options(
-            joinedload(models.Project.allocations).joinedload(
-                models.ProjectAllocation.weekly_allocations
-            )
-        )
         .filter(models.Project.id == project.from_project_id)
         .first()
     )
@@ -235,10 +248,9 @@ def _clone_project_logic(project: schemas.ProjectCreate, db: Session) -> models.
     db.add(new_project)
     db.flush()
 
-    for orig_alloc in original.allocations:
-        allocation_service.clone_allocation(
-            original=orig_alloc, target_project=new_project
-        )
+    allocation_service.clone_project_allocations(
+        source_project_id=original.id, target_project=new_project
+    )
 
     db.commit()
     db.refresh(new_project)
@@ -250,41 +262,54 @@ def _clone_project_logic(project: schemas.ProjectCreate, db: Session) -> models.
     return new_project
 
 
-@router.get("/projects/", response_model=schemas.PaginatedResponse[schemas.Project])
+@router.get(
+    "/projects/",
+    response_model=schemas.PaginatedResponse[schemas.Project],
+    response_class=ORJSONResponse,
+)
 def read_projects(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
     search: str = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: Session = Depends(get_db),
 ):
     """
     List all projects with pagination.
 
     Args:
-        skip: Number of records to skip
+        skip: Number of records to skip (kept for backward compatibility; prefer cursor)
         limit: Maximum number of records to return
-        search: Optional search term to filter projects by name
+        search: Optional fuzzy search over the project name (ranked by similarity)
+        cursor: next_cursor of the previous page
+        include_total: Whether to count the matching records
 
     Returns:
-        PaginatedResponse[Project]: {"items": List[Project], "total": int}
+        PaginatedResponse[Project]: {"items": List[Project], "total": int | None, "next_cursor": str | None}
     """
-    # Base query
-    base_query = db.query(models.Project)
+    # Base query; alocações carregadas em lote (selectin) para a página
+    compact = serializers.compact_storage_enabled()
+    base_query = db.query(models.Project).options(_allocation_graph_loader(compact))
 
-    # Aplicar filtro de busca se fornecido
     if search:
-        base_query = base_query.filter(models.Project.name.ilike(f"%{search}%"))
-
-    # Calcula total antes de aplicar offset/limit (considerando filtro de busca)
-    total_count = base_query.count()
+        # Busca por similaridade (trigramas), ordenada por relevância
+        projects, total_count, next_cursor = SearchService(db).search_page(
+            base_query,
+            models.Project,
+            search,
+            limit=limit,
+            skip=skip,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    else:
+        total_count = base_query.count() if include_total else None
 
-    # Busca projetos sem alocações (otimização)
-    projects = (
-        base_query.order_by(func.lower(models.Project.name))
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+        # Página a partir do cursor, ordenada por (lower(name), id)
+        projects, next_cursor = paginate_by_name(
+            base_query, models.Project, limit=limit, skip=skip, cursor=cursor
+        )
 
     logger.debug(
         "Retrieved %s projects (skip=%s, limit=%s, total=%s, search=%s)",
@@ -294,17 +319,57 @@ def read_projects(
         total_count,
         search,
     )
-    return schemas.PaginatedResponse(items=projects, total=total_count)
+    weekly_allocations = None
+    if compact:
+        weekly_allocations = ProjectAllocationService(db).get_packed_weekly_allocations(
+            allocation for project in projects for allocation in project.allocations
+        )
+    return serializers.trusted_response(
+        {
+            "items": [
+                serializers.project_to_dict(project, weekly_allocations)
+                for project in projects
+            ],
+            "total": total_count,
+            "next_cursor": next_cursor,
+        },
+        schemas.PaginatedResponse[schemas.Project],
+    )
 
 
 @router.get(
     "/projects/{project_id}",
     response_model=schemas.Project,
+    response_class=ORJSONResponse,
     responses={404: {"model": schemas.ErrorResponse}},
 )
-def read_project(project_id: int, db: Session = Depends(get_db)):
+def read_project(
+    project_id: int,
+    format: Optional[Literal["grid"]] = Query(
+        None, description="grid: week headers once and flat hours arrays"
+    ),
+    db: Session = Depends(get_db),
+):
     """Get a single project by ID"""
-    return _get_project_or_404(db, project_id)
+    if format == "grid":
+        project = _get_project_with_packed_weeks_or_404(db, project_id)
+        allocation_service = ProjectAllocationService(db)
+        return serializers.trusted_response(
+            serializers.project_to_grid(
+                project,
+                allocation_service.get_project_weeks(project),
+                allocation_service.get_packed_weekly_records(project.allocations),
+            )
+        )
+    if serializers.compact_storage_enabled():
+        project = _get_project_with_packed_weeks_or_404(db, project_id)
+        weekly_allocations = ProjectAllocationService(db).get_packed_weekly_allocations(
+            project.allocations
+        )
+        payload = serializers.project_to_dict(project, weekly_allocations)
+    else:
+        payload = serializers.project_to_dict(_get_project_or_404(db, project_id))
+    return serializers.trusted_response(payload, schemas.Project)
 
 
 @router.patch("/projects/{project_id}", response_model=schemas.Project)
@@ -364,36 +429,18 @@ def update_project(
     },
 )
 def delete_project(project_id: int, db: Session = Depends(get_db)):
-    """Delete a project and its allocations"""
+    """Delete a project; allocations and weekly allocations cascade in the database"""
     logger.info(f"Deleting project: id={project_id}")
-    db_project = _get_project_or_404(db, project_id)
+    db_project = _get_project_without_allocations_or_404(db, project_id)
     _ensure_project_not_locked(db_project)
 
     try:
-        # Delete allocations and their weekly allocations individually
-        # This uses the objects already loaded by _get_project_or_404, avoiding StaleDataError
-        if db_project.allocations:
-            for allocation in db_project.allocations:
-                # Delete weekly allocations first (cascade will handle this, but being explicit)
-                if allocation.weekly_allocations:
-                    for weekly in allocation.weekly_allocations:
-                        db.delete(weekly)
-                # Delete the allocation itself
-                db.delete(allocation)
-
-        # Finally delete the project
-        db.delete(db_project)
-        db.commit()
-    except StaleDataError as e:
-        db.rollback()
-        logger.error(
-            f"StaleDataError deleting project: id={project_id}, error={str(e)}. "
-            "This may occur if objects were modified by another transaction."
-        )
-        raise HTTPException(
-            status_code=409,
-            detail="O projeto foi modificado por outra operação. Por favor, recarregue a página e tente novamente.",
+        db.execute(
+            delete(models.Project)
+            .where(models.Project.id == project_id)
+            .execution_options(synchronize_session=False)
         )
+        db.commit()
     except IntegrityError:
         db.rollback()
         logger.warning(
@@ -415,6 +462,58 @@ def delete_project(project_id: int, db: Session = Depends(get_db)):
     return {"message": "Project deleted successfully"}
 
 
+@router.delete(
+    "/projects/",
+    response_model=schemas.ProjectBulkDeleteResult,
+    responses={400: {"model": schemas.ErrorResponse}},
+)
+def delete_projects(
+    request: schemas.ProjectBulkDeleteRequest, db: Session = Depends(get_db)
+):
+    """
+    Delete several projects with a single DELETE statement.
+    Locked and unknown projects are skipped and reported in the response.
+    """
+    requested_ids = set(request.project_ids)
+    logger.info(f"Bulk deleting projects: count={len(requested_ids)}")
+
+    locked_by_id = dict(
+        db.execute(
+            select(models.Project.id, models.Project.locked).where(
+                models.Project.id.in_(requested_ids)
+            )
+        ).all()
+    )
+    deletable_ids = sorted(pid for pid, locked in locked_by_id.items() if not locked)
+
+    try:
+        if deletable_ids:
+            db.execute(
+                delete(models.Project)
+                .where(models.Project.id.in_(deletable_ids))
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        logger.warning(f"Integrity error bulk deleting projects: ids={deletable_ids}")
+        raise HTTPException(
+            status_code=400,
+            detail="Não é possível excluir os projetos pois eles possuem dependências.",
+        )
+
+    result = {
+        "deleted": deletable_ids,
+        "locked": sorted(pid for pid, locked in locked_by_id.items() if locked),
+        "not_found": sorted(requested_ids - locked_by_id.keys()),
+    }
+    logger.info(
+        f"Projects bulk deleted: deleted={len(result['deleted'])}, "
+        f"locked={len(result['locked'])}, not_found={len(result['not_found'])}"
+    )
+    return result
+
+
 @router.post(
     "/projects/{project_id}/offers",
     responses={
@@ -430,7 +529,7 @@ def apply_offer_to_project(
         f"Applying offer to project: project_id={project_id}, offer_id={request.offer_id}"
     )
 
-    project = _get_project_or_404(db, project_id)
+    project = _get_project_without_allocations_or_404(db, project_id)
     _ensure_project_not_locked(project)
     offer = _get_offer_or_404(db, request.offer_id)
     allocation_service = ProjectAllocationService(db)
@@ -439,43 +538,41 @@ def apply_offer_to_project(
     allocations_added = []
 
     try:
-        for item in offer.items:
-            professionals_to_allocate = []
-
-            prof = (
-                db.query(models.Professional)
-                .filter(models.Professional.id == item.professional_id)
-                .first()
+        professionals = _get_professionals_by_id(
+            db, [item.professional_id for item in offer.items]
+        )
+        allocated_ids = set(
+            db.scalars(
+                select(models.ProjectAllocation.professional_id).where(
+                    models.ProjectAllocation.project_id == project.id
+                )
             )
-            if not prof:
+        )
+
+        new_allocations = []
+        for item in offer.items:
+            professional = professionals.get(item.professional_id)
+            if not professional:
                 logger.warning(
                     f"Professional {item.professional_id} not found for offer item"
                 )
                 continue
 
-            professionals_to_allocate.append(prof)
-
-            for professional in professionals_to_allocate:
-                existing = (
-                    db.query(models.ProjectAllocation)
-                    .filter(
-                        models.ProjectAllocation.project_id == project.id,
-                        models.ProjectAllocation.professional_id == professional.id,
-                    )
-                    .first()
-                )
-
-                if existing:
-                    continue
+            if professional.id in allocated_ids:
+                continue
+            allocated_ids.add(professional.id)
 
-                allocation_service.create_allocation(
-                    project=project,
-                    professional=professional,
-                    allocation_percentage=item.allocation_percentage,
-                    weeks=weeks,
-                )
+            new_allocations.append(
+                {
+                    "professional": professional,
+                    "allocation_percentage": item.allocation_percentage,
+                }
+            )
+            allocations_added.append(professional.name)
 
-                allocations_added.append(professional.name)
+        allocation_service.create_allocations(
+            project=project, allocations=new_allocations, weeks=weeks
+        )
 
         db.commit()
         logger.info(
@@ -503,12 +600,13 @@ def apply_offer_to_project(
 def get_project_pricing(project_id: int, db: Session = Depends(get_db)):
     """Calculate and retrieve project pricing details"""
     logger.info(f"Calculating price for project: id={project_id}")
-    project = _get_project_or_404(db, project_id)
-
     pricing_service = PricingService(db)
 
     try:
-        result = pricing_service.calculate_project_pricing(project)
+        result = pricing_service.calculate_project_pricing_from_db(project_id)
+        if result is None:
+            logger.warning(f"Project not found: id={project_id}")
+            raise HTTPException(status_code=404, detail="Projeto não encontrado")
         logger.info(
             f"Price calculated: project_id={project_id}, total_cost={result['total_cost']:.2f}, final_price={result['final_price']:.2f}"
         )
@@ -518,6 +616,25 @@ def get_project_pricing(project_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post(
+    "/projects/pricing/batch",
+    response_model=schemas.ProjectPricingBatch,
+)
+def get_projects_pricing_batch(
+    request: schemas.ProjectPricingBatchRequest, db: Session = Depends(get_db)
+):
+    """Calculate pricing for several projects in a single round-trip"""
+    logger.info(f"Calculating batch pricing: projects={len(request.project_ids)}")
+    pricing_service = PricingService(db)
+    items = pricing_service.calculate_projects_pricing_from_db(request.project_ids)
+
+    not_found = sorted(set(request.project_ids) - items.keys())
+    if not_found:
+        logger.warning(f"Projects not found for batch pricing: ids={not_found}")
+
+    return {"items": items, "not_found": not_found}
+
+
 @router.get("/projects/{project_id}/timeline")
 def get_project_timeline(project_id: int, db: Session = Depends(get_db)):
     """
@@ -549,36 +666,144 @@ def update_allocations(
             ...
         ]
     """
-    project = _get_project_or_404(db, project_id)
-    _ensure_project_not_locked(project)
+    _ensure_project_not_locked(_get_project_without_allocations_or_404(db, project_id))
+    allocation_service = ProjectAllocationService(db)
 
+    rate_updates: dict[int, float] = {}
+    hours_updates: dict[int, float] = {}
     updated_count = 0
-    for update in updates:
-        if update.allocation_id is not None:
-            allocation = _get_allocation_or_404(db, project_id, update.allocation_id)
-            allocation.selling_hourly_rate = update.selling_hourly_rate
-            updated_count += 1
-
-        if update.weekly_allocation_id is not None:
-            weekly_alloc = _get_weekly_allocation_or_404(
-                db, project_id, update.weekly_allocation_id
-            )
-
-            hours = update.hours_allocated
-            if hours is None:
+    for item in updates:
+        if item.allocation_id is not None:
+            if item.selling_hourly_rate is None:
                 raise HTTPException(
                     status_code=400,
-                    detail="hours_allocated é obrigatório para atualizar alocações semanais",
+                    detail="selling_hourly_rate é obrigatório para atualizar alocações",
                 )
+            rate_updates[item.allocation_id] = item.selling_hourly_rate
+            updated_count += 1
 
-            if hours > weekly_alloc.available_hours:
+        if item.weekly_allocation_id is not None:
+            if item.hours_allocated is None:
                 raise HTTPException(
                     status_code=400,
-                    detail=f"Horas ({hours}) excedem as horas disponíveis ({weekly_alloc.available_hours}) para a semana {weekly_alloc.week_number}",
+                    detail="hours_allocated é obrigatório para atualizar alocações semanais",
                 )
-            weekly_alloc.hours_allocated = hours
+            hours_updates[item.weekly_allocation_id] = item.hours_allocated
             updated_count += 1
 
+    # Resolve every referenced id with one IN query per table. The rows are
+    # locked (FOR UPDATE, weekly rows first, then allocations in id order)
+    # until commit: the totals deltas below are computed from the hours,
+    # rates and totals read here, so a concurrent PATCH on the same rows
+    # waits instead of applying a delta from stale values.
+    weekly_rows = {}
+    if hours_updates:
+        weekly_rows = {
+            row.id: row
+            for row in db.execute(
+                select(
+                    models.WeeklyAllocation.id,
+                    models.WeeklyAllocation.allocation_id,
+                    models.WeeklyAllocation.week_number,
+                    models.WeeklyAllocation.hours_allocated,
+                    models.WeeklyAllocation.available_hours,
+                )
+                .join(
+                    models.ProjectAllocation,
+                    models.ProjectAllocation.id
+                    == models.WeeklyAllocation.allocation_id,
+                )
+                .where(
+                    models.WeeklyAllocation.id.in_(hours_updates.keys()),
+                    models.ProjectAllocation.project_id == project_id,
+                )
+                .order_by(models.WeeklyAllocation.id)
+                .with_for_update(of=models.WeeklyAllocation)
+            )
+        }
+    allocation_ids = rate_updates.keys() | {
+        row.allocation_id for row in weekly_rows.values()
+    }
+    allocation_rows = {}
+    if allocation_ids:
+        allocation_rows = {
+            row.id: row
+            for row in db.execute(
+                select(
+                    models.ProjectAllocation.id,
+                    models.ProjectAllocation.cost_hourly_rate,
+                    models.ProjectAllocation.selling_hourly_rate,
+                    models.ProjectAllocation.total_hours,
+                )
+                .where(
+                    models.ProjectAllocation.id.in_(allocation_ids),
+                    models.ProjectAllocation.project_id == project_id,
+                )
+                .order_by(models.ProjectAllocation.id)
+                .with_for_update()
+            )
+        }
+
+    # Validate everything in memory before writing
+    for allocation_id in rate_updates:
+        if allocation_id not in allocation_rows:
+            logger.warning(
+                f"Allocation not found: project_id={project_id}, allocation_id={allocation_id}"
+            )
+            raise HTTPException(status_code=404, detail="Alocação não encontrada")
+
+    hours_changes: dict[int, float] = {}
+    for weekly_allocation_id, hours in hours_updates.items():
+        weekly_alloc = weekly_rows.get(weekly_allocation_id)
+        if weekly_alloc is None:
+            logger.warning(
+                f"Weekly allocation not found: project_id={project_id}, weekly_allocation_id={weekly_allocation_id}"
+            )
+            raise HTTPException(
+                status_code=404,
+                detail="Alocação semanal não pertence a este projeto ou não existe",
+            )
+        if hours > weekly_alloc.available_hours:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Horas ({hours}) excedem as horas disponíveis ({weekly_alloc.available_hours}) para a semana {weekly_alloc.week_number}",
+            )
+        hours_changes[weekly_alloc.allocation_id] = (
+            hours_changes.get(weekly_alloc.allocation_id, 0.0)
+            + hours
+            - weekly_alloc.hours_allocated
+        )
+
+    # Apply with bulk UPDATEs by primary key
+    if hours_updates:
+        db.execute(
+            update(models.WeeklyAllocation),
+            [
+                {"id": weekly_allocation_id, "hours_allocated": hours}
+                for weekly_allocation_id, hours in hours_updates.items()
+            ],
+        )
+    if hours_changes:
+        allocation_service.refresh_packed_weekly_hours(hours_changes.keys())
+    if rate_updates:
+        db.execute(
+            update(models.ProjectAllocation),
+            [
+                {"id": allocation_id, "selling_hourly_rate": rate}
+                for allocation_id, rate in rate_updates.items()
+            ],
+        )
+    allocation_service.increment_totals(
+        project_id,
+        {
+            allocation_id: allocation_service.totals_delta(
+                allocation_rows[allocation_id],
+                hours_changes.get(allocation_id, 0.0),
+                rate_updates.get(allocation_id),
+            )
+            for allocation_id in hours_changes.keys() | rate_updates.keys()
+        },
+    )
     db.commit()
     logger.info(
         f"Allocations updated: project_id={project_id}, items_updated={updated_count}"
@@ -654,12 +879,26 @@ def remove_professional_from_project(
     logger.info(
         f"Removing professional from project: project_id={project_id}, allocation_id={allocation_id}"
     )
-    project = _get_project_or_404(db, project_id)
+    project = _get_project_without_allocations_or_404(db, project_id)
     _ensure_project_not_locked(project)
-    allocation = _get_allocation_or_404(db, project_id, allocation_id)
+    allocation = _get_allocation_or_404(db, project_id, allocation_id, for_update=True)
     professional_name = allocation.professional.name
 
-    db.delete(allocation)
+    ProjectAllocationService(db).increment_totals(
+        project_id,
+        {},
+        project_delta=(
+            -allocation.total_hours,
+            -allocation.total_cost,
+            -allocation.total_selling,
+        ),
+    )
+    # Weekly allocations are removed by the ON DELETE CASCADE foreign key
+    db.execute(
+        delete(models.ProjectAllocation)
+        .where(models.ProjectAllocation.id == allocation_id)
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
 
     logger.info(
@@ -674,7 +913,10 @@ def remove_professional_from_project(
 
 @router.get("/projects/{project_id}/export")
 def export_project(
-    project_id: int, format: str = "xlsx", db: Session = Depends(get_db)
+    project_id: int,
+    format: str = "xlsx",
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
 ):
     """
     Export a complete project to an Excel or PNG file.
@@ -684,32 +926,44 @@ def export_project(
         format: Export format ('xlsx' or 'png')
 
     Returns:
-        Excel (.xlsx) or PNG (.png) file for download
+        Excel (.xlsx) or PNG (.png) file for download. Files are cached by a
+        hash of the project's state, sent as the ETag; a matching
+        If-None-Match gets 304 Not Modified.
     """
     logger.info(f"Exporting project: id={project_id}, format={format}")
 
-    project = get_project_with_allocations(db, project_id)
-
-    if format == "xlsx":
-        excel_service = ExcelExportService(db)
-        file = excel_service.export_project_to_excel(project)
-        media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        filename = generate_export_filename(project.name, "xlsx", prefix="projeto")
-    elif format == "png":
-        png_service = PNGExportService(db)
-        file = png_service.export_project_to_png(project)
-        media_type = "image/png"
-        filename = generate_export_filename(project.name, "png")
-    else:
+    if format not in EXPORT_FORMATS:
         raise HTTPException(
             status_code=400, detail="Formato inválido. Use 'xlsx' ou 'png'."
         )
+    media_type, prefix = EXPORT_FORMATS[format]
+
+    export_service = ProjectExportService(db)
+    project = export_service.load_project(project_id)
+    if not project:
+        logger.warning(f"Project not found: id={project_id}")
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+    key = export_service.export_key(project, format)
+    headers = {"ETag": f'"{key}"', "Cache-Control": "private, no-cache"}
+
+    if if_none_match and _etag_matches(if_none_match, key):
+        logger.info(f"Export not modified: project_id={project_id}, format={format}")
+        return Response(status_code=304, headers=headers)
+
+    file = export_service.get_or_render(project, format, key)
+    filename = generate_export_filename(project.name, format, prefix=prefix)
 
     logger.info(
         f"Export successful: project_id={project_id}, format={format}, filename={filename}"
     )
     return StreamingResponse(
-        file,
+        iter_file(file),
         media_type=media_type,
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
+        headers={**headers, "Content-Disposition": f"attachment; filename={filename}"},
     )
+
+
+def _etag_matches(if_none_match: str, key: str) -> bool:
+    """Whether an If-None-Match header value matches the ETag of key."""
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or f'"{key}"' in tags
@@ -1,6 +1,6 @@
-from typing import List, Optional, Annotated, TypeVar, Generic
+from typing import Any, Dict, List, Literal, Optional, Annotated, TypeVar, Generic
 from pydantic import BaseModel, ConfigDict, Field, AfterValidator, model_validator
-from datetime import date
+from datetime import date, datetime
 
 T = TypeVar("T")
 
@@ -147,6 +147,9 @@ class Project(ProjectBase, ORMModel):
     id: int
     allocations: List[ProjectAllocation] = Field(default_factory=list)
     locked: bool = False
+    total_hours: float = 0.0
+    total_cost: float = 0.0
+    total_selling: float = 0.0
 
 
 class ProjectPricing(ORMModel):
@@ -158,6 +161,40 @@ class ProjectPricing(ORMModel):
     final_margin_percent: float
 
 
+class ProjectPricingBatchRequest(BaseModel):
+    project_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
+class ProjectPricingBatch(BaseModel):
+    items: Dict[int, ProjectPricing]
+    not_found: List[int] = Field(default_factory=list)
+
+
+class ProjectBulkDeleteRequest(BaseModel):
+    project_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
+class ProjectBulkDeleteResult(BaseModel):
+    deleted: List[int] = Field(default_factory=list)
+    locked: List[int] = Field(default_factory=list)
+    not_found: List[int] = Field(default_factory=list)
+
+
+class ProjectSelection(BaseModel):
+    project_ids: Optional[List[int]] = Field(None, min_length=1)
+    search: Optional[str] = Field(None, min_length=1)
+
+    @model_validator(mode="after")
+    def validate_selection(self):
+        if (self.project_ids is None) == (self.search is None):
+            raise ValueError("Informe project_ids ou search")
+        return self
+
+
+class ProjectBulkExportRequest(ProjectSelection):
+    format: Literal["xlsx", "png"] = "xlsx"
+
+
 class AllocationUpdateItem(BaseModel):
     allocation_id: Optional[int] = None
     weekly_allocation_id: Optional[int] = None
@@ -184,6 +221,18 @@ class AllocationUpdateItem(BaseModel):
         )
 
 
+class Job(ORMModel):
+    id: str
+    kind: str
+    status: str  # queued, running, succeeded, failed
+    progress: Dict[str, Any] = Field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 class ErrorResponse(BaseModel):
     detail: str
 
@@ -192,4 +241,5 @@ class PaginatedResponse(BaseModel, Generic[T]):
     """Generic paginated response schema"""
 
     items: List[T]
-    total: int
+    total: Optional[int] = None  # None when requested with include_total=false
+    next_cursor: Optional[str] = None  # None on the last page
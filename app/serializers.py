@@ -0,0 +1,218 @@
+"""
+Compact weekly-hours storage and trusted response serializers.
+
+Besides its weekly_allocations rows, every ProjectAllocation keeps a packed
+copy of them in weekly_hours_packed: one fixed-size little-endian record per
+week (id, week_number, hours_allocated, available_hours). The rows stay the
+source of truth for writes. In compact mode the packed column is rewritten
+after every write (ProjectAllocationService.refresh_packed_weekly_hours); in
+rows mode it is neither maintained nor read, so run
+`python -m app.manage repack-weekly` before switching to compact.
+
+WEEKLY_STORAGE_MODE selects where project reads take the weeks from:
+    rows     weekly_allocations rows, loaded as ORM objects (default)
+    compact  the packed column, decoded with NumPy into the same per-week shape
+
+The *_to_dict serializers build response payloads straight from ORM
+attributes, which the database already constrains, and trusted_response
+encodes them with orjson without re-validating every nested object through
+Pydantic. Set VALIDATE_RESPONSES=true to validate payloads against their
+response schema anyway (e.g. while changing a serializer).
+"""
+
+import os
+from functools import lru_cache
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.models import models
+from app.schemas import schemas
+
+WEEKLY_STORAGE_MODE = os.getenv("WEEKLY_STORAGE_MODE", "rows").lower()
+VALIDATE_RESPONSES = os.getenv("VALIDATE_RESPONSES", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Hours are kept as float64 so decoded values match the Float columns exactly
+WEEKLY_RECORD = np.dtype(
+    [
+        ("id", "<i8"),
+        ("week_number", "<i4"),
+        ("hours_allocated", "<f8"),
+        ("available_hours", "<f8"),
+    ]
+)
+
+_PROJECT_FIELDS = tuple(
+    name for name in schemas.Project.model_fields if name != "allocations"
+)
+_ALLOCATION_FIELDS = tuple(
+    name
+    for name in schemas.ProjectAllocation.model_fields
+    if name not in ("professional", "weekly_allocations")
+)
+_PROFESSIONAL_FIELDS = tuple(schemas.Professional.model_fields)
+_OFFER_FIELDS = tuple(name for name in schemas.Offer.model_fields if name != "items")
+_OFFER_ITEM_FIELDS = tuple(schemas.OfferItem.model_fields)
+
+
+def compact_storage_enabled() -> bool:
+    return WEEKLY_STORAGE_MODE == "compact"
+
+
+def pack_weekly_hours(rows: Iterable[Sequence]) -> bytes:
+    """Pack (id, week_number, hours_allocated, available_hours) tuples."""
+    return np.array([tuple(row) for row in rows], dtype=WEEKLY_RECORD).tobytes()
+
+
+def unpack_weekly_hours(packed: bytes | None) -> np.ndarray:
+    """Zero-copy structured view over a packed column value."""
+    if not packed:
+        return np.empty(0, dtype=WEEKLY_RECORD)
+    return np.frombuffer(packed, dtype=WEEKLY_RECORD)
+
+
+def weekly_allocations_from_records(records: np.ndarray) -> list[dict]:
+    """Per-week dicts in the shape of schemas.WeeklyAllocation."""
+    return [
+        {
+            "id": weekly_id,
+            "week_number": week_number,
+            "hours_allocated": hours,
+            "available_hours": available,
+        }
+        for weekly_id, week_number, hours, available in zip(
+            records["id"].tolist(),
+            records["week_number"].tolist(),
+            records["hours_allocated"].tolist(),
+            records["available_hours"].tolist(),
+        )
+    ]
+
+
+def weekly_allocations_from_orm(allocation: models.ProjectAllocation) -> list[dict]:
+    return [
+        {
+            "id": weekly.id,
+            "week_number": weekly.week_number,
+            "hours_allocated": weekly.hours_allocated,
+            "available_hours": weekly.available_hours,
+        }
+        for weekly in allocation.weekly_allocations
+    ]
+
+
+def professional_to_dict(professional: models.Professional) -> dict:
+    return {name: getattr(professional, name) for name in _PROFESSIONAL_FIELDS}
+
+
+def _project_scalars(project: models.Project) -> dict:
+    return {name: getattr(project, name) for name in _PROJECT_FIELDS}
+
+
+def project_to_dict(
+    project: models.Project, weekly_allocations: dict[int, list[dict]] | None = None
+) -> dict:
+    """
+    Project in the shape of schemas.Project. The weeks of each allocation come
+    from weekly_allocations (keyed by allocation id) when given, otherwise from
+    the weekly_allocations relationship.
+    """
+    if weekly_allocations is None:
+        weekly_allocations = {
+            allocation.id: weekly_allocations_from_orm(allocation)
+            for allocation in project.allocations
+        }
+    return {
+        **_project_scalars(project),
+        "allocations": [
+            {
+                **{name: getattr(allocation, name) for name in _ALLOCATION_FIELDS},
+                "professional": professional_to_dict(allocation.professional),
+                "weekly_allocations": weekly_allocations.get(allocation.id, []),
+            }
+            for allocation in project.allocations
+        ],
+    }
+
+
+def project_to_grid(
+    project: models.Project,
+    weeks: Sequence[dict],
+    weekly_records: dict[int, np.ndarray],
+) -> dict:
+    """
+    Columnar project payload for the allocation grid (GET /projects/{id}?format=grid).
+
+    Week headers are sent once as parallel arrays; each allocation carries its
+    hours and weekly allocation ids as flat arrays aligned with the headers
+    (weeks without a row hold 0 hours and a null id). There is no response
+    schema for this shape; it is sent as-is through trusted_response.
+    """
+    week_count = len(weeks)
+    payload = _project_scalars(project)
+    payload["weeks"] = {
+        "week_number": [week["week_number"] for week in weeks],
+        "week_start": [week["week_start"] for week in weeks],
+        "week_end": [week["week_end"] for week in weeks],
+        "available_hours": [week["available_hours"] for week in weeks],
+    }
+
+    allocations = []
+    for allocation in project.allocations:
+        records = weekly_records.get(allocation.id)
+        if records is None:
+            records = unpack_weekly_hours(None)
+        records = records[
+            (records["week_number"] >= 1) & (records["week_number"] <= week_count)
+        ]
+        positions = records["week_number"] - 1
+        hours = np.zeros(week_count)
+        hours[positions] = records["hours_allocated"]
+        weekly_ids = [None] * week_count
+        for position, weekly_id in zip(positions.tolist(), records["id"].tolist()):
+            weekly_ids[position] = weekly_id
+
+        allocations.append(
+            {
+                **{name: getattr(allocation, name) for name in _ALLOCATION_FIELDS},
+                "professional": professional_to_dict(allocation.professional),
+                "weekly_allocation_ids": weekly_ids,
+                "hours": hours.tolist(),
+            }
+        )
+    payload["allocations"] = allocations
+    return payload
+
+
+def offer_to_dict(offer: models.Offer) -> dict:
+    """Offer in the shape of schemas.Offer."""
+    return {
+        **{name: getattr(offer, name) for name in _OFFER_FIELDS},
+        "items": [
+            {name: getattr(item, name) for name in _OFFER_ITEM_FIELDS}
+            for item in offer.items
+        ],
+    }
+
+
+@lru_cache(maxsize=None)
+def _type_adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def trusted_response(payload: Any, response_type: Any = None) -> ORJSONResponse:
+    """
+    Encode a serializer payload with orjson, skipping response_model
+    validation. With VALIDATE_RESPONSES enabled the payload is first
+    validated against response_type (when given).
+    """
+    if VALIDATE_RESPONSES and response_type is not None:
+        adapter = _type_adapter(response_type)
+        payload = adapter.dump_python(adapter.validate_python(payload), mode="json")
+    return ORJSONResponse(payload)
@@ -1,17 +1,101 @@
 import holidays
+import numpy as np
+from collections import OrderedDict
 from datetime import date, timedelta
+from types import MappingProxyType
+import os
+import threading
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Year range precomputed by the shared calendars; dates outside it fall back
+# to the (slower) holidays lookup.
+CALENDAR_START_YEAR = int(os.getenv("CALENDAR_START_YEAR", date.today().year - 5))
+CALENDAR_END_YEAR = int(os.getenv("CALENDAR_END_YEAR", date.today().year + 10))
+
+# Maximum number of (start_date, duration_months, hours_per_day) breakdowns kept per calendar
+WEEKLY_BREAKDOWN_CACHE_SIZE = int(os.getenv("WEEKLY_BREAKDOWN_CACHE_SIZE", 512))
+
 
 class CalendarService:
-    def __init__(self, country_code="BR", state_code=None):
-        self.holidays = holidays.country_holidays(country_code, subdiv=state_code)
+    def __init__(
+        self,
+        country_code="BR",
+        state_code=None,
+        hours_per_day: int = 8,
+        start_year: int | None = None,
+        end_year: int | None = None,
+        cache_size: int | None = None,
+    ):
+        self.country_code = country_code
+        self.state_code = state_code
+        self.hours_per_day = hours_per_day
+        self.start_year = start_year or CALENDAR_START_YEAR
+        self.end_year = end_year or CALENDAR_END_YEAR
+        self.holidays = holidays.country_holidays(
+            country_code,
+            subdiv=state_code,
+            years=range(self.start_year, self.end_year + 1),
+        )
+        self._build_business_day_table()
+
+        self._breakdown_cache: OrderedDict[tuple, tuple] = OrderedDict()
+        self._breakdown_cache_size = (
+            WEEKLY_BREAKDOWN_CACHE_SIZE if cache_size is None else cache_size
+        )
+        self._breakdown_cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+
+    def _build_business_day_table(self) -> None:
+        """
+        Precompute a dense day table for the configured year range.
+        Prefix sums of business days and holidays make week lookups O(1).
+        """
+        self._first_ordinal = date(self.start_year, 1, 1).toordinal()
+        self._last_ordinal = date(self.end_year, 12, 31).toordinal()
+        total_days = self._last_ordinal - self._first_ordinal + 1
+
+        self._business_days = bytearray(total_days)
+        self._business_prefix = [0] * (total_days + 1)
+        self._holiday_prefix = [0] * (total_days + 1)
+        self._holiday_dates: list[date] = []
+
+        for offset in range(total_days):
+            current_date = date.fromordinal(self._first_ordinal + offset)
+            is_holiday = current_date in self.holidays
+            if is_holiday:
+                self._holiday_dates.append(current_date)
+            if current_date.weekday() < 5 and not is_holiday:
+                self._business_days[offset] = 1
+            self._business_prefix[offset + 1] = (
+                self._business_prefix[offset] + self._business_days[offset]
+            )
+            self._holiday_prefix[offset + 1] = len(self._holiday_dates)
+
+        self._holiday_array = np.array(self._holiday_dates, dtype="datetime64[D]")
+        self._busdaycal = np.busdaycalendar(holidays=self._holiday_array)
+
+        logger.info(
+            f"Business-day calendar precomputed: country={self.country_code}, "
+            f"state={self.state_code}, years={self.start_year}-{self.end_year}, "
+            f"holidays={len(self._holiday_dates)}"
+        )
+
+    def _table_offset(self, check_date: date) -> int | None:
+        ordinal = check_date.toordinal()
+        if self._first_ordinal <= ordinal <= self._last_ordinal:
+            return ordinal - self._first_ordinal
+        return None
 
     def is_business_day(self, check_date: date) -> bool:
         """Check if a date is a business day (not weekend or holiday)"""
+        offset = self._table_offset(check_date)
+        if offset is not None:
+            return bool(self._business_days[offset])
         if check_date.weekday() >= 5:
             return False
         if check_date in self.holidays:
@@ -25,13 +109,27 @@ class CalendarService:
         return monday
 
     def get_business_hours_in_week(
-        self, week_start: date, hours_per_day: int = 8
+        self, week_start: date, hours_per_day: int | None = None
     ) -> tuple[int, list[date]]:
         """
         Returns business hours available in a week and list of holidays.
         Week starts on Monday.
         Returns: (available_hours, holidays_in_week)
         """
+        if hours_per_day is None:
+            hours_per_day = self.hours_per_day
+
+        start = self._table_offset(week_start)
+        end = self._table_offset(week_start + timedelta(days=6))
+        if start is not None and end is not None:
+            business_days = (
+                self._business_prefix[end + 1] - self._business_prefix[start]
+            )
+            holidays_in_week = self._holiday_dates[
+                self._holiday_prefix[start] : self._holiday_prefix[end + 1]
+            ]
+            return business_days * hours_per_day, holidays_in_week
+
         business_days = 0
         holidays_in_week = []
 
@@ -45,16 +143,82 @@ class CalendarService:
         return business_days * hours_per_day, holidays_in_week
 
     def get_weekly_breakdown(
-        self, start_date: date, duration_months: int, hours_per_day: int = 8
+        self, start_date: date, duration_months: int, hours_per_day: int | None = None
     ) -> list[dict]:
         """
         Returns a list of weeks with their details for the project duration.
         Each week includes: week_number, week_start, week_end, business_days, available_hours, holidays
+
+        Results are memoized in a bounded LRU cache; callers receive fresh copies.
+        """
+        if hours_per_day is None:
+            hours_per_day = self.hours_per_day
+
+        key = (start_date, duration_months, hours_per_day)
+        with self._breakdown_cache_lock:
+            cached = self._breakdown_cache.get(key)
+            if cached is not None:
+                self._breakdown_cache.move_to_end(key)
+                self._cache_hits += 1
+            else:
+                self._cache_misses += 1
+
+        if cached is None:
+            cached = tuple(
+                MappingProxyType({**week, "holidays": tuple(week["holidays"])})
+                for week in self._compute_weekly_breakdown(
+                    start_date, duration_months, hours_per_day
+                )
+            )
+            with self._breakdown_cache_lock:
+                self._breakdown_cache[key] = cached
+                self._breakdown_cache.move_to_end(key)
+                while len(self._breakdown_cache) > self._breakdown_cache_size:
+                    self._breakdown_cache.popitem(last=False)
+                    self._cache_evictions += 1
+
+        return [{**week, "holidays": list(week["holidays"])} for week in cached]
+
+    def cache_info(self) -> dict:
+        """Returns hit/miss/eviction counters of the weekly breakdown cache."""
+        with self._breakdown_cache_lock:
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "evictions": self._cache_evictions,
+                "size": len(self._breakdown_cache),
+                "maxsize": self._breakdown_cache_size,
+            }
+
+    def _holidays_for_range(
+        self, first_day: date, last_day: date
+    ) -> tuple[np.ndarray, np.busdaycalendar]:
+        """Holiday array and busday calendar covering [first_day, last_day]."""
+        if (
+            self._table_offset(first_day) is not None
+            and self._table_offset(last_day) is not None
+        ):
+            return self._holiday_array, self._busdaycal
+
+        for year in range(first_day.year, last_day.year + 1):
+            # Membership checks make the holidays library populate missing years
+            _ = date(year, 1, 1) in self.holidays
+        holiday_array = np.array(
+            sorted(d for d in self.holidays.keys() if first_day <= d <= last_day),
+            dtype="datetime64[D]",
+        )
+        return holiday_array, np.busdaycalendar(holidays=holiday_array)
+
+    def _compute_weekly_breakdown(
+        self, start_date: date, duration_months: int, hours_per_day: int
+    ) -> list[dict]:
+        """
+        Vectorized breakdown: business days and holidays of every week in the
+        range are computed in a single NumPy pass over the busday calendar.
         """
         logger.debug(
             f"Generating weekly breakdown: start_date={start_date}, duration_months={duration_months}"
         )
-        weeks = []
 
         end_date = start_date
         for _ in range(duration_months):
@@ -65,33 +229,38 @@ class CalendarService:
             else:
                 end_date = date(year, month + 1, 1)
 
-        current_monday = self.get_monday_of_week(start_date)
-        week_number = 1
+        first_monday = self.get_monday_of_week(start_date)
+        mondays = np.arange(
+            np.datetime64(first_monday, "D"), np.datetime64(end_date, "D"), 7
+        )
+        if len(mondays) == 0:
+            return []
 
-        while current_monday < end_date:
-            week_end = current_monday + timedelta(days=6)
+        last_sunday = first_monday + timedelta(days=7 * len(mondays) - 1)
+        holiday_array, busdaycal = self._holidays_for_range(first_monday, last_sunday)
 
-            available_hours, holidays_in_week = self.get_business_hours_in_week(
-                current_monday, hours_per_day
-            )
+        week_ends = mondays + 6
+        business_days = np.busday_count(mondays, mondays + 7, busdaycal=busdaycal)
+        holiday_lo = np.searchsorted(holiday_array, mondays, side="left")
+        holiday_hi = np.searchsorted(holiday_array, week_ends, side="right")
 
-            business_days = available_hours // hours_per_day if hours_per_day > 0 else 0
-
-            week_info = {
-                "week_number": week_number,
-                "week_start": current_monday.isoformat(),
-                "week_end": week_end.isoformat(),
-                "business_days": business_days,
-                "available_hours": available_hours,
-                "holidays": [h.isoformat() for h in holidays_in_week]
-                if holidays_in_week
-                else [],
-            }
-
-            weeks.append(week_info)
+        week_starts_iso = np.datetime_as_string(mondays, unit="D").tolist()
+        week_ends_iso = np.datetime_as_string(week_ends, unit="D").tolist()
+        holidays_iso = np.datetime_as_string(holiday_array, unit="D").tolist()
 
-            current_monday += timedelta(days=7)
-            week_number += 1
+        weeks = [
+            {
+                "week_number": index + 1,
+                "week_start": week_starts_iso[index],
+                "week_end": week_ends_iso[index],
+                "business_days": days if hours_per_day > 0 else 0,
+                "available_hours": days * hours_per_day,
+                "holidays": holidays_iso[lo:hi],
+            }
+            for index, (days, lo, hi) in enumerate(
+                zip(business_days.tolist(), holiday_lo.tolist(), holiday_hi.tolist())
+            )
+        ]
 
         total_holidays = sum(1 for w in weeks if w["holidays"])
         logger.info(
@@ -99,3 +268,44 @@ class CalendarService:
         )
 
         return weeks
+
+
+_calendar_registry: dict[tuple, CalendarService] = {}
+_calendar_registry_lock = threading.Lock()
+
+
+def get_calendar_service(
+    country_code: str = "BR", state_code: str | None = None, hours_per_day: int = 8
+) -> CalendarService:
+    """
+    Returns the process-wide CalendarService for the given configuration.
+    Calendars are built once (with their precomputed tables) and shared by all services.
+    """
+    key = (country_code, state_code, hours_per_day)
+    calendar = _calendar_registry.get(key)
+    if calendar is None:
+        with _calendar_registry_lock:
+            calendar = _calendar_registry.get(key)
+            if calendar is None:
+                calendar = CalendarService(
+                    country_code=country_code,
+                    state_code=state_code,
+                    hours_per_day=hours_per_day,
+                )
+                _calendar_registry[key] = calendar
+    return calendar
+
+
+def get_calendar_cache_stats() -> list[dict]:
+    """Returns weekly breakdown cache counters for every shared calendar."""
+    return [
+        {
+            "country_code": country_code,
+            "state_code": state_code,
+            "hours_per_day": hours_per_day,
+            **calendar.cache_info(),
+        }
+        for (country_code, state_code, hours_per_day), calendar in list(
+            _calendar_registry.items()
+        )
+    ]
@@ -1,48 +1,188 @@
+from datetime import datetime
+from tempfile import SpooledTemporaryFile
+from typing import IO, Iterable, Iterator
+
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+from openpyxl.styles.fonts import DEFAULT_FONT
 from openpyxl.utils import get_column_letter
-from io import BytesIO
 
 from sqlalchemy.orm import Session
 
 from app.models.models import Project
 from app.services.pricing_service import PricingService
-from app.services.calendar_service import CalendarService
+from app.services.calendar_service import get_calendar_service
+
+# Exports up to this size stay in memory; larger ones spill to a temp file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+HEADER_STYLE = "export_header"
+TABLE_HEADER_STYLE = "export_table_header"
+CENTERED_STYLE = "export_centered"
+CURRENCY_STYLE = "export_currency"
+PERCENT_STYLE = "export_percent"
+
+
+def add_named_styles(wb: Workbook) -> None:
+    """Register the styles shared by every cell that uses them."""
+    header_fill = PatternFill(
+        start_color="4472C4", end_color="4472C4", fill_type="solid"
+    )
+    styles = [
+        NamedStyle(
+            name=HEADER_STYLE,
+            font=Font(bold=True, size=12, color="FFFFFF"),
+            fill=header_fill,
+        ),
+        NamedStyle(
+            name=TABLE_HEADER_STYLE,
+            font=Font(bold=True, size=11, color="FFFFFF"),
+            fill=header_fill,
+            alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+        ),
+        NamedStyle(
+            name=CENTERED_STYLE,
+            font=DEFAULT_FONT,
+            alignment=Alignment(horizontal="center", vertical="center"),
+        ),
+        NamedStyle(
+            name=CURRENCY_STYLE, font=DEFAULT_FONT, number_format='"R$" #,##0.00'
+        ),
+        NamedStyle(name=PERCENT_STYLE, font=DEFAULT_FONT, number_format='0.00"%"'),
+    ]
+    for style in styles:
+        wb.add_named_style(style)
+
+
+def styled_row(ws, values: list, style: str) -> list:
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        cells.append(cell)
+    return cells
+
+
+def write_allocation_table(
+    wb: Workbook, title: str, weeks: list[dict], rows: Iterable[tuple]
+) -> None:
+    """
+    Write an allocation table sheet: one row per allocation and one column
+    per week. rows are (pid, name, role, level, cost_hourly_rate,
+    selling_hourly_rate, {week_number: hours_allocated}) tuples.
+    """
+    ws = wb.create_sheet(title)
+
+    headers = ["ID", "Nome", "Função", "Nível", "Custo Horário", "Taxa de Venda"]
+
+    for week in weeks:
+        week_start_date = (
+            datetime.fromisoformat(week["week_start"]).date()
+            if isinstance(week["week_start"], str)
+            else week["week_start"]
+        )
+        week_label = f"Semana {week['week_number']}\n{week_start_date.strftime('%d/%m/%Y')}\n({week['available_hours']}h disponíveis)"
+        headers.append(week_label)
+
+    headers.append("Total de Horas")
+
+    # Write-only sheets take dimensions before the first row is written
+    ws.column_dimensions["A"].width = 12  # ID
+    ws.column_dimensions["B"].width = 25  # Nome
+    ws.column_dimensions["C"].width = 20  # Função
+    ws.column_dimensions["D"].width = 15  # Nível
+    ws.column_dimensions["E"].width = 15  # Custo Horário
+    ws.column_dimensions["F"].width = 15  # Taxa de Venda
+
+    for i in range(len(weeks)):
+        col_letter = get_column_letter(7 + i)
+        ws.column_dimensions[col_letter].width = 15
+
+    total_col = get_column_letter(7 + len(weeks))
+    ws.column_dimensions[total_col].width = 15
+
+    ws.row_dimensions[1].height = 45
+
+    ws.append(styled_row(ws, headers, TABLE_HEADER_STYLE))
+
+    for pid, name, role, level, cost_rate, selling_rate, weekly_hours in rows:
+        row_data = [
+            pid,
+            name,
+            role,
+            level,
+            f"R$ {cost_rate:.2f}",
+            f"R$ {selling_rate:.2f}",
+        ]
+
+        total_hours = 0
+        for week in weeks:
+            allocated = weekly_hours.get(week["week_number"], 0)
+            row_data.append(allocated if allocated > 0 else "")
+            total_hours += allocated
+
+        row_data.append(f"{total_hours:.1f}")
+        ws.append(styled_row(ws, row_data, CENTERED_STYLE))
+
+    # Finish the sheet now: an open write-only sheet keeps its writer state
+    # in memory until the workbook is saved
+    ws.close()
+
+
+def iter_file(file: IO[bytes], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield file in chunks for a StreamingResponse, closing it at the end."""
+    try:
+        while chunk := file.read(chunk_size):
+            yield chunk
+    finally:
+        file.close()
 
 
 class ExcelExportService:
     def __init__(self, db: Session):
         self.db = db
         self.pricing_service = PricingService(db)
-        self.calendar_service = CalendarService(country_code="BR")
+        self.calendar_service = get_calendar_service(country_code="BR")
 
-    def export_project_to_excel(self, project: Project) -> BytesIO:
+    def export_project_to_excel(self, project: Project) -> IO[bytes]:
         """
         Export a complete project to an Excel file with 3 sheets:
         1. Project Information
         2. Financial Summary
         3. Allocation Table
+
+        The workbook is write-only: rows are written out as they are appended
+        instead of being kept as cell objects. The returned file is spooled
+        (kept in memory up to SPOOL_MAX_SIZE, on disk beyond it) and
+        positioned at the start; stream it with iter_file.
         """
-        wb = Workbook()
-        wb.remove(wb.active)
+        wb = Workbook(write_only=True)
+        add_named_styles(wb)
 
         self._create_project_info_sheet(wb, project)
         self._create_financial_summary_sheet(wb, project)
         self._create_allocation_table_sheet(wb, project)
 
-        output = BytesIO()
+        output = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
         wb.save(output)
         output.seek(0)
         return output
 
+    def _write_key_value_sheet(
+        self, wb: Workbook, title: str, data: list, widths: tuple[int, int]
+    ):
+        ws = wb.create_sheet(title)
+        ws.column_dimensions["A"].width = widths[0]
+        ws.column_dimensions["B"].width = widths[1]
+
+        ws.append(styled_row(ws, data[0], HEADER_STYLE))
+        for row_data in data[1:]:
+            ws.append(row_data)
+
     def _create_project_info_sheet(self, wb: Workbook, project: Project):
         """Create the Project Information sheet"""
-        ws = wb.create_sheet("Informações do Projeto")
-
-        header_font = Font(bold=True, size=12)
-        header_fill = PatternFill(
-            start_color="4472C4", end_color="4472C4", fill_type="solid"
-        )
         data = [
             ["Campo", "Valor"],
             ["Nome do Projeto", project.name],
@@ -51,29 +191,12 @@ class ExcelExportService:
             ["Taxa de Impostos", f"{project.tax_rate}%"],
             ["Taxa de Margem", f"{project.margin_rate}%"],
         ]
-
-        for row_idx, row_data in enumerate(data, start=1):
-            for col_idx, value in enumerate(row_data, start=1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                if row_idx == 1:
-                    cell.font = header_font
-                    cell.fill = header_fill
-                    cell.font = Font(bold=True, size=12, color="FFFFFF")
-
-        ws.column_dimensions["A"].width = 25
-        ws.column_dimensions["B"].width = 40
+        self._write_key_value_sheet(wb, "Informações do Projeto", data, (25, 40))
 
     def _create_financial_summary_sheet(self, wb: Workbook, project: Project):
         """Create the Financial Summary sheet"""
-        ws = wb.create_sheet("Resumo Financeiro")
-
         pricing = self.pricing_service.calculate_project_pricing(project)
 
-        header_font = Font(bold=True, size=12)
-        header_fill = PatternFill(
-            start_color="4472C4", end_color="4472C4", fill_type="solid"
-        )
-
         data = [
             ["Métrica", "Valor"],
             ["Custo Total", f"R$ {pricing['total_cost']:,.2f}"],
@@ -83,103 +206,26 @@ class ExcelExportService:
             ["Preço Final", f"R$ {pricing['final_price']:,.2f}"],
             ["Margem Final (%)", f"{pricing['final_margin_percent']:.2f}%"],
         ]
-
-        for row_idx, row_data in enumerate(data, start=1):
-            for col_idx, value in enumerate(row_data, start=1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                if row_idx == 1:
-                    cell.font = header_font
-                    cell.fill = header_fill
-                    cell.font = Font(bold=True, size=12, color="FFFFFF")
-
-        ws.column_dimensions["A"].width = 25
-        ws.column_dimensions["B"].width = 25
+        self._write_key_value_sheet(wb, "Resumo Financeiro", data, (25, 25))
 
     def _create_allocation_table_sheet(self, wb: Workbook, project: Project):
         """Create the Allocation Table sheet"""
-        ws = wb.create_sheet("Tabela de Alocação")
-
         weeks = self.calendar_service.get_weekly_breakdown(
             project.start_date, project.duration_months
         )
-
-        header_fill = PatternFill(
-            start_color="4472C4", end_color="4472C4", fill_type="solid"
-        )
-        header_font_white = Font(bold=True, size=11, color="FFFFFF")
-
-        headers = ["ID", "Nome", "Função", "Nível", "Custo Horário", "Taxa de Venda"]
-
-        for week in weeks:
-            from datetime import datetime as dt
-
-            week_start_date = (
-                dt.fromisoformat(week["week_start"]).date()
-                if isinstance(week["week_start"], str)
-                else week["week_start"]
-            )
-            week_label = f"Semana {week['week_number']}\n{week_start_date.strftime('%d/%m/%Y')}\n({week['available_hours']}h disponíveis)"
-            headers.append(week_label)
-
-        headers.append("Total de Horas")
-
-        for col_idx, header in enumerate(headers, start=1):
-            cell = ws.cell(row=1, column=col_idx, value=header)
-            cell.font = header_font_white
-            cell.fill = header_fill
-            cell.alignment = Alignment(
-                horizontal="center", vertical="center", wrap_text=True
+        rows = (
+            (
+                allocation.professional.pid,
+                allocation.professional.name,
+                allocation.professional.role,
+                allocation.professional.level,
+                allocation.cost_hourly_rate,
+                allocation.selling_hourly_rate,
+                {
+                    weekly_alloc.week_number: weekly_alloc.hours_allocated
+                    for weekly_alloc in allocation.weekly_allocations
+                },
             )
-
-        row_idx = 2
-        for allocation in project.allocations:
-            professional = allocation.professional
-
-            weekly_hours = {}
-            for weekly_alloc in allocation.weekly_allocations:
-                weekly_hours[weekly_alloc.week_number] = {
-                    "allocated": weekly_alloc.hours_allocated,
-                    "available": weekly_alloc.available_hours,
-                }
-
-            row_data = [
-                professional.pid,
-                professional.name,
-                professional.role,
-                professional.level,
-                f"R$ {allocation.cost_hourly_rate:.2f}",
-                f"R$ {allocation.selling_hourly_rate:.2f}",
-            ]
-
-            total_hours = 0
-            for week in weeks:
-                week_num = week["week_number"]
-                if week_num in weekly_hours:
-                    allocated = weekly_hours[week_num]["allocated"]
-                    row_data.append(allocated if allocated > 0 else "")
-                    total_hours += allocated
-                else:
-                    row_data.append("")
-
-            row_data.append(f"{total_hours:.1f}")
-            for col_idx, value in enumerate(row_data, start=1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-
-            row_idx += 1
-
-        ws.column_dimensions["A"].width = 12  # ID
-        ws.column_dimensions["B"].width = 25  # Nome
-        ws.column_dimensions["C"].width = 20  # Função
-        ws.column_dimensions["D"].width = 15  # Nível
-        ws.column_dimensions["E"].width = 15  # Custo Horário
-        ws.column_dimensions["F"].width = 15  # Taxa de Venda
-
-        for i in range(len(weeks)):
-            col_letter = get_column_letter(7 + i)
-            ws.column_dimensions[col_letter].width = 15
-
-        total_col = get_column_letter(7 + len(weeks))
-        ws.column_dimensions[total_col].width = 15
-
-        ws.row_dimensions[1].height = 45
+            for allocation in project.allocations
+        )
+        write_allocation_table(wb, "Tabela de Alocação", weeks, rows)
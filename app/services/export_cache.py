@@ -0,0 +1,127 @@
+"""
+Content-addressed disk cache for rendered project exports (XLSX/PNG).
+
+Entries are files named after the export key (a hash of the project's
+pricing-relevant state and the format, see ProjectExportService), so an
+unchanged project maps to the same file and a changed one to a new key; stale
+entries are never served, they just age out. The directory is bounded by
+EXPORT_CACHE_MAX_BYTES with least-recently-used eviction (recency is the file
+mtime, refreshed on every hit). Files are written to a temp name and renamed
+into place, so workers sharing the directory never read a partial entry.
+"""
+
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import IO
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CACHE_DIR = os.getenv(
+    "EXPORT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "consultancy_exports")
+)
+# 0 disables the cache
+EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+_KEY_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class ExportCache:
+    def __init__(
+        self, directory: str = EXPORT_CACHE_DIR, max_bytes: int = EXPORT_CACHE_MAX_BYTES
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+        if self.enabled:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> str:
+        if not _KEY_RE.match(key):
+            raise ValueError(f"Invalid export cache key: {key!r}")
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> str | None:
+        """Path of the cached file for key (marked as recently used) or None."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        logger.debug(f"Export cache hit: key={key}")
+        return path
+
+    def put(self, key: str, file: IO[bytes]) -> str | None:
+        """
+        Store the contents of file (read from its current position) under key
+        and return the cached path, evicting old entries past max_bytes.
+        Returns None when the cache is disabled; file is left open either way.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, prefix=".tmp_", delete=False
+        ) as temp_file:
+            shutil.copyfileobj(file, temp_file)
+        os.replace(temp_file.name, path)
+        logger.debug(f"Export cached: key={key}")
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: str | None = None) -> None:
+        """
+        Remove least recently used entries until the cache fits max_bytes
+        (except keep, the entry just written, even if it alone is larger).
+        """
+        with self._evict_lock:
+            entries = []
+            total = 0
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if not _KEY_RE.match(entry.name):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+            logger.info(f"Export cache evicted to {total} bytes: dir={self.directory}")
+
+
+_export_cache: ExportCache | None = None
+_export_cache_lock = threading.Lock()
+
+
+def get_export_cache() -> ExportCache:
+    """Returns the process-wide ExportCache, created on first use."""
+    global _export_cache
+    if _export_cache is None:
+        with _export_cache_lock:
+            if _export_cache is None:
+                _export_cache = ExportCache()
+    return _export_cache
@@ -0,0 +1,169 @@
+"""
+Background jobs.
+
+Jobs run on an executor owned by the worker that accepted them, so long tasks
+don't hold a request open: a thread pool for I/O-bound work (e.g. large CSV
+imports) and a process pool for CPU-bound rendering (project exports, capped
+at EXPORT_MAX_WORKERS processes). Their status and progress are stored in the
+background_jobs table, so status requests are answered by any gunicorn
+worker. A job is lost if its worker exits before finishing it (it stays
+"queued" or "running" until JOB_STALE_AFTER_SECONDS after it was created or
+started, when it is reported as failed).
+"""
+
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from sqlalchemy import update
+
+from app import database
+from app.models import models
+
+logger = logging.getLogger(__name__)
+
+JOB_MAX_WORKERS = int(os.getenv("JOB_MAX_WORKERS", 2))
+JOB_STALE_AFTER_SECONDS = int(os.getenv("JOB_STALE_AFTER_SECONDS", 6 * 3600))
+EXPORT_MAX_WORKERS = int(os.getenv("EXPORT_MAX_WORKERS", 2))
+
+
+class JobContext:
+    """Handle given to a running job to publish its progress."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+
+    def update_progress(self, **progress: Any) -> None:
+        update_job(self.job_id, progress=progress)
+
+
+def update_job(job_id: str, **values: Any) -> None:
+    db = database.SessionLocal()
+    try:
+        db.execute(
+            update(models.BackgroundJob)
+            .where(models.BackgroundJob.id == job_id)
+            .values(**values)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_job(job_id: str, fn: Callable[..., dict], args: tuple) -> None:
+    """Run fn(context, *args) recording its status; executed on the pool."""
+    update_job(job_id, status="running", started_at=datetime.utcnow())
+    try:
+        result = fn(JobContext(job_id), *args)
+    except Exception as e:
+        logger.exception(f"Job failed: id={job_id}")
+        update_job(
+            job_id,
+            status="failed",
+            error=str(e),
+            finished_at=datetime.utcnow(),
+        )
+        return
+    update_job(
+        job_id,
+        status="succeeded",
+        result=result,
+        finished_at=datetime.utcnow(),
+    )
+    logger.info(f"Job succeeded: id={job_id}")
+
+
+def _init_process_worker() -> None:
+    # Connections inherited from the parent must not be reused by the child
+    database.engine.dispose(close=False)
+
+
+class JobRunner:
+    def __init__(self, executor: Executor):
+        self._executor = executor
+
+    def submit(self, kind: str, fn: Callable[..., dict], *args: Any) -> str:
+        """
+        Record a queued job and schedule fn(context, *args) on the executor.
+        fn returns the job result (a JSON-serializable dict). Returns the job id.
+        On a process pool fn and args must be picklable (module-level fn).
+        """
+        job_id = uuid.uuid4().hex
+        db = database.SessionLocal()
+        try:
+            db.add(models.BackgroundJob(id=job_id, kind=kind, status="queued"))
+            db.commit()
+        finally:
+            db.close()
+
+        self._executor.submit(run_job, job_id, fn, args)
+        logger.info(f"Job queued: id={job_id}, kind={kind}")
+        return job_id
+
+    def get(self, job_id: str) -> models.BackgroundJob | None:
+        db = database.SessionLocal()
+        try:
+            job = db.get(models.BackgroundJob, job_id)
+            if job is not None:
+                db.expunge(job)
+                stale_before = datetime.utcnow() - timedelta(
+                    seconds=JOB_STALE_AFTER_SECONDS
+                )
+                if (job.status == "queued" and job.created_at < stale_before) or (
+                    job.status == "running" and job.started_at < stale_before
+                ):
+                    job.status = "failed"
+                    job.error = "Job interrompido (worker reiniciado ou encerrado)"
+            return job
+        finally:
+            db.close()
+
+
+_job_runner: JobRunner | None = None
+_export_job_runner: JobRunner | None = None
+_export_process_pool: ProcessPoolExecutor | None = None
+_job_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Returns the process-wide JobRunner (thread pool), created on first use."""
+    global _job_runner
+    if _job_runner is None:
+        with _job_runner_lock:
+            if _job_runner is None:
+                _job_runner = JobRunner(
+                    ThreadPoolExecutor(
+                        max_workers=JOB_MAX_WORKERS, thread_name_prefix="job"
+                    )
+                )
+    return _job_runner
+
+
+def get_export_process_pool() -> ProcessPoolExecutor:
+    """
+    Returns the process-wide pool for export rendering, shared by export jobs
+    and bulk exports so EXPORT_MAX_WORKERS caps them together.
+    """
+    global _export_process_pool
+    if _export_process_pool is None:
+        with _job_runner_lock:
+            if _export_process_pool is None:
+                _export_process_pool = ProcessPoolExecutor(
+                    max_workers=EXPORT_MAX_WORKERS, initializer=_init_process_worker
+                )
+    return _export_process_pool
+
+
+def get_export_job_runner() -> JobRunner:
+    """Returns the process-wide JobRunner for exports (process pool)."""
+    global _export_job_runner
+    if _export_job_runner is None:
+        pool = get_export_process_pool()
+        with _job_runner_lock:
+            if _export_job_runner is None:
+                _export_job_runner = JobRunner(pool)
+    return _export_job_runner
@@ -5,14 +5,14 @@ from sqlalchemy.orm import Session
 
 from app.models.models import Project
 from app.services.pricing_service import PricingService
-from app.services.calendar_service import CalendarService
+from app.services.calendar_service import get_calendar_service
 
 
 class PNGExportService:
     def __init__(self, db: Session):
         self.db = db
         self.pricing_service = PricingService(db)
-        self.calendar_service = CalendarService(country_code="BR")
+        self.calendar_service = get_calendar_service(country_code="BR")
 
         self.width = 1600
         self.height = 3000  # large enough to accommodate any content
@@ -0,0 +1,374 @@
+"""
+Exports covering many projects at once (portfolio reporting).
+
+A ZIP of per-project files is planned with batched queries in the request:
+every project is loaded with its weekly hours to compute its export key, so
+the files already in the export cache are known up front. The others are
+rendered in chunks on the export process pool, in parallel, and the archive
+is streamed entry by entry as the files become available; neither the
+archive nor the rendered files are ever held in memory whole.
+
+The consolidated workbook is a single write-only XLSX: a summary sheet from
+the stored pricing totals (one query for all projects) and an allocation
+sheet per project, filled from column-only queries over
+PORTFOLIO_LOAD_BATCH_SIZE projects at a time (no ORM graphs).
+"""
+
+import io
+import logging
+import os
+import re
+import zipfile
+from concurrent.futures import as_completed
+from tempfile import SpooledTemporaryFile
+from typing import IO, Iterator
+
+from fastapi import HTTPException
+from openpyxl import Workbook
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import models
+from app.services.calendar_service import get_calendar_service
+from app.services.excel_service import (
+    CURRENCY_STYLE,
+    HEADER_STYLE,
+    PERCENT_STYLE,
+    SPOOL_MAX_SIZE,
+    STREAM_CHUNK_SIZE,
+    add_named_styles,
+    styled_row,
+    write_allocation_table,
+)
+from app.services.job_runner import EXPORT_MAX_WORKERS, get_export_process_pool
+from app.services.pricing_service import PricingService
+from app.services.project_allocation_service import ProjectAllocationService
+from app.services.project_export_service import (
+    EXPORT_FORMATS,
+    ProjectExportService,
+    render_exports_chunk,
+)
+from app.services.search_service import SearchService
+
+logger = logging.getLogger(__name__)
+
+# Maximum projects in one bulk export
+PORTFOLIO_EXPORT_MAX_PROJECTS = int(os.getenv("PORTFOLIO_EXPORT_MAX_PROJECTS", 500))
+# Projects per process pool task: large enough for batched loading, small
+# enough to spread the work over all workers
+RENDER_CHUNK_MAX_SIZE = 20
+# Projects whose allocations are read per query in the consolidated workbook
+PORTFOLIO_LOAD_BATCH_SIZE = 100
+
+_SHEET_TITLE_INVALID_RE = re.compile(r"[\\/*?:\[\]]")
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only sink for ZipFile whose output is drained by the generator."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _archive_name(project: models.Project, format: str) -> str:
+    _, prefix = EXPORT_FORMATS[format]
+    clean_name = project.name.replace(" ", "_").replace("/", "-").replace("\\", "-")
+    name = f"{project.id}_{clean_name}.{format}"
+    return f"{prefix}_{name}" if prefix else name
+
+
+def _sheet_title(project_id: int, name: str) -> str:
+    """Unique sheet title (the id) within Excel's 31 character limit."""
+    return _SHEET_TITLE_INVALID_RE.sub("-", f"{project_id} {name}")[:31]
+
+
+class PortfolioExportService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.export_service = ProjectExportService(db)
+
+    def resolve_project_ids(
+        self, project_ids: list[int] | None, search: str | None
+    ) -> list[int]:
+        """Ids of the requested projects, or of all projects matching search."""
+        if search:
+            projects, total, _ = SearchService(self.db).search_page(
+                self.db.query(models.Project),
+                models.Project,
+                search,
+                limit=PORTFOLIO_EXPORT_MAX_PROJECTS,
+            )
+            if total > PORTFOLIO_EXPORT_MAX_PROJECTS:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"A busca retornou {total} projetos; o máximo por exportação é {PORTFOLIO_EXPORT_MAX_PROJECTS}",
+                )
+            return [project.id for project in projects]
+
+        project_ids = sorted(set(project_ids or []))
+        if len(project_ids) > PORTFOLIO_EXPORT_MAX_PROJECTS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Máximo de {PORTFOLIO_EXPORT_MAX_PROJECTS} projetos por exportação",
+            )
+        return project_ids
+
+    def zip_exports(self, project_ids: list[int], format: str) -> Iterator[bytes]:
+        """
+        Plan a ZIP with the export of each project and return the generator
+        streaming it. All database work happens here; the generator only
+        reads the export cache and waits on the process pool.
+        """
+        projects = self.export_service.load_projects(project_ids)
+        weekly_records = self.export_service.get_weekly_records(projects)
+
+        names: dict[int, str] = {}
+        cached: dict[int, str] = {}
+        misses: list[int] = []
+        for project in projects:
+            names[project.id] = _archive_name(project, format)
+            key = self.export_service.export_key(project, format, weekly_records)
+            if self.export_service.cache.get(key):
+                cached[project.id] = key
+            else:
+                misses.append(project.id)
+
+        not_found = sorted(set(project_ids) - names.keys())
+        logger.info(
+            f"ZIP export planned: projects={len(projects)}, cached={len(cached)}, "
+            f"to_render={len(misses)}, not_found={len(not_found)}"
+        )
+        return self._iter_zip(format, names, cached, misses, not_found)
+
+    def _iter_zip(
+        self,
+        format: str,
+        names: dict[int, str],
+        cached: dict[int, str],
+        misses: list[int],
+        not_found: list[int],
+    ) -> Iterator[bytes]:
+        # Submitted before the first byte is sent, so rendering overlaps
+        # with streaming the cached entries
+        chunk_size = max(
+            1, min(RENDER_CHUNK_MAX_SIZE, -(-len(misses) // EXPORT_MAX_WORKERS))
+        )
+        pool = get_export_process_pool()
+        futures = {
+            pool.submit(render_exports_chunk, chunk, format): chunk
+            for chunk in (
+                misses[start : start + chunk_size]
+                for start in range(0, len(misses), chunk_size)
+            )
+        }
+
+        errors = [f"Projeto {project_id} não encontrado" for project_id in not_found]
+        stream = _ZipStream()
+        with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_STORED) as archive:
+            for project_id, key in cached.items():
+                if not (
+                    yield from self._write_entry(
+                        archive, stream, names[project_id], key
+                    )
+                ):
+                    errors.append(f"Projeto {project_id}: exportação expirada do cache")
+
+            for future in as_completed(futures):
+                try:
+                    keys = future.result()
+                except Exception as e:
+                    logger.error(
+                        f"ZIP export chunk failed: projects={futures[future]}, error={str(e)}"
+                    )
+                    errors.extend(
+                        f"Projeto {project_id}: erro ao exportar ({str(e)})"
+                        for project_id in futures[future]
+                    )
+                    continue
+                for project_id in futures[future]:
+                    if project_id not in keys:
+                        errors.append(f"Projeto {project_id} não encontrado")
+                    elif not (
+                        yield from self._write_entry(
+                            archive, stream, names[project_id], keys[project_id]
+                        )
+                    ):
+                        errors.append(
+                            f"Projeto {project_id}: exportação expirada do cache"
+                        )
+
+            if errors:
+                archive.writestr("erros.txt", "\n".join(errors) + "\n")
+        yield stream.drain()
+        logger.info(f"ZIP export streamed: files={len(names)}, errors={len(errors)}")
+
+    def _write_entry(
+        self, archive: zipfile.ZipFile, stream: _ZipStream, name: str, key: str
+    ) -> Iterator[bytes]:
+        """Copy a cached export into the archive; returns False if it is gone."""
+        path = self.export_service.cache.get(key)
+        try:
+            source = open(path, "rb") if path else None
+        except FileNotFoundError:
+            source = None
+        if source is None:
+            return False
+        with source, archive.open(name, "w") as target:
+            while chunk := source.read(STREAM_CHUNK_SIZE):
+                target.write(chunk)
+                if data := stream.drain():
+                    yield data
+        if data := stream.drain():
+            yield data
+        return True
+
+    def portfolio_workbook(self, project_ids: list[int]) -> IO[bytes]:
+        """
+        One XLSX for many projects: a summary sheet with the pricing totals
+        of each project and an allocation table sheet per project. Returns
+        a spooled file positioned at the start (stream it with iter_file).
+        """
+        projects = self.db.execute(
+            select(
+                models.Project.id,
+                models.Project.name,
+                models.Project.start_date,
+                models.Project.duration_months,
+                models.Project.tax_rate,
+                models.Project.margin_rate,
+            )
+            .where(models.Project.id.in_(project_ids))
+            .order_by(func.lower(models.Project.name), models.Project.id)
+        ).all()
+        pricing = PricingService(self.db).calculate_projects_pricing_from_db(
+            [project.id for project in projects]
+        )
+
+        wb = Workbook(write_only=True)
+        add_named_styles(wb)
+        self._write_summary_sheet(wb, projects, pricing)
+
+        calendar_service = get_calendar_service(country_code="BR")
+        allocation_service = ProjectAllocationService(self.db)
+        for start in range(0, len(projects), PORTFOLIO_LOAD_BATCH_SIZE):
+            batch = projects[start : start + PORTFOLIO_LOAD_BATCH_SIZE]
+            allocations = self._load_allocation_rows([p.id for p in batch])
+            weekly_records = allocation_service.get_packed_weekly_records(
+                allocation for rows in allocations.values() for allocation in rows
+            )
+            for project in batch:
+                weeks = calendar_service.get_weekly_breakdown(
+                    project.start_date, project.duration_months
+                )
+                rows = (
+                    (
+                        allocation.pid,
+                        allocation.professional_name,
+                        allocation.role,
+                        allocation.level,
+                        allocation.cost_hourly_rate,
+                        allocation.selling_hourly_rate,
+                        dict(
+                            zip(
+                                weekly_records[allocation.id]["week_number"].tolist(),
+                                weekly_records[allocation.id][
+                                    "hours_allocated"
+                                ].tolist(),
+                            )
+                        ),
+                    )
+                    for allocation in allocations.get(project.id, [])
+                )
+                write_allocation_table(
+                    wb, _sheet_title(project.id, project.name), weeks, rows
+                )
+
+        output = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        wb.save(output)
+        output.seek(0)
+        logger.info(f"Portfolio workbook exported: projects={len(projects)}")
+        return output
+
+    def _write_summary_sheet(self, wb: Workbook, projects: list, pricing: dict) -> None:
+        ws = wb.create_sheet("Resumo")
+        headers = [
+            "ID",
+            "Projeto",
+            "Data de Início",
+            "Duração (meses)",
+            "Taxa de Impostos (%)",
+            "Taxa de Margem (%)",
+            "Custo Total",
+            "Venda Total",
+            "Margem Total",
+            "Impostos Totais",
+            "Preço Final",
+            "Margem Final (%)",
+        ]
+        for column, width in zip("ABCDEFGHIJKL", (8, 40, 15, 15, 18, 18) + (18,) * 6):
+            ws.column_dimensions[column].width = width
+        ws.append(styled_row(ws, headers, HEADER_STYLE))
+
+        for project in projects:
+            totals = pricing[project.id]
+            ws.append(
+                [
+                    project.id,
+                    project.name,
+                    project.start_date.strftime("%d/%m/%Y"),
+                    project.duration_months,
+                    *styled_row(
+                        ws, [project.tax_rate, project.margin_rate], PERCENT_STYLE
+                    ),
+                    *styled_row(
+                        ws,
+                        [
+                            totals["total_cost"],
+                            totals["total_selling"],
+                            totals["total_margin"],
+                            totals["total_tax"],
+                            totals["final_price"],
+                        ],
+                        CURRENCY_STYLE,
+                    ),
+                    *styled_row(ws, [totals["final_margin_percent"]], PERCENT_STYLE),
+                ]
+            )
+        ws.close()
+
+    def _load_allocation_rows(self, project_ids: list[int]) -> dict[int, list]:
+        """Allocation and professional columns of the projects, by project id."""
+        allocation = models.ProjectAllocation
+        professional = models.Professional
+        rows = self.db.execute(
+            select(
+                allocation.id,
+                allocation.project_id,
+                allocation.cost_hourly_rate,
+                allocation.selling_hourly_rate,
+                allocation.weekly_hours_packed,
+                professional.pid,
+                professional.name.label("professional_name"),
+                professional.role,
+                professional.level,
+            )
+            .join(professional, allocation.professional_id == professional.id)
+            .where(allocation.project_id.in_(project_ids))
+            .order_by(allocation.project_id, allocation.id)
+        )
+        by_project: dict[int, list] = {}
+        for row in rows:
+            by_project.setdefault(row.project_id, []).append(row)
+        return by_project
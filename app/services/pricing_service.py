@@ -1,5 +1,6 @@
-from app.models.models import Project
-from app.services.calendar_service import CalendarService
+from app.models.models import Project, ProjectAllocation, WeeklyAllocation
+from app.services.calendar_service import get_calendar_service
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 import logging
@@ -10,7 +11,7 @@ logger = logging.getLogger(__name__)
 class PricingService:
     def __init__(self, db: Session):
         self.db = db
-        self.calendar_service = CalendarService()
+        self.calendar_service = get_calendar_service()
 
     def calculate_project_pricing(self, project: Project):
         """
@@ -41,9 +42,166 @@ class PricingService:
                 total_cost += hours * hourly_cost
                 total_selling += hours * selling_rate
 
+        return self._build_pricing(
+            project.id, project.tax_rate, total_cost, total_selling
+        )
+
+    def calculate_project_pricing_from_db(self, project_id: int) -> dict | None:
+        """
+        Calculate project pricing from the running totals stored on the project,
+        without loading allocations. Returns None if the project does not exist.
+        """
+        logger.info(f"Calculating pricing from totals for project: id={project_id}")
+
+        row = self._stored_totals_query().filter(Project.id == project_id).first()
+        if row is None:
+            return None
+
+        return self._build_pricing(
+            row.id, row.tax_rate, row.total_cost, row.total_selling
+        )
+
+    def calculate_projects_pricing_from_db(
+        self, project_ids: list[int]
+    ) -> dict[int, dict]:
+        """
+        Calculate pricing for many projects from their stored running totals.
+        Projects that do not exist are absent from the result.
+        """
+        logger.info(f"Calculating pricing from totals for {len(project_ids)} projects")
+
+        rows = (
+            self._stored_totals_query().filter(Project.id.in_(set(project_ids))).all()
+        )
+        return {
+            row.id: self._build_pricing(
+                row.id, row.tax_rate, row.total_cost, row.total_selling
+            )
+            for row in rows
+        }
+
+    def check_totals(
+        self, project_ids: list[int] | None = None, tolerance: float = 0.005
+    ) -> list[dict]:
+        """
+        Compare the stored running totals with totals aggregated from the weekly
+        allocations. Returns one entry per project whose totals diverge.
+        """
+        stored_query = self._stored_totals_query()
+        aggregate_query = self._aggregate_totals_query()
+        if project_ids is not None:
+            stored_query = stored_query.filter(Project.id.in_(set(project_ids)))
+            aggregate_query = aggregate_query.filter(Project.id.in_(set(project_ids)))
+
+        aggregates = {row.id: row for row in aggregate_query}
+        mismatches = []
+        for stored in stored_query:
+            aggregate = aggregates[stored.id]
+            fields = ("total_hours", "total_cost", "total_selling")
+            if any(
+                abs(float(getattr(stored, f)) - float(getattr(aggregate, f)))
+                > tolerance
+                for f in fields
+            ):
+                mismatches.append(
+                    {
+                        "project_id": stored.id,
+                        "stored": {f: float(getattr(stored, f)) for f in fields},
+                        "expected": {f: float(getattr(aggregate, f)) for f in fields},
+                    }
+                )
+
+        logger.info(f"Pricing totals check completed: mismatches={len(mismatches)}")
+        return mismatches
+
+    def rebuild_totals(self, project_ids: list[int] | None = None) -> None:
+        """
+        Recompute the running totals of allocations and projects from the weekly
+        allocations with set-based UPDATEs. The caller commits.
+        """
+        allocation_hours = (
+            select(func.coalesce(func.sum(WeeklyAllocation.hours_allocated), 0.0))
+            .where(WeeklyAllocation.allocation_id == ProjectAllocation.id)
+            .scalar_subquery()
+        )
+        allocation_update = update(ProjectAllocation).values(
+            total_hours=allocation_hours,
+            total_cost=allocation_hours * ProjectAllocation.cost_hourly_rate,
+            total_selling=allocation_hours * ProjectAllocation.selling_hourly_rate,
+        )
+
+        def project_sum(column):
+            return (
+                select(func.coalesce(func.sum(column), 0.0))
+                .where(ProjectAllocation.project_id == Project.id)
+                .scalar_subquery()
+            )
+
+        project_update = update(Project).values(
+            total_hours=project_sum(ProjectAllocation.total_hours),
+            total_cost=project_sum(ProjectAllocation.total_cost),
+            total_selling=project_sum(ProjectAllocation.total_selling),
+        )
+
+        if project_ids is not None:
+            allocation_update = allocation_update.where(
+                ProjectAllocation.project_id.in_(set(project_ids))
+            )
+            project_update = project_update.where(Project.id.in_(set(project_ids)))
+
+        self.db.execute(allocation_update.execution_options(synchronize_session=False))
+        self.db.execute(project_update.execution_options(synchronize_session=False))
+        logger.info(
+            f"Pricing totals rebuilt: projects={'all' if project_ids is None else len(project_ids)}"
+        )
+
+    def _stored_totals_query(self):
+        return self.db.query(
+            Project.id,
+            Project.tax_rate,
+            Project.total_hours,
+            Project.total_cost,
+            Project.total_selling,
+        )
+
+    def _aggregate_totals_query(self):
+        """Per-project SUM(hours * rate) aggregated over allocations and weeks."""
+        return (
+            self.db.query(
+                Project.id,
+                func.coalesce(func.sum(WeeklyAllocation.hours_allocated), 0.0).label(
+                    "total_hours"
+                ),
+                func.coalesce(
+                    func.sum(
+                        WeeklyAllocation.hours_allocated
+                        * ProjectAllocation.cost_hourly_rate
+                    ),
+                    0.0,
+                ).label("total_cost"),
+                func.coalesce(
+                    func.sum(
+                        WeeklyAllocation.hours_allocated
+                        * ProjectAllocation.selling_hourly_rate
+                    ),
+                    0.0,
+                ).label("total_selling"),
+            )
+            .outerjoin(ProjectAllocation, ProjectAllocation.project_id == Project.id)
+            .outerjoin(
+                WeeklyAllocation, WeeklyAllocation.allocation_id == ProjectAllocation.id
+            )
+            .group_by(Project.id)
+        )
+
+    def _build_pricing(
+        self, project_id: int, tax_rate: float, total_cost: float, total_selling: float
+    ) -> dict:
+        total_cost = float(total_cost)
+        total_selling = float(total_selling)
         total_margin = total_selling - total_cost
 
-        tax_rate_decimal = project.tax_rate / 100.0
+        tax_rate_decimal = tax_rate / 100.0
         total_tax = total_selling * tax_rate_decimal
         final_price = total_selling + total_tax
 
@@ -52,7 +210,7 @@ class PricingService:
         )
 
         logger.info(
-            f"Pricing calculation completed for project {project.id}: "
+            f"Pricing calculation completed for project {project_id}: "
             f"cost={total_cost:.2f}, selling={total_selling:.2f}, "
             f"margin={total_margin:.2f}, tax={total_tax:.2f}, "
             f"final_price={final_price:.2f}, final_margin={final_margin_percent:.1f}%"
@@ -0,0 +1,206 @@
+import csv
+import logging
+import os
+from typing import Callable, Iterable, List
+
+from sqlalchemy import insert, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app import database
+from app.models import models
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT ... ON CONFLICT statement (and per commit when committing in batches)
+CSV_IMPORT_BATCH_SIZE = int(os.getenv("CSV_IMPORT_BATCH_SIZE", 1000))
+# Error messages kept for the response/job progress; the rest are only counted
+CSV_IMPORT_MAX_ERROR_DETAILS = int(os.getenv("CSV_IMPORT_MAX_ERROR_DETAILS", 100))
+
+TRUE_VALUES = ["true", "1", "yes", "sim", "verdadeiro"]
+UPSERT_COLUMNS = ("name", "role", "level", "is_template", "hourly_cost")
+
+
+class ProfessionalImportService:
+    """Bulk create-or-update of professionals by pid (CSV import)."""
+
+    def __init__(
+        self,
+        db: Session,
+        batch_size: int | None = None,
+        on_progress: Callable[[dict], None] | None = None,
+        progress_every: int | None = None,
+    ):
+        self.db = db
+        self.batch_size = batch_size or CSV_IMPORT_BATCH_SIZE
+        # Called with result() every progress_every rows processed, valid or
+        # not (defaults to the batch size)
+        self.on_progress = on_progress
+        self.progress_every = progress_every or self.batch_size
+        self.rows_processed = 0
+        self.created = 0
+        self.updated = 0
+        self.error_count = 0
+        # First CSV_IMPORT_MAX_ERROR_DETAILS messages only
+        self.errors: List[str] = []
+
+    @staticmethod
+    def parse_row(row: dict) -> dict:
+        """Validate a CSV row in memory; raises ValueError with the message to report."""
+        if (
+            not row.get("pid")
+            or not row.get("name")
+            or not row.get("role")
+            or not row.get("level")
+        ):
+            raise ValueError("Campos obrigatórios faltando (pid, name, role, level)")
+
+        # Parse is_template (default to False if not provided or invalid)
+        is_template_str = (row.get("is_template") or "false").strip().lower()
+
+        # Parse hourly_cost (default to 0.0 if not provided or invalid)
+        try:
+            hourly_cost = float((row.get("hourly_cost") or "0.0").strip())
+        except ValueError:
+            hourly_cost = 0.0
+
+        return {
+            "pid": row["pid"].strip(),
+            "name": row["name"].strip(),
+            "role": row["role"].strip(),
+            "level": row["level"].strip(),
+            "is_template": is_template_str in TRUE_VALUES,
+            "hourly_cost": hourly_cost,
+        }
+
+    def import_rows(
+        self, rows: Iterable[dict], start_line: int = 2, commit: bool = False
+    ) -> dict:
+        """
+        Validate rows and upsert the valid ones in batches of batch_size,
+        consuming rows lazily so a streamed CSV is never held in memory.
+        Line numbers in error messages start at start_line (header is line 1).
+        With commit=True every batch is committed as soon as it is written;
+        otherwise the caller commits.
+        """
+        batch = []
+        for line, row in enumerate(rows, start=start_line):
+            self.rows_processed += 1
+            try:
+                batch.append(self.parse_row(row))
+            except Exception as e:
+                self.error_count += 1
+                if len(self.errors) < CSV_IMPORT_MAX_ERROR_DETAILS:
+                    self.errors.append(f"Linha {line}: {str(e)}")
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch, commit)
+                batch = []
+            if (
+                self.on_progress is not None
+                and self.rows_processed % self.progress_every == 0
+            ):
+                self.on_progress(self.result())
+        if batch:
+            self._write_batch(batch, commit)
+        return self.result()
+
+    def _write_batch(self, batch: List[dict], commit: bool) -> None:
+        self.upsert(batch)
+        if commit:
+            self.db.commit()
+            logger.debug(
+                f"CSV import batch committed: created={self.created}, updated={self.updated}"
+            )
+
+    def result(self) -> dict:
+        """Counts so far; error_details is capped at CSV_IMPORT_MAX_ERROR_DETAILS."""
+        return {
+            "rows_processed": self.rows_processed,
+            "created": self.created,
+            "updated": self.updated,
+            "errors": self.error_count,
+            "error_details": self.errors,
+        }
+
+    def upsert(self, rows: List[dict]) -> None:
+        """
+        Create or update rows by pid with one statement per batch. When a pid
+        repeats within the batch the last row wins and the earlier ones count
+        as updates, as if the rows had been applied in order.
+        """
+        by_pid = {row["pid"]: row for row in rows}
+        repeated = len(rows) - len(by_pid)
+        unique_rows = list(by_pid.values())
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            created = self._upsert_on_conflict(unique_rows)
+        else:
+            created = self._upsert_by_lookup(unique_rows)
+
+        self.created += created
+        self.updated += len(unique_rows) - created + repeated
+
+    def _upsert_on_conflict(self, rows: List[dict]) -> int:
+        """INSERT ... ON CONFLICT (pid) DO UPDATE; xmax = 0 marks inserted rows."""
+        statement = pg_insert(models.Professional).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[models.Professional.pid],
+            set_={column: statement.excluded[column] for column in UPSERT_COLUMNS},
+        ).returning(literal_column("xmax = 0"))
+        return sum(1 for (inserted,) in self.db.execute(statement) if inserted)
+
+    def _upsert_by_lookup(self, rows: List[dict]) -> int:
+        """Portable path: one IN lookup, then a bulk INSERT and a bulk UPDATE."""
+        existing = dict(
+            self.db.execute(
+                select(models.Professional.pid, models.Professional.id).where(
+                    models.Professional.pid.in_([row["pid"] for row in rows])
+                )
+            ).all()
+        )
+        new_rows = [row for row in rows if row["pid"] not in existing]
+        updated_rows = [
+            {**row, "id": existing[row["pid"]]}
+            for row in rows
+            if row["pid"] in existing
+        ]
+        if new_rows:
+            self.db.execute(insert(models.Professional), new_rows)
+        if updated_rows:
+            self.db.execute(update(models.Professional), updated_rows)
+        return len(new_rows)
+
+
+def run_import_job(context, path: str, filename: str) -> dict:
+    """
+    Background job (app/services/job_runner.py) importing a CSV file saved
+    to path; the file is removed when the job ends.
+    """
+    logger.info(
+        f"Starting background CSV import: job={context.job_id}, file={filename}"
+    )
+    db = database.SessionLocal()
+    try:
+        import_service = ProfessionalImportService(
+            db, on_progress=lambda progress: context.update_progress(**progress)
+        )
+        try:
+            with open(path, encoding="utf-8", newline="") as text_stream:
+                result = import_service.import_rows(
+                    csv.DictReader(text_stream), commit=True
+                )
+        except UnicodeDecodeError:
+            raise ValueError(
+                "Arquivo deve estar codificado em UTF-8 (lotes gravados antes do erro foram mantidos)"
+            )
+        context.update_progress(**result)
+        logger.info(
+            f"Background CSV import completed: job={context.job_id}, created={result['created']}, updated={result['updated']}, errors={result['errors']}"
+        )
+        return {"message": "Importação concluída", **result}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        os.remove(path)
@@ -1,10 +1,18 @@
 import logging
-from typing import List, Sequence
+from typing import Iterable, List, Sequence
 
-from sqlalchemy.orm import Session, joinedload
+import numpy as np
+from sqlalchemy import bindparam, case, delete, func, insert, select, update
+from sqlalchemy.orm import Session
 
 from app.models import models
-from app.services.calendar_service import CalendarService
+from app.serializers import (
+    compact_storage_enabled,
+    pack_weekly_hours,
+    unpack_weekly_hours,
+    weekly_allocations_from_records,
+)
+from app.services.calendar_service import get_calendar_service
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +22,7 @@ class ProjectAllocationService:
 
     def __init__(self, db: Session):
         self.db = db
-        self.calendar_service = CalendarService(country_code="BR")
+        self.calendar_service = get_calendar_service(country_code="BR")
 
     def get_project_weeks(self, project: models.Project) -> List[dict]:
         return self.calendar_service.get_weekly_breakdown(
@@ -49,99 +57,492 @@ class ProjectAllocationService:
         allocation_percentage: float = 0.0,
         weeks: Sequence[dict] | None = None,
     ) -> models.ProjectAllocation:
-        selling_rate = selling_hourly_rate
-        if selling_rate is None:
-            selling_rate = self.calculate_selling_rate(project, professional)
-
-        allocation = models.ProjectAllocation(
-            project_id=project.id,
-            professional_id=professional.id,
-            cost_hourly_rate=professional.hourly_cost,
-            selling_hourly_rate=selling_rate,
-        )
-        self.db.add(allocation)
-        self.db.flush()
+        return self.create_allocations(
+            project=project,
+            allocations=[
+                {
+                    "professional": professional,
+                    "selling_hourly_rate": selling_hourly_rate,
+                    "allocation_percentage": allocation_percentage,
+                }
+            ],
+            weeks=weeks,
+        )[0]
+
+    def create_allocations(
+        self,
+        *,
+        project: models.Project,
+        allocations: Sequence[dict],
+        weeks: Sequence[dict] | None = None,
+    ) -> List[models.ProjectAllocation]:
+        """
+        Create several allocations and all of their weekly rows in bulk.
+        Each item holds "professional" and optional "selling_hourly_rate" and
+        "allocation_percentage"; the selling rate defaults to the project margin.
+        """
+        if not allocations:
+            return []
+        if weeks is None:
+            weeks = self.get_project_weeks(project)
 
-        self.create_weekly_allocations(
-            allocation_id=allocation.id,
-            weeks=weeks or self.get_project_weeks(project),
-            allocation_percentage=allocation_percentage,
+        allocation_rows = []
+        weekly_rows_per_allocation = []
+        for item in allocations:
+            professional = item["professional"]
+            selling_rate = item.get("selling_hourly_rate")
+            if selling_rate is None:
+                selling_rate = self.calculate_selling_rate(project, professional)
+
+            weekly_rows = self._weekly_rows(
+                weeks, item.get("allocation_percentage", 0.0)
+            )
+            total_hours = sum(row["hours_allocated"] for row in weekly_rows)
+            allocation_rows.append(
+                {
+                    "project_id": project.id,
+                    "professional_id": professional.id,
+                    "cost_hourly_rate": professional.hourly_cost,
+                    "selling_hourly_rate": selling_rate,
+                    "total_hours": total_hours,
+                    "total_cost": total_hours * professional.hourly_cost,
+                    "total_selling": total_hours * selling_rate,
+                }
+            )
+            weekly_rows_per_allocation.append(weekly_rows)
+
+        created = self.db.scalars(
+            insert(models.ProjectAllocation).returning(
+                models.ProjectAllocation, sort_by_parameter_order=True
+            ),
+            allocation_rows,
+        ).all()
+
+        weekly_rows = [
+            {**row, "allocation_id": allocation.id}
+            for allocation, rows in zip(created, weekly_rows_per_allocation)
+            for row in rows
+        ]
+        if weekly_rows:
+            self.db.execute(insert(models.WeeklyAllocation), weekly_rows)
+        self.refresh_packed_weekly_hours([allocation.id for allocation in created])
+
+        self.increment_totals(
+            project.id,
+            {},
+            project_delta=(
+                sum(row["total_hours"] for row in allocation_rows),
+                sum(row["total_cost"] for row in allocation_rows),
+                sum(row["total_selling"] for row in allocation_rows),
+            ),
         )
-        return allocation
+        return created
 
-    def clone_allocation(
-        self, *, original: models.ProjectAllocation, target_project: models.Project
-    ) -> models.ProjectAllocation:
-        new_alloc = models.ProjectAllocation(
-            project_id=target_project.id,
-            professional_id=original.professional_id,
-            cost_hourly_rate=original.cost_hourly_rate,
-            selling_hourly_rate=original.selling_hourly_rate,
+    def clone_project_allocations(
+        self, *, source_project_id: int, target_project: models.Project
+    ) -> int:
+        """
+        Copy every allocation of the source project, with its weekly rows, into
+        the target project using set-based SQL. Rates (including the frozen
+        cost_hourly_rate) and hours are copied as-is. Returns allocations cloned.
+        """
+        allocation_columns = (
+            models.ProjectAllocation.professional_id,
+            models.ProjectAllocation.cost_hourly_rate,
+            models.ProjectAllocation.selling_hourly_rate,
+            models.ProjectAllocation.total_hours,
+            models.ProjectAllocation.total_cost,
+            models.ProjectAllocation.total_selling,
         )
-        self.db.add(new_alloc)
-        self.db.flush()
-
-        for orig_weekly in original.weekly_allocations:
-            weekly = models.WeeklyAllocation(
-                allocation_id=new_alloc.id,
-                week_number=orig_weekly.week_number,
-                hours_allocated=orig_weekly.hours_allocated,
-                available_hours=orig_weekly.available_hours,
+        originals = self.db.execute(
+            select(models.ProjectAllocation.id, *allocation_columns)
+            .where(models.ProjectAllocation.project_id == source_project_id)
+            .order_by(models.ProjectAllocation.id)
+        ).all()
+        if not originals:
+            return 0
+
+        new_ids = self.db.scalars(
+            insert(models.ProjectAllocation).returning(
+                models.ProjectAllocation.id, sort_by_parameter_order=True
+            ),
+            [
+                {
+                    "project_id": target_project.id,
+                    **{
+                        column.key: getattr(row, column.key)
+                        for column in allocation_columns
+                    },
+                }
+                for row in originals
+            ],
+        ).all()
+        id_map = {row.id: new_id for row, new_id in zip(originals, new_ids)}
+
+        weekly = models.WeeklyAllocation
+        self.db.execute(
+            insert(weekly).from_select(
+                ["allocation_id", "week_number", "hours_allocated", "available_hours"],
+                select(
+                    case(id_map, value=weekly.allocation_id),
+                    weekly.week_number,
+                    weekly.hours_allocated,
+                    weekly.available_hours,
+                ).where(weekly.allocation_id.in_(id_map.keys())),
             )
-            self.db.add(weekly)
-        return new_alloc
+        )
+        self.refresh_packed_weekly_hours(new_ids)
+
+        self.increment_totals(
+            target_project.id,
+            {},
+            project_delta=(
+                sum(row.total_hours for row in originals),
+                sum(row.total_cost for row in originals),
+                sum(row.total_selling for row in originals),
+            ),
+        )
+        return len(originals)
 
     def sync_project_weeks(self, project: models.Project) -> int:
-        """Align allocation calendars after a change in dates/duration."""
+        """
+        Align allocation calendars after a change in dates/duration.
+
+        Runs a fixed number of set-based statements for the whole project:
+        one UPDATE of available hours, one DELETE of weeks beyond the new
+        duration and one bulk INSERT of every missing week number (plus one
+        SELECT of the week numbers of allocations with gaps, if any).
+        """
         new_weeks = self.get_project_weeks(project)
-        new_weeks_map = {w["week_number"]: w for w in new_weeks}
-        new_week_numbers = set(new_weeks_map.keys())
-
-        allocations = (
-            self.db.query(models.ProjectAllocation)
-            .options(joinedload(models.ProjectAllocation.weekly_allocations))
-            .filter(models.ProjectAllocation.project_id == project.id)
-            .all()
+        week_count = len(new_weeks)
+        weekly = models.WeeklyAllocation
+
+        allocations = self.db.execute(
+            select(
+                models.ProjectAllocation.id,
+                models.ProjectAllocation.cost_hourly_rate,
+                models.ProjectAllocation.selling_hourly_rate,
+                func.max(weekly.week_number).label("last_week"),
+                func.count(
+                    func.distinct(
+                        case(
+                            (
+                                weekly.week_number.between(1, week_count),
+                                weekly.week_number,
+                            )
+                        )
+                    )
+                ).label("kept_weeks"),
+                func.coalesce(
+                    func.sum(
+                        case(
+                            (weekly.week_number > week_count, weekly.hours_allocated),
+                            else_=0.0,
+                        )
+                    ),
+                    0.0,
+                ).label("removed_hours"),
+            )
+            .outerjoin(weekly, weekly.allocation_id == models.ProjectAllocation.id)
+            .where(models.ProjectAllocation.project_id == project.id)
+            .group_by(
+                models.ProjectAllocation.id,
+                models.ProjectAllocation.cost_hourly_rate,
+                models.ProjectAllocation.selling_hourly_rate,
+            )
+        ).all()
+        if not allocations:
+            return week_count
+
+        allocation_ids = [allocation.id for allocation in allocations]
+
+        if new_weeks:
+            self.db.execute(
+                update(weekly)
+                .where(
+                    weekly.allocation_id.in_(allocation_ids),
+                    weekly.week_number <= week_count,
+                )
+                .values(
+                    available_hours=case(
+                        {w["week_number"]: w["available_hours"] for w in new_weeks},
+                        value=weekly.week_number,
+                    )
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        self.db.execute(
+            delete(weekly)
+            .where(
+                weekly.allocation_id.in_(allocation_ids),
+                weekly.week_number > week_count,
+            )
+            .execution_options(synchronize_session=False)
         )
 
+        # Allocations whose kept weeks are exactly 1..min(last_week, week_count)
+        # only miss the tail; read the week numbers of the others (gaps)
+        existing_weeks: dict[int, set[int]] = {}
+        gap_ids = [
+            allocation.id
+            for allocation in allocations
+            if allocation.kept_weeks < min(allocation.last_week or 0, week_count)
+        ]
+        if gap_ids:
+            for allocation_id, week_number in self.db.execute(
+                select(weekly.allocation_id, weekly.week_number).where(
+                    weekly.allocation_id.in_(gap_ids),
+                    weekly.week_number.between(1, week_count),
+                )
+            ):
+                existing_weeks.setdefault(allocation_id, set()).add(week_number)
+
+        missing_rows = []
         for allocation in allocations:
-            existing_weeks = {w.week_number: w for w in allocation.weekly_allocations}
-            existing_week_numbers = set(existing_weeks.keys())
-
-            weeks_to_update = existing_week_numbers & new_week_numbers
-            for week_num in weeks_to_update:
-                existing_week = existing_weeks[week_num]
-                new_week_data = new_weeks_map[week_num]
-                existing_week.available_hours = new_week_data["available_hours"]
-
-            weeks_to_remove = existing_week_numbers - new_week_numbers
-            for week_num in weeks_to_remove:
-                self.db.delete(existing_weeks[week_num])
-
-            weeks_to_add = sorted(new_week_numbers - existing_week_numbers)
-            if weeks_to_add:
-                weeks_data_to_add = [new_weeks_map[wn] for wn in weeks_to_add]
-                self.create_weekly_allocations(
-                    allocation.id, weeks_data_to_add, allocation_percentage=0.0
+            present = existing_weeks.get(allocation.id)
+            if present is None:
+                missing = new_weeks[min(allocation.last_week or 0, week_count) :]
+            else:
+                missing = [w for w in new_weeks if w["week_number"] not in present]
+            missing_rows.extend(
+                {
+                    "allocation_id": allocation.id,
+                    "week_number": week["week_number"],
+                    "hours_allocated": 0.0,
+                    "available_hours": week["available_hours"],
+                }
+                for week in missing
+            )
+        if missing_rows:
+            self.db.execute(insert(weekly), missing_rows)
+        self.refresh_packed_weekly_hours(allocation_ids)
+
+        self.increment_totals(
+            project.id,
+            {
+                allocation.id: (
+                    -allocation.removed_hours,
+                    -allocation.removed_hours * allocation.cost_hourly_rate,
+                    -allocation.removed_hours * allocation.selling_hourly_rate,
                 )
+                for allocation in allocations
+            },
+        )
+        return week_count
 
-        return len(new_weeks)
+    def refresh_packed_weekly_hours(self, allocation_ids: Iterable[int]) -> None:
+        """
+        Repack the given allocations after a write to their weekly rows, only
+        when WEEKLY_STORAGE_MODE=compact. In rows mode the packed column is
+        not maintained (nor read, see get_packed_weekly_records); run
+        `python -m app.manage repack-weekly` before switching to compact.
+        """
+        if compact_storage_enabled():
+            self.repack_weekly_hours(allocation_ids=allocation_ids)
 
-    def create_weekly_allocations(
+    def repack_weekly_hours(
         self,
-        allocation_id: int,
-        weeks: Sequence[dict],
-        allocation_percentage: float = 100.0,
-    ) -> None:
+        *,
+        allocation_ids: Iterable[int] | None = None,
+        project_id: int | None = None,
+    ) -> int:
+        """
+        Rewrite the packed weekly hours (see app/serializers.py) of the given
+        allocations, or of every allocation of project_id, from their weekly
+        rows: one SELECT plus one bulk UPDATE by primary key.
+        Returns the number of allocations repacked.
+        """
+        weekly = models.WeeklyAllocation
+        query = (
+            select(
+                models.ProjectAllocation.id,
+                weekly.id,
+                weekly.week_number,
+                weekly.hours_allocated,
+                weekly.available_hours,
+            )
+            .outerjoin(weekly, weekly.allocation_id == models.ProjectAllocation.id)
+            .order_by(models.ProjectAllocation.id, weekly.week_number)
+        )
+        if allocation_ids is not None:
+            query = query.where(models.ProjectAllocation.id.in_(list(allocation_ids)))
+        if project_id is not None:
+            query = query.where(models.ProjectAllocation.project_id == project_id)
+
+        weeks_by_allocation: dict[int, list] = {}
+        for allocation_id, *week in self.db.execute(query):
+            weeks = weeks_by_allocation.setdefault(allocation_id, [])
+            if week[0] is not None:
+                weeks.append(week)
+
+        if weeks_by_allocation:
+            self.db.execute(
+                update(models.ProjectAllocation),
+                [
+                    {
+                        "id": allocation_id,
+                        "weekly_hours_packed": pack_weekly_hours(weeks),
+                    }
+                    for allocation_id, weeks in weeks_by_allocation.items()
+                ],
+            )
+        return len(weeks_by_allocation)
+
+    def get_packed_weekly_records(
+        self, allocations: Iterable[models.ProjectAllocation]
+    ) -> dict[int, np.ndarray]:
+        """
+        Weeks of each allocation (keyed by id) as WEEKLY_RECORD arrays decoded
+        from the packed column. Allocations that were never packed, and all of
+        them outside compact mode (where the column may be stale), are read
+        from their rows instead.
+        """
+        compact = compact_storage_enabled()
+        weekly_records = {}
+        unpacked_ids = []
+        for allocation in allocations:
+            if not compact or allocation.weekly_hours_packed is None:
+                unpacked_ids.append(allocation.id)
+            else:
+                weekly_records[allocation.id] = unpack_weekly_hours(
+                    allocation.weekly_hours_packed
+                )
+
+        if unpacked_ids:
+            if compact:
+                logger.debug(
+                    f"Reading weeks from rows for unpacked allocations: {unpacked_ids}"
+                )
+            weekly_records.update(self.get_weekly_records(unpacked_ids))
+        return weekly_records
+
+    def get_weekly_records(
+        self, allocation_ids: Iterable[int]
+    ) -> dict[int, np.ndarray]:
+        """
+        Weeks of each allocation (keyed by id) as WEEKLY_RECORD arrays read
+        from the weekly rows with one column-only query (no ORM objects).
+        """
+        weekly = models.WeeklyAllocation
+        rows_by_allocation: dict[int, list] = {
+            allocation_id: [] for allocation_id in allocation_ids
+        }
+        if not rows_by_allocation:
+            return {}
+        for allocation_id, *week in self.db.execute(
+            select(
+                weekly.allocation_id,
+                weekly.id,
+                weekly.week_number,
+                weekly.hours_allocated,
+                weekly.available_hours,
+            )
+            .where(weekly.allocation_id.in_(rows_by_allocation.keys()))
+            .order_by(weekly.allocation_id, weekly.week_number)
+        ):
+            rows_by_allocation[allocation_id].append(week)
+        return {
+            allocation_id: unpack_weekly_hours(pack_weekly_hours(weeks))
+            for allocation_id, weeks in rows_by_allocation.items()
+        }
+
+    def get_packed_weekly_allocations(
+        self, allocations: Iterable[models.ProjectAllocation]
+    ) -> dict[int, list[dict]]:
+        """Weeks of each allocation (keyed by id) in the per-week dict shape."""
+        return {
+            allocation_id: weekly_allocations_from_records(records)
+            for allocation_id, records in self.get_packed_weekly_records(
+                allocations
+            ).items()
+        }
+
+    @staticmethod
+    def _weekly_rows(weeks: Sequence[dict], allocation_percentage: float) -> List[dict]:
+        rows = []
         for week in weeks:
             hours = 0.0
             if allocation_percentage > 0:
                 hours = week["available_hours"] * (allocation_percentage / 100.0)
+            rows.append(
+                {
+                    "week_number": week["week_number"],
+                    "hours_allocated": hours,
+                    "available_hours": week["available_hours"],
+                }
+            )
+        return rows
 
-            weekly_alloc = models.WeeklyAllocation(
-                allocation_id=allocation_id,
-                week_number=week["week_number"],
-                hours_allocated=hours,
-                available_hours=week["available_hours"],
+    @staticmethod
+    def totals_delta(
+        allocation: models.ProjectAllocation,
+        hours: float = 0.0,
+        selling_hourly_rate: float | None = None,
+    ) -> tuple[float, float, float]:
+        """
+        (hours, cost, selling) delta of adding hours to the allocation and,
+        optionally, changing its selling rate to selling_hourly_rate. Read
+        the allocation with its row locked (with_for_update) in the current
+        transaction, or a concurrent write can make the delta stale.
+        """
+        if selling_hourly_rate is None:
+            selling_hourly_rate = allocation.selling_hourly_rate
+        previous_hours = allocation.total_hours or 0.0
+        return (
+            hours,
+            hours * allocation.cost_hourly_rate,
+            (previous_hours + hours) * selling_hourly_rate
+            - previous_hours * allocation.selling_hourly_rate,
+        )
+
+    def increment_totals(
+        self,
+        project_id: int,
+        deltas: dict[int, tuple[float, float, float]],
+        project_delta: tuple[float, float, float] | None = None,
+    ) -> None:
+        """
+        Add (hours, cost, selling) deltas to the running totals of the given
+        allocations and of their project, as in-database increments within the
+        current transaction. project_delta defaults to the sum of the deltas.
+        """
+        deltas = {
+            allocation_id: delta
+            for allocation_id, delta in deltas.items()
+            if any(delta)
+        }
+        if project_delta is None:
+            project_delta = tuple(sum(values) for values in zip(*deltas.values()))
+        if deltas:
+            table = models.ProjectAllocation.__table__
+            self.db.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(
+                    total_hours=table.c.total_hours + bindparam("b_hours"),
+                    total_cost=table.c.total_cost + bindparam("b_cost"),
+                    total_selling=table.c.total_selling + bindparam("b_selling"),
+                ),
+                [
+                    {
+                        "b_id": allocation_id,
+                        "b_hours": hours,
+                        "b_cost": cost,
+                        "b_selling": selling,
+                    }
+                    for allocation_id, (hours, cost, selling) in deltas.items()
+                ],
+            )
+        if project_delta and any(project_delta):
+            hours, cost, selling = project_delta
+            self.db.execute(
+                update(models.Project)
+                .where(models.Project.id == project_id)
+                .values(
+                    total_hours=models.Project.total_hours + hours,
+                    total_cost=models.Project.total_cost + cost,
+                    total_selling=models.Project.total_selling + selling,
+                )
+                .execution_options(synchronize_session=False)
             )
-            self.db.add(weekly_alloc)
@@ -0,0 +1,237 @@
+import hashlib
+import json
+import logging
+import struct
+from datetime import datetime
+from typing import IO
+
+import numpy as np
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, selectinload
+
+from app import database
+from app.models import models
+from app.services.excel_service import ExcelExportService
+from app.services.export_cache import ExportCache, get_export_cache
+from app.services.png_export_service import PNGExportService
+from app.services.project_allocation_service import ProjectAllocationService
+
+logger = logging.getLogger(__name__)
+
+# format -> (media type, filename prefix)
+EXPORT_FORMATS = {
+    "xlsx": (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "projeto",
+    ),
+    "png": ("image/png", ""),
+}
+
+# Part of every export key: bump it when the rendered files change (layout,
+# styles, new fields) so cached exports of unchanged projects are re-rendered
+EXPORT_RENDER_VERSION = 1
+
+_WEEK_FIELDS = ("week_number", "hours_allocated", "available_hours")
+
+
+def generate_export_filename(
+    project_name: str, extension: str, prefix: str = ""
+) -> str:
+    """Generate standardized export filename with timestamp"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    clean_name = project_name.replace(" ", "_")
+    if prefix:
+        return f"{prefix}_{clean_name}_{timestamp}.{extension}"
+    return f"{clean_name}_{timestamp}.{extension}"
+
+
+class ProjectExportService:
+    """Renders project exports, reusing cached files for unchanged projects."""
+
+    def __init__(self, db: Session, cache: ExportCache | None = None):
+        self.db = db
+        self.cache = cache if cache is not None else get_export_cache()
+
+    def load_project(self, project_id: int) -> models.Project | None:
+        """
+        Project with allocations and professionals: enough for export_key
+        (which reads the weeks with a column-only query); render loads the
+        weekly rows as ORM objects only on a cache miss.
+        """
+        projects = self.load_projects([project_id])
+        return projects[0] if projects else None
+
+    def load_projects(self, project_ids: list[int]) -> list[models.Project]:
+        """load_project for many projects with one batched query per level."""
+        return (
+            self.db.query(models.Project)
+            .options(
+                selectinload(models.Project.allocations).joinedload(
+                    models.ProjectAllocation.professional
+                )
+            )
+            .filter(models.Project.id.in_(project_ids))
+            .order_by(models.Project.id)
+            .all()
+        )
+
+    def export_key(
+        self,
+        project: models.Project,
+        format: str,
+        weekly_records: dict[int, np.ndarray] | None = None,
+    ) -> str:
+        """
+        SHA-256 of everything the exported file is rendered from: project
+        fields, allocation rates and professionals, and the hours of every
+        week. The weeks are hashed from the weekly rows, the source of truth,
+        never from the packed column, which is only maintained in compact
+        mode. weekly_records (get_weekly_records of many projects) replaces
+        the per-project query.
+        """
+        allocations = sorted(project.allocations, key=lambda a: a.id)
+        if weekly_records is None:
+            weekly_records = self.get_weekly_records([project])
+
+        state = {
+            "version": EXPORT_RENDER_VERSION,
+            "format": format,
+            "name": project.name,
+            "start_date": project.start_date.isoformat(),
+            "duration_months": project.duration_months,
+            "tax_rate": project.tax_rate,
+            "margin_rate": project.margin_rate,
+            "allocations": [
+                [
+                    allocation.id,
+                    allocation.professional.pid,
+                    allocation.professional.name,
+                    allocation.professional.role,
+                    allocation.professional.level,
+                    allocation.cost_hourly_rate,
+                    allocation.selling_hourly_rate,
+                ]
+                for allocation in allocations
+            ],
+        }
+        digest = hashlib.sha256(json.dumps(state, ensure_ascii=False).encode("utf-8"))
+        for allocation in allocations:
+            records = weekly_records[allocation.id]
+            digest.update(struct.pack("<qq", allocation.id, len(records)))
+            for field in _WEEK_FIELDS:
+                digest.update(records[field].tobytes())
+        return digest.hexdigest()
+
+    def get_weekly_records(
+        self, projects: list[models.Project]
+    ) -> dict[int, np.ndarray]:
+        """Weekly records of every allocation of projects, for export_key."""
+        return ProjectAllocationService(self.db).get_weekly_records(
+            allocation.id for project in projects for allocation in project.allocations
+        )
+
+    def render(self, project: models.Project, format: str) -> IO[bytes]:
+        """Render the export file (positioned at the start)."""
+        self.load_weekly_rows([project])
+        if format == "xlsx":
+            return ExcelExportService(self.db).export_project_to_excel(project)
+        return PNGExportService(self.db).export_project_to_png(project)
+
+    def get_or_render(
+        self, project: models.Project, format: str, key: str
+    ) -> IO[bytes]:
+        """
+        Open the cached export for key, rendering and caching it on a miss.
+        The caller closes the returned file.
+        """
+        path = self.cache.get(key)
+        if path is None:
+            logger.info(
+                f"Export cache miss, rendering: project_id={project.id}, format={format}"
+            )
+            file = self.render(project, format)
+            path = self.cache.put(key, file)
+            if path is None:
+                file.seek(0)
+                return file
+            file.close()
+        # An open file stays readable even if the entry is evicted meanwhile
+        return open(path, "rb")
+
+    def load_weekly_rows(self, projects: list[models.Project]) -> None:
+        """Load the weekly rows of all allocations in one batched query."""
+        allocation_ids = [
+            allocation.id
+            for project in projects
+            for allocation in project.allocations
+            if "weekly_allocations" in inspect(allocation).unloaded
+        ]
+        if allocation_ids:
+            self.db.query(models.ProjectAllocation).options(
+                selectinload(models.ProjectAllocation.weekly_allocations)
+            ).filter(models.ProjectAllocation.id.in_(allocation_ids)).all()
+
+
+def run_export_job(context, project_id: int, format: str) -> dict:
+    """
+    Background job (process pool, see app/services/job_runner.py) rendering
+    a project export into the export cache. The result carries the cache key
+    the file is downloaded by.
+    """
+    logger.info(
+        f"Starting background export: job={context.job_id}, project_id={project_id}, format={format}"
+    )
+    db = database.SessionLocal()
+    try:
+        export_service = ProjectExportService(db)
+        project = export_service.load_project(project_id)
+        if project is None:
+            raise ValueError("Projeto não encontrado")
+        key = export_service.export_key(project, format)
+        export_service.get_or_render(project, format, key).close()
+
+        media_type, prefix = EXPORT_FORMATS[format]
+        filename = generate_export_filename(project.name, format, prefix=prefix)
+        logger.info(
+            f"Background export completed: job={context.job_id}, filename={filename}"
+        )
+        return {
+            "project_id": project_id,
+            "format": format,
+            "cache_key": key,
+            "media_type": media_type,
+            "filename": filename,
+        }
+    finally:
+        db.close()
+
+
+def render_exports_chunk(project_ids: list[int], format: str) -> dict[int, str]:
+    """
+    Render the exports of several projects into the export cache, loading
+    them with batched queries. Runs in the export process pool (bulk ZIP
+    exports); returns the cache key of each project found.
+    """
+    db = database.SessionLocal()
+    try:
+        export_service = ProjectExportService(db)
+        projects = export_service.load_projects(project_ids)
+        weekly_records = export_service.get_weekly_records(projects)
+        keys = {
+            project.id: export_service.export_key(project, format, weekly_records)
+            for project in projects
+        }
+        misses = [
+            project
+            for project in projects
+            if not export_service.cache.get(keys[project.id])
+        ]
+        export_service.load_weekly_rows(misses)
+        for project in misses:
+            export_service.get_or_render(project, format, keys[project.id]).close()
+        logger.info(
+            f"Rendered export chunk: projects={len(projects)}, rendered={len(misses)}"
+        )
+        return keys
+    finally:
+        db.close()
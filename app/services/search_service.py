@@ -0,0 +1,250 @@
+"""
+Fuzzy search for professionals and projects, ranked by trigram similarity.
+
+On PostgreSQL the match and the ranking run in the database with pg_trgm
+(`%` similarity operator plus ILIKE, both served by the GIN trigram indexes of
+migration 0005). Other databases (the SQLite test setups) use NgramIndex, an
+in-memory trigram index built from the searchable columns and rebuilt lazily
+after commits that write to the table. That index is per process, which is
+fine for single-process test setups only.
+"""
+
+import logging
+import re
+import threading
+from typing import Iterable, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import event, func, or_, select
+from sqlalchemy.orm import Query, Session
+
+from app.models import models
+from app.pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+# Searchable columns per model; the first one is the display name
+SEARCH_FIELDS: dict[type, tuple[str, ...]] = {
+    models.Professional: ("name", "pid", "role", "level"),
+    models.Project: ("name",),
+}
+
+# Same default as pg_trgm.similarity_threshold
+SIMILARITY_THRESHOLD = 0.3
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """Trigrams of text the way pg_trgm builds them (per word, space padded)."""
+    result = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        result.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(result)
+
+
+def similarity(left: frozenset[str], right: frozenset[str]) -> float:
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+class NgramIndex:
+    """In-memory trigram index over (id, field values) documents."""
+
+    def __init__(self, documents: Iterable[tuple[int, Sequence[str]]]):
+        self._values: dict[int, tuple[str, ...]] = {}
+        self._trigrams: dict[int, tuple[frozenset[str], ...]] = {}
+        self._postings: dict[str, set[int]] = {}
+        for doc_id, values in documents:
+            lowered = tuple((value or "").lower() for value in values)
+            field_trigrams = tuple(trigrams(value) for value in lowered)
+            self._values[doc_id] = lowered
+            self._trigrams[doc_id] = field_trigrams
+            for gram in frozenset().union(*field_trigrams):
+                self._postings.setdefault(gram, set()).add(doc_id)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def search(self, term: str) -> list[int]:
+        """
+        Ids of documents with a field containing term or similar to it,
+        best similarity first (ties by first field, then id).
+        """
+        needle = term.lower().strip()
+        term_trigrams = trigrams(needle)
+        if len(needle) < 3 or not term_trigrams:
+            # Too short to share a trigram with a containing value
+            candidates = self._values.keys()
+        else:
+            candidates = set()
+            for gram in term_trigrams:
+                candidates.update(self._postings.get(gram, ()))
+
+        ranked = []
+        for doc_id in candidates:
+            score = max(
+                similarity(term_trigrams, field) for field in self._trigrams[doc_id]
+            )
+            values = self._values[doc_id]
+            if score >= SIMILARITY_THRESHOLD or any(needle in v for v in values):
+                ranked.append((-score, values[0], doc_id))
+        ranked.sort()
+        return [doc_id for _, _, doc_id in ranked]
+
+
+# table name -> generation, bumped after each commit writing to the table
+_generations: dict[str, int] = {}
+_indexes: dict[tuple[int, str], tuple[int, NgramIndex]] = {}
+_indexes_lock = threading.Lock()
+_TRACKED_TABLES = {model.__tablename__ for model in SEARCH_FIELDS}
+
+
+def _mark_dirty(session: Session, table_name: str) -> None:
+    if table_name in _TRACKED_TABLES:
+        session.info.setdefault("search_dirty_tables", set()).add(table_name)
+
+
+def _on_flush_write(mapper, connection, target) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        _mark_dirty(session, mapper.local_table.name)
+
+
+for _model in SEARCH_FIELDS:
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _on_flush_write)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_bulk_write(orm_execute_state) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or (orm_execute_state.is_delete)
+    ):
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            _mark_dirty(orm_execute_state.session, mapper.local_table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session: Session) -> None:
+    for table_name in session.info.pop("search_dirty_tables", ()):
+        with _indexes_lock:
+            _generations[table_name] = _generations.get(table_name, 0) + 1
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_rollback(session: Session) -> None:
+    session.info.pop("search_dirty_tables", None)
+
+
+class SearchService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+
+    def search_page(
+        self,
+        query: Query,
+        model: type,
+        term: str,
+        *,
+        limit: int,
+        skip: int = 0,
+        cursor: str | None = None,
+        include_total: bool = True,
+    ) -> tuple[list, int | None, str | None]:
+        """
+        Page of query matching term, best matches first.
+        Ranked results have no stable keyset, so the cursor wraps an offset.
+        Returns (items, total or None, next cursor or None).
+        """
+        offset = skip
+        if cursor:
+            payload = decode_cursor(cursor)
+            if not isinstance(payload.get("offset"), int) or payload["offset"] < 0:
+                raise HTTPException(status_code=400, detail="Cursor inválido")
+            offset += payload["offset"]
+
+        if self.dialect == "postgresql":
+            items, total = self._search_trigram(
+                query, model, term, offset, limit, include_total
+            )
+        else:
+            items, total = self._search_ngram_index(query, model, term, offset, limit)
+            if not include_total:
+                total = None
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor({"offset": offset + limit})
+        logger.debug(
+            f"Search: model={model.__name__}, term={term!r}, offset={offset}, "
+            f"returned={len(items)}, total={total}"
+        )
+        return items, total, next_cursor
+
+    def _search_trigram(
+        self,
+        query: Query,
+        model: type,
+        term: str,
+        offset: int,
+        limit: int,
+        include_total: bool,
+    ) -> tuple[list, int | None]:
+        columns = [getattr(model, field) for field in SEARCH_FIELDS[model]]
+        matches = query.filter(
+            or_(
+                *[column.icontains(term, autoescape=True) for column in columns],
+                *[column.op("%")(term) for column in columns],
+            )
+        )
+        total = matches.order_by(None).count() if include_total else None
+
+        similarities = [func.similarity(column, term) for column in columns]
+        rank = similarities[0] if len(columns) == 1 else func.greatest(*similarities)
+        items = (
+            matches.order_by(rank.desc(), func.lower(model.name), model.id)
+            .offset(offset)
+            .limit(limit + 1)
+            .all()
+        )
+        return items, total
+
+    def _search_ngram_index(
+        self, query: Query, model: type, term: str, offset: int, limit: int
+    ) -> tuple[list, int]:
+        ranked_ids = self._ngram_index(model).search(term)
+        page_ids = ranked_ids[offset : offset + limit + 1]
+        if not page_ids:
+            return [], len(ranked_ids)
+        by_id = {item.id: item for item in query.filter(model.id.in_(page_ids))}
+        items = [by_id[item_id] for item_id in page_ids if item_id in by_id]
+        return items, len(ranked_ids)
+
+    def _ngram_index(self, model: type) -> NgramIndex:
+        table_name = model.__tablename__
+        key = (id(self.db.get_bind()), table_name)
+        with _indexes_lock:
+            generation = _generations.get(table_name, 0)
+            cached = _indexes.get(key)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
+        columns = [getattr(model, field) for field in SEARCH_FIELDS[model]]
+        index = NgramIndex(
+            (row[0], row[1:]) for row in self.db.execute(select(model.id, *columns))
+        )
+        with _indexes_lock:
+            _indexes[key] = (generation, index)
+        logger.info(
+            f"Search n-gram index built: table={table_name}, documents={len(index)}"
+        )
+        return index
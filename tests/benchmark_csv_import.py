@@ -0,0 +1,105 @@
+"""
+Benchmark for the professionals CSV import.
+Compares the former per-row path (one SELECT by pid per row, then ORM
+add/mutate) with ProfessionalImportService's chunked bulk upsert, importing
+a roster twice (all creates, then all updates).
+
+Usage:
+    python tests/benchmark_csv_import.py [--database-url URL] [--rows 5000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine, delete  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models import models  # noqa: E402
+from app.services.professional_import_service import (  # noqa: E402
+    ProfessionalImportService,
+)
+
+
+def roster(rows, cost):
+    return [
+        {
+            "pid": f"BENCH-CSV-{index}",
+            "name": f"Benchmark {index}",
+            "role": "Dev",
+            "level": "Sr",
+            "is_template": "false",
+            "hourly_cost": str(cost),
+        }
+        for index in range(rows)
+    ]
+
+
+def import_per_row(db, rows):
+    """Former implementation: one lookup per row."""
+    for row in rows:
+        data = ProfessionalImportService.parse_row(row)
+        existing = (
+            db.query(models.Professional)
+            .filter(models.Professional.pid == data["pid"])
+            .first()
+        )
+        if existing:
+            for key, value in data.items():
+                setattr(existing, key, value)
+        else:
+            db.add(models.Professional(**data))
+    db.commit()
+
+
+def import_bulk(db, rows):
+    ProfessionalImportService(db).import_rows(rows)
+    db.commit()
+
+
+def run(session_factory, label, import_rows, rows):
+    elapsed = 0.0
+    for cost in (100.0, 120.0):
+        db = session_factory()
+        try:
+            started = time.perf_counter()
+            import_rows(db, roster(rows, cost))
+            elapsed += time.perf_counter() - started
+        finally:
+            db.close()
+
+    db = session_factory()
+    try:
+        db.execute(delete(models.Professional))
+        db.commit()
+    finally:
+        db.close()
+
+    print(
+        f"{label:>8}: {2 * rows} rows in {elapsed:.3f}s ({2 * rows / elapsed:,.0f} rows/s)"
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    print(f"Importing {args.rows} professionals twice ({engine.dialect.name})")
+    before = run(session_factory, "per-row", import_per_row, args.rows)
+    after = run(session_factory, "bulk", import_bulk, args.rows)
+    print(f"Speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark for the project Excel export.
+Exports a wide multi-year project the way GET /projects/{id}/export does and
+reports render time, file size and peak memory (tracemalloc) of the export.
+
+Usage:
+    python tests/benchmark_excel_export.py [--database-url URL]
+        [--allocations 60] [--months 60] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import joinedload, sessionmaker  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models import models  # noqa: E402
+from app.services.excel_service import ExcelExportService  # noqa: E402
+from app.services.project_allocation_service import (  # noqa: E402
+    ProjectAllocationService,
+)
+
+
+def create_project(session_factory, allocations, months):
+    db = session_factory()
+    try:
+        project = models.Project(
+            name="Benchmark export",
+            start_date=date(2025, 1, 1),
+            duration_months=months,
+            tax_rate=10.0,
+            margin_rate=20.0,
+        )
+        db.add(project)
+        db.flush()
+        professionals = []
+        for index in range(allocations):
+            professional = models.Professional(
+                pid=f"BENCH-EXPORT-{index}",
+                name=f"Benchmark {index}",
+                role="Dev",
+                level="Sr",
+                hourly_cost=100.0,
+            )
+            db.add(professional)
+            professionals.append(professional)
+        db.flush()
+        ProjectAllocationService(db).create_allocations(
+            project=project,
+            allocations=[
+                {"professional": professional, "allocation_percentage": 50.0}
+                for professional in professionals
+            ],
+        )
+        db.commit()
+        return project.id
+    finally:
+        db.close()
+
+
+def load_project(db, project_id):
+    return (
+        db.query(models.Project)
+        .options(
+            joinedload(models.Project.allocations).joinedload(
+                models.ProjectAllocation.professional
+            ),
+            joinedload(models.Project.allocations).joinedload(
+                models.ProjectAllocation.weekly_allocations
+            ),
+        )
+        .filter(models.Project.id == project_id)
+        .first()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--allocations", type=int, default=60)
+    parser.add_argument("--months", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    project_id = create_project(session_factory, args.allocations, args.months)
+
+    print(
+        f"Exporting project: {args.allocations} allocations x {args.months} months "
+        f"({engine.dialect.name})"
+    )
+    times, peaks = [], []
+    db = session_factory()
+    try:
+        project = load_project(db, project_id)
+        service = ExcelExportService(db)
+        for _ in range(args.repeat):
+            tracemalloc.start()
+            started = time.perf_counter()
+            output = service.export_project_to_excel(project)
+            size = len(output.read())
+            times.append(time.perf_counter() - started)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            output.close()
+    finally:
+        db.close()
+
+    print(
+        f"xlsx: render {min(times) * 1000:.1f} ms, "
+        f"file {size / 1024:,.0f} KiB, "
+        f"peak memory {min(peaks) / 1024:,.0f} KiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark for the consolidated portfolio workbook.
+Creates many projects and reports time and peak memory (tracemalloc, in a
+separate pass) of
+PortfolioExportService.portfolio_workbook, next to rendering every project
+with ExcelExportService one by one (what the workbook replaces).
+
+Usage:
+    python tests/benchmark_portfolio_export.py [--database-url URL]
+        [--projects 500] [--allocations 5] [--months 12]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import selectinload, sessionmaker  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models import models  # noqa: E402
+from app.services.excel_service import ExcelExportService  # noqa: E402
+from app.services.portfolio_export_service import (  # noqa: E402
+    PortfolioExportService,
+)
+from app.services.project_allocation_service import (  # noqa: E402
+    ProjectAllocationService,
+)
+
+
+def create_projects(session_factory, projects, allocations, months):
+    db = session_factory()
+    try:
+        service = ProjectAllocationService(db)
+        professionals = []
+        for index in range(allocations):
+            professional = models.Professional(
+                pid=f"BENCH-PORTFOLIO-{index}",
+                name=f"Benchmark {index}",
+                role="Dev",
+                level="Sr",
+                hourly_cost=100.0,
+            )
+            db.add(professional)
+            professionals.append(professional)
+        db.flush()
+
+        project_ids = []
+        for index in range(projects):
+            project = models.Project(
+                name=f"Benchmark portfolio {index}",
+                start_date=date(2025, 1, 1),
+                duration_months=months,
+                tax_rate=10.0,
+                margin_rate=20.0,
+            )
+            db.add(project)
+            db.flush()
+            service.create_allocations(
+                project=project,
+                allocations=[
+                    {"professional": professional, "allocation_percentage": 50.0}
+                    for professional in professionals
+                ],
+            )
+            project_ids.append(project.id)
+        db.commit()
+        return project_ids
+    finally:
+        db.close()
+
+
+def export_portfolio(db, project_ids):
+    output = PortfolioExportService(db).portfolio_workbook(project_ids)
+    size = len(output.read())
+    output.close()
+    return size
+
+
+def export_one_by_one(db, project_ids):
+    size = 0
+    service = ExcelExportService(db)
+    for project_id in project_ids:
+        project = (
+            db.query(models.Project)
+            .options(
+                selectinload(models.Project.allocations).options(
+                    selectinload(models.ProjectAllocation.professional),
+                    selectinload(models.ProjectAllocation.weekly_allocations),
+                )
+            )
+            .filter(models.Project.id == project_id)
+            .one()
+        )
+        output = service.export_project_to_excel(project)
+        size += len(output.read())
+        output.close()
+        db.expunge_all()
+    return size
+
+
+def run(session_factory, label, export, project_ids):
+    # Timed without tracemalloc (it slows allocation-heavy code several times)
+    db = session_factory()
+    try:
+        started = time.perf_counter()
+        size = export(db, project_ids)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    db = session_factory()
+    try:
+        tracemalloc.start()
+        export(db, project_ids)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        db.close()
+    print(
+        f"{label:>10}: {elapsed:.2f} s, "
+        f"output {size / 1024:,.0f} KiB, "
+        f"peak memory {peak / 1024:,.0f} KiB"
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--allocations", type=int, default=5)
+    parser.add_argument("--months", type=int, default=12)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    project_ids = create_projects(
+        session_factory, args.projects, args.allocations, args.months
+    )
+
+    print(
+        f"Exporting {args.projects} projects: {args.allocations} allocations x "
+        f"{args.months} months each ({engine.dialect.name})"
+    )
+    portfolio = run(session_factory, "portfolio", export_portfolio, project_ids)
+    one_by_one = run(session_factory, "one-by-one", export_one_by_one, project_ids)
+    print(f" portfolio: {one_by_one / portfolio:.1f}x faster than one-by-one")
+
+
+if __name__ == "__main__":
+    main()
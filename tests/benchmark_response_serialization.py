@@ -0,0 +1,142 @@
+"""
+Benchmark for project response serialization.
+Serializes a project with ~3,000 weekly allocation rows the way the former
+response_model path did (Pydantic validation + stdlib json), with
+pydantic-core to_json, and with the trusted serializer + orjson used by
+GET /projects/{id}.
+
+Usage:
+    python tests/benchmark_response_serialization.py [--database-url URL]
+        [--allocations 30] [--months 23] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import orjson  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import joinedload, sessionmaker  # noqa: E402
+
+from app import serializers  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models import models  # noqa: E402
+from app.schemas import schemas  # noqa: E402
+from app.services.project_allocation_service import (  # noqa: E402
+    ProjectAllocationService,
+)
+
+
+def create_project(db, allocations, months):
+    project = models.Project(
+        name="Benchmark serialization",
+        start_date=date(2025, 1, 1),
+        duration_months=months,
+        tax_rate=10.0,
+        margin_rate=20.0,
+    )
+    db.add(project)
+    db.flush()
+    professionals = [
+        models.Professional(
+            pid=f"BENCH-JSON-{index}",
+            name=f"Benchmark {index}",
+            role="Dev",
+            level="Sr",
+            hourly_cost=100.0,
+        )
+        for index in range(allocations)
+    ]
+    db.add_all(professionals)
+    db.flush()
+    ProjectAllocationService(db).create_allocations(
+        project=project,
+        allocations=[
+            {"professional": professional, "allocation_percentage": 50.0}
+            for professional in professionals
+        ],
+    )
+    db.commit()
+    return project.id
+
+
+def load_project(db, project_id):
+    return (
+        db.query(models.Project)
+        .options(
+            joinedload(models.Project.allocations).joinedload(
+                models.ProjectAllocation.professional
+            ),
+            joinedload(models.Project.allocations).joinedload(
+                models.ProjectAllocation.weekly_allocations
+            ),
+        )
+        .filter(models.Project.id == project_id)
+        .first()
+    )
+
+
+def response_model_json(project):
+    """Former path: response_model validation, then the stdlib encoder."""
+    payload = schemas.Project.model_validate(project).model_dump(mode="json")
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def pydantic_to_json(project):
+    return schemas.Project.model_validate(project).model_dump_json().encode("utf-8")
+
+
+def trusted_orjson(project):
+    return orjson.dumps(serializers.project_to_dict(project))
+
+
+def run(label, serialize, project, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = serialize(project)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    print(f"{label:>16}: {best * 1000:.1f} ms ({len(body) / 1024:,.0f} KiB)")
+    return best, body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--allocations", type=int, default=30)
+    parser.add_argument("--months", type=int, default=23)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = session_factory()
+    try:
+        project = load_project(db, create_project(db, args.allocations, args.months))
+        weeks = sum(len(a.weekly_allocations) for a in project.allocations)
+        print(f"Serializing project with {weeks} weekly rows ({engine.dialect.name})")
+
+        baseline, expected = run(
+            "response_model", response_model_json, project, args.repeat
+        )
+        for label, serialize in [
+            ("pydantic to_json", pydantic_to_json),
+            ("trusted orjson", trusted_orjson),
+        ]:
+            elapsed, body = run(label, serialize, project, args.repeat)
+            assert json.loads(body) == json.loads(expected)
+            print(f"{label:>16}: {baseline / elapsed:.1f}x faster")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark for ProjectAllocationService.sync_project_weeks.
+Shifts the start date (and duration) of a large project several times and
+compares the former per-row ORM implementation with the set-based one.
+
+Usage:
+    python tests/benchmark_sync_project_weeks.py [--database-url URL]
+        [--allocations 30] [--months 24]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import joinedload, sessionmaker  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models import models  # noqa: E402
+from app.services.project_allocation_service import (  # noqa: E402
+    ProjectAllocationService,
+)
+
+# (start_date, duration_months) applied in sequence to the project
+SHIFTS = [
+    (date(2025, 2, 17), 24),
+    (date(2025, 3, 3), 25),
+    (date(2024, 11, 4), 23),
+    (date(2025, 1, 6), 24),
+]
+
+
+def sync_per_row(service, project):
+    """Former implementation: load every week and update/delete/add it in Python."""
+    db = service.db
+    new_weeks = service.get_project_weeks(project)
+    new_weeks_map = {w["week_number"]: w for w in new_weeks}
+
+    allocations = (
+        db.query(models.ProjectAllocation)
+        .options(joinedload(models.ProjectAllocation.weekly_allocations))
+        .filter(models.ProjectAllocation.project_id == project.id)
+        .all()
+    )
+    for allocation in allocations:
+        existing_weeks = {w.week_number: w for w in allocation.weekly_allocations}
+        for week_num in existing_weeks.keys() & new_weeks_map.keys():
+            existing_weeks[week_num].available_hours = new_weeks_map[week_num][
+                "available_hours"
+            ]
+        for week_num in existing_weeks.keys() - new_weeks_map.keys():
+            db.delete(existing_weeks[week_num])
+        for week_num in sorted(new_weeks_map.keys() - existing_weeks.keys()):
+            db.add(
+                models.WeeklyAllocation(
+                    allocation_id=allocation.id,
+                    week_number=week_num,
+                    hours_allocated=0.0,
+                    available_hours=new_weeks_map[week_num]["available_hours"],
+                )
+            )
+    db.flush()
+
+
+def sync_set_based(service, project):
+    service.sync_project_weeks(project)
+    service.db.flush()
+
+
+def run(session_factory, label, sync, allocations, months):
+    db = session_factory()
+    try:
+        service = ProjectAllocationService(db)
+        project = models.Project(
+            name=f"Benchmark {label}",
+            start_date=date(2025, 1, 6),
+            duration_months=months,
+            tax_rate=0.0,
+            margin_rate=0.0,
+        )
+        db.add(project)
+        db.flush()
+        weeks = service.get_project_weeks(project)
+
+        for index in range(allocations):
+            professional = models.Professional(
+                pid=f"SYNC-{label}-{index}",
+                name=f"Benchmark {index}",
+                role="Dev",
+                level="Sr",
+                hourly_cost=100.0,
+            )
+            db.add(professional)
+            db.flush()
+            service.create_allocation(
+                project=project,
+                professional=professional,
+                allocation_percentage=50.0,
+                weeks=weeks,
+            )
+        db.flush()
+        rows = len(weeks) * allocations
+
+        started = time.perf_counter()
+        for start_date, duration_months in SHIFTS:
+            project.start_date = start_date
+            project.duration_months = duration_months
+            db.flush()
+            sync(service, project)
+            db.expire_all()
+        elapsed = time.perf_counter() - started
+
+        print(
+            f"{label:>10}: {len(SHIFTS)} shifts of ~{rows} rows in {elapsed:.3f}s "
+            f"({elapsed / len(SHIFTS) * 1000:.1f} ms/shift)"
+        )
+        return elapsed
+    finally:
+        db.rollback()
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--allocations", type=int, default=30)
+    parser.add_argument("--months", type=int, default=24)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    print(
+        f"Shifting project dates: {args.allocations} allocations x "
+        f"{args.months} months ({engine.dialect.name})"
+    )
+    before = run(
+        session_factory, "per-row", sync_per_row, args.allocations, args.months
+    )
+    after = run(
+        session_factory, "set-based", sync_set_based, args.allocations, args.months
+    )
+    print(f"Speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
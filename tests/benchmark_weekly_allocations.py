@@ -0,0 +1,135 @@
+"""
+Benchmark for WeeklyAllocation creation.
+Compares the former per-object ORM path (session.add per allocation and per
+week) with the bulk INSERTs of ProjectAllocationService.create_allocations.
+
+Usage:
+    python tests/benchmark_weekly_allocations.py [--database-url URL]
+        [--allocations 15] [--months 24]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models import models  # noqa: E402
+from app.services.project_allocation_service import (  # noqa: E402
+    ProjectAllocationService,
+)
+
+
+def create_per_object(db, project, professionals, weeks, allocation_percentage):
+    """Former implementation: one ORM object per allocation and per week."""
+    for professional in professionals:
+        allocation = models.ProjectAllocation(
+            project_id=project.id,
+            professional_id=professional.id,
+            cost_hourly_rate=professional.hourly_cost,
+            selling_hourly_rate=professional.hourly_cost,
+        )
+        db.add(allocation)
+        db.flush()
+        for week in weeks:
+            db.add(
+                models.WeeklyAllocation(
+                    allocation_id=allocation.id,
+                    week_number=week["week_number"],
+                    hours_allocated=week["available_hours"]
+                    * allocation_percentage
+                    / 100,
+                    available_hours=week["available_hours"],
+                )
+            )
+        db.flush()
+
+
+def create_bulk(db, project, professionals, weeks, allocation_percentage):
+    ProjectAllocationService(db).create_allocations(
+        project=project,
+        allocations=[
+            {
+                "professional": professional,
+                "allocation_percentage": allocation_percentage,
+            }
+            for professional in professionals
+        ],
+        weeks=weeks,
+    )
+    db.flush()
+
+
+def run(session_factory, label, create, allocations, months):
+    db = session_factory()
+    try:
+        service = ProjectAllocationService(db)
+        project = models.Project(
+            name=f"Benchmark {label}",
+            start_date=date(2025, 1, 1),
+            duration_months=months,
+            tax_rate=0.0,
+            margin_rate=0.0,
+        )
+        db.add(project)
+        db.flush()
+        weeks = service.get_project_weeks(project)
+
+        professionals = []
+        for index in range(allocations):
+            professional = models.Professional(
+                pid=f"BENCH-{label}-{index}",
+                name=f"Benchmark {index}",
+                role="Dev",
+                level="Sr",
+                hourly_cost=100.0,
+            )
+            db.add(professional)
+            professionals.append(professional)
+        db.flush()
+
+        started = time.perf_counter()
+        create(db, project, professionals, weeks, 100.0)
+        elapsed = time.perf_counter() - started
+
+        rows = len(weeks) * allocations
+        print(
+            f"{label:>10}: {rows} rows in {elapsed:.3f}s "
+            f"({rows / elapsed:,.0f} rows/s)"
+        )
+        return elapsed
+    finally:
+        db.rollback()
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--allocations", type=int, default=15)
+    parser.add_argument("--months", type=int, default=24)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    print(
+        f"Creating weekly allocations: {args.allocations} allocations x "
+        f"{args.months} months ({engine.dialect.name})"
+    )
+    before = run(
+        session_factory, "per-object", create_per_object, args.allocations, args.months
+    )
+    after = run(session_factory, "bulk", create_bulk, args.allocations, args.months)
+    print(f"Speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
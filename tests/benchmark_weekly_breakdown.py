@@ -0,0 +1,145 @@
+"""
+Benchmark and equivalence check for CalendarService._compute_weekly_breakdown.
+Compares the vectorized NumPy busday breakdown with the former day-by-day
+implementation over random (start_date, duration_months, hours_per_day)
+ranges, including ranges that start before or end after the precomputed
+calendar years, and reports the time of each. Exits with status 1 on the
+first mismatch.
+
+Usage:
+    python tests/benchmark_weekly_breakdown.py [--samples 500] [--seed 0]
+        [--start-year 2024] [--end-year 2026]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import holidays  # noqa: E402
+
+from app.services.calendar_service import CalendarService  # noqa: E402
+
+
+def breakdown_per_day(country_holidays, start_date, duration_months, hours_per_day):
+    """Former implementation: walk every day of every week in Python."""
+    end_date = start_date
+    for _ in range(duration_months):
+        if end_date.month == 12:
+            end_date = date(end_date.year + 1, 1, 1)
+        else:
+            end_date = date(end_date.year, end_date.month + 1, 1)
+
+    weeks = []
+    current_monday = start_date - timedelta(days=start_date.weekday())
+    week_number = 1
+    while current_monday < end_date:
+        business_days = 0
+        holidays_in_week = []
+        for day_offset in range(7):
+            current_date = current_monday + timedelta(days=day_offset)
+            if current_date in country_holidays:
+                holidays_in_week.append(current_date)
+            elif current_date.weekday() < 5:
+                business_days += 1
+
+        available_hours = business_days * hours_per_day
+        weeks.append(
+            {
+                "week_number": week_number,
+                "week_start": current_monday.isoformat(),
+                "week_end": (current_monday + timedelta(days=6)).isoformat(),
+                "business_days": (
+                    available_hours // hours_per_day if hours_per_day > 0 else 0
+                ),
+                "available_hours": available_hours,
+                "holidays": [h.isoformat() for h in holidays_in_week],
+            }
+        )
+        current_monday += timedelta(days=7)
+        week_number += 1
+    return weeks
+
+
+def random_ranges(samples, seed, start_year, end_year):
+    """Random ranges starting up to 3 years before and after the table."""
+    rng = random.Random(seed)
+    first = date(start_year - 3, 1, 1).toordinal()
+    last = date(end_year + 3, 12, 31).toordinal()
+    ranges = [
+        # Edge cases: crossing the first and the last precomputed year
+        (date(start_year - 1, 11, 15), 4, 8),
+        (date(end_year, 10, 1), 6, 8),
+        (date(start_year - 2, 1, 1), 12 * (end_year - start_year + 5), 8),
+    ]
+    while len(ranges) < samples:
+        ranges.append(
+            (
+                date.fromordinal(rng.randint(first, last)),
+                rng.randint(1, 36),
+                rng.choice([8, 8, 8, 6, 4, 0]),
+            )
+        )
+    return ranges
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start-year", type=int, default=2024)
+    parser.add_argument("--end-year", type=int, default=2026)
+    args = parser.parse_args()
+
+    logging.getLogger("app.services.calendar_service").setLevel(logging.WARNING)
+    calendar = CalendarService(
+        country_code="BR", start_year=args.start_year, end_year=args.end_year
+    )
+    country_holidays = holidays.country_holidays("BR")
+    ranges = random_ranges(args.samples, args.seed, args.start_year, args.end_year)
+
+    print(
+        f"Comparing {len(ranges)} weekly breakdowns "
+        f"(calendar precomputed for {args.start_year}-{args.end_year})"
+    )
+    per_day_time = vectorized_time = 0.0
+    weeks_compared = 0
+    for start_date, duration_months, hours_per_day in ranges:
+        started = time.perf_counter()
+        expected = breakdown_per_day(
+            country_holidays, start_date, duration_months, hours_per_day
+        )
+        per_day_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual = calendar._compute_weekly_breakdown(
+            start_date, duration_months, hours_per_day
+        )
+        vectorized_time += time.perf_counter() - started
+
+        if actual != expected:
+            mismatch = next(
+                (pair for pair in zip(expected, actual) if pair[0] != pair[1]),
+                (len(expected), len(actual)),
+            )
+            print(
+                f"❌ Mismatch for start_date={start_date}, "
+                f"duration_months={duration_months}, hours_per_day={hours_per_day}: "
+                f"expected {mismatch[0]}, got {mismatch[1]}"
+            )
+            sys.exit(1)
+        weeks_compared += len(expected)
+
+    print(f"✓ {weeks_compared} weeks identical")
+    print(f"   per-day: {per_day_time * 1000:.1f} ms")
+    print(f"vectorized: {vectorized_time * 1000:.1f} ms")
+    print(f"Speedup: {per_day_time / vectorized_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
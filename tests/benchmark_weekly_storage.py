@@ -0,0 +1,201 @@
+"""
+Benchmark for project reads with row-backed and compact weekly storage.
+Loads a portfolio-sized project the way GET /projects/{id} does in each
+WEEKLY_STORAGE_MODE (and with ?format=grid) and reports load time,
+serialization time, payload size and peak memory (tracemalloc) of the read.
+
+Usage:
+    python tests/benchmark_weekly_storage.py [--database-url URL]
+        [--allocations 30] [--months 24] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+import orjson
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import joinedload, selectinload, sessionmaker, undefer  # noqa: E402
+
+from app import serializers  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models import models  # noqa: E402
+from app.schemas import schemas  # noqa: E402
+from app.services.project_allocation_service import (  # noqa: E402
+    ProjectAllocationService,
+)
+
+
+def create_project(session_factory, allocations, months):
+    db = session_factory()
+    try:
+        service = ProjectAllocationService(db)
+        project = models.Project(
+            name="Benchmark storage",
+            start_date=date(2025, 1, 1),
+            duration_months=months,
+            tax_rate=10.0,
+            margin_rate=20.0,
+        )
+        db.add(project)
+        db.flush()
+        professionals = []
+        for index in range(allocations):
+            professional = models.Professional(
+                pid=f"BENCH-STORAGE-{index}",
+                name=f"Benchmark {index}",
+                role="Dev",
+                level="Sr",
+                hourly_cost=100.0,
+            )
+            db.add(professional)
+            professionals.append(professional)
+        db.flush()
+        service.create_allocations(
+            project=project,
+            allocations=[
+                {"professional": professional, "allocation_percentage": 50.0}
+                for professional in professionals
+            ],
+        )
+        db.commit()
+        return project.id
+    finally:
+        db.close()
+
+
+def read_rows(db, project_id):
+    project = (
+        db.query(models.Project)
+        .options(
+            joinedload(models.Project.allocations).joinedload(
+                models.ProjectAllocation.professional
+            ),
+            joinedload(models.Project.allocations).joinedload(
+                models.ProjectAllocation.weekly_allocations
+            ),
+        )
+        .filter(models.Project.id == project_id)
+        .first()
+    )
+    return project
+
+
+def read_compact(db, project_id):
+    project = (
+        db.query(models.Project)
+        .options(
+            selectinload(models.Project.allocations).options(
+                joinedload(models.ProjectAllocation.professional),
+                undefer(models.ProjectAllocation.weekly_hours_packed),
+            )
+        )
+        .filter(models.Project.id == project_id)
+        .first()
+    )
+    weekly_allocations = ProjectAllocationService(db).get_packed_weekly_allocations(
+        project.allocations
+    )
+    return serializers.project_to_dict(project, weekly_allocations)
+
+
+def read_grid(db, project_id):
+    project = (
+        db.query(models.Project)
+        .options(
+            selectinload(models.Project.allocations).options(
+                joinedload(models.ProjectAllocation.professional),
+                undefer(models.ProjectAllocation.weekly_hours_packed),
+            )
+        )
+        .filter(models.Project.id == project_id)
+        .first()
+    )
+    service = ProjectAllocationService(db)
+    return serializers.project_to_grid(
+        project,
+        service.get_project_weeks(project),
+        service.get_packed_weekly_records(project.allocations),
+    )
+
+
+def serialize_validated(loaded):
+    return json.dumps(schemas.Project.model_validate(loaded).model_dump(mode="json"))
+
+
+def run(session_factory, label, read, serialize, project_id, repeat):
+    load_times, serialize_times, peaks = [], [], []
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            tracemalloc.start()
+            started = time.perf_counter()
+            loaded = read(db, project_id)
+            loaded_at = time.perf_counter()
+            payload = serialize(loaded)
+            finished = time.perf_counter()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        finally:
+            db.close()
+        load_times.append(loaded_at - started)
+        serialize_times.append(finished - loaded_at)
+
+    print(
+        f"{label:>8}: load {min(load_times) * 1000:.1f} ms, "
+        f"serialize {min(serialize_times) * 1000:.1f} ms, "
+        f"payload {len(payload) / 1024:,.0f} KiB, "
+        f"peak memory {min(peaks) / 1024:,.0f} KiB"
+    )
+    return min(load_times) + min(serialize_times), min(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--allocations", type=int, default=30)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Maintain and read the packed column (read_rows ignores it either way)
+    serializers.WEEKLY_STORAGE_MODE = "compact"
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    project_id = create_project(session_factory, args.allocations, args.months)
+
+    print(
+        f"Reading project: {args.allocations} allocations x {args.months} months "
+        f"({engine.dialect.name})"
+    )
+    rows_time, rows_peak = run(
+        session_factory,
+        "rows",
+        read_rows,
+        serialize_validated,
+        project_id,
+        args.repeat,
+    )
+    for label, read, serialize in [
+        ("compact", read_compact, serialize_validated),
+        ("grid", read_grid, orjson.dumps),
+    ]:
+        elapsed, peak = run(
+            session_factory, label, read, serialize, project_id, args.repeat
+        )
+        print(
+            f"{label:>8}: {rows_time / elapsed:.1f}x faster, "
+            f"{rows_peak / peak:.1f}x less memory than rows"
+        )
+
+
+if __name__ == "__main__":
+    main()
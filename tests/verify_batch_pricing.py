@@ -0,0 +1,78 @@
+import requests
+import datetime
+
+BASE_URL = "http://localhost:8080"
+
+
+def verify_batch_pricing():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+
+    # 1. Create a professional
+    prof_data = {
+        "name": f"Test Prof Batch {timestamp}",
+        "role": "Developer",
+        "level": "Senior",
+        "hourly_cost": 100.0,
+        "pid": f"BATCH_{timestamp}",
+    }
+    resp = requests.post(f"{BASE_URL}/professionals/", json=prof_data)
+    prof_id = resp.json()["id"]
+    print(f"✓ Created professional with ID: {prof_id}")
+
+    # 2. Create two projects, only the first one with the professional allocated
+    project_ids = []
+    for index in range(2):
+        project_data = {
+            "name": f"Batch Pricing Project {index} {timestamp}",
+            "start_date": datetime.date.today().isoformat(),
+            "duration_months": 2,
+            "tax_rate": 10.0,
+            "margin_rate": 20.0,
+        }
+        resp = requests.post(f"{BASE_URL}/projects/", json=project_data)
+        project_ids.append(resp.json()["id"])
+    print(f"✓ Created projects with IDs: {project_ids}")
+
+    resp = requests.post(
+        f"{BASE_URL}/projects/{project_ids[0]}/allocations/?professional_id={prof_id}"
+    )
+    assert resp.status_code == 200
+    print("✓ Added professional to the first project")
+
+    try:
+        # 3. Batch pricing must match the single-project endpoint
+        missing_id = max(project_ids) + 100000
+        resp = requests.post(
+            f"{BASE_URL}/projects/pricing/batch",
+            json={"project_ids": project_ids + [missing_id]},
+        )
+        assert resp.status_code == 200
+        batch = resp.json()
+        print(f"✓ Batch pricing returned {len(batch['items'])} projects")
+
+        for project_id in project_ids:
+            single = requests.get(f"{BASE_URL}/projects/{project_id}/pricing").json()
+            assert batch["items"][str(project_id)] == single
+            print(f"✓ Project {project_id}: final_price={single['final_price']:.2f}")
+
+        assert batch["items"][str(project_ids[0])]["total_cost"] > 0
+        assert batch["items"][str(project_ids[1])]["total_cost"] == 0
+        assert batch["not_found"] == [missing_id]
+        print(f"✓ Unknown project reported in not_found: {batch['not_found']}")
+    finally:
+        for project_id in project_ids:
+            requests.delete(f"{BASE_URL}/projects/{project_id}")
+        requests.delete(f"{BASE_URL}/professionals/{prof_id}")
+
+    print("\n✅ Batch pricing works correctly!")
+
+
+if __name__ == "__main__":
+    try:
+        verify_batch_pricing()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        exit(1)
@@ -0,0 +1,83 @@
+import requests
+import datetime
+
+BASE_URL = "http://localhost:8080"
+
+
+def verify_bulk_delete():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+
+    # 1. Create a professional
+    prof_data = {
+        "name": f"Test Prof Bulk Delete {timestamp}",
+        "role": "Developer",
+        "level": "Senior",
+        "hourly_cost": 100.0,
+        "pid": f"BULKDEL_{timestamp}",
+    }
+    resp = requests.post(f"{BASE_URL}/professionals/", json=prof_data)
+    prof_id = resp.json()["id"]
+    print(f"✓ Created professional with ID: {prof_id}")
+
+    # 2. Create three projects with the professional allocated
+    project_ids = []
+    for index in range(3):
+        project_data = {
+            "name": f"Bulk Delete Project {index} {timestamp}",
+            "start_date": datetime.date.today().isoformat(),
+            "duration_months": 2,
+            "tax_rate": 10.0,
+            "margin_rate": 20.0,
+            "allocations": [{"professional_id": prof_id}],
+        }
+        resp = requests.post(f"{BASE_URL}/projects/", json=project_data)
+        assert resp.status_code == 200
+        project_ids.append(resp.json()["id"])
+    print(f"✓ Created projects with IDs: {project_ids}")
+
+    # 3. Lock the last project
+    locked_id = project_ids[-1]
+    resp = requests.patch(f"{BASE_URL}/projects/{locked_id}", json={"locked": True})
+    assert resp.status_code == 200
+    print(f"✓ Locked project {locked_id}")
+
+    try:
+        # 4. Bulk delete skips locked and unknown projects
+        missing_id = max(project_ids) + 100000
+        resp = requests.delete(
+            f"{BASE_URL}/projects/",
+            json={"project_ids": project_ids + [missing_id]},
+        )
+        assert resp.status_code == 200
+        result = resp.json()
+        assert result["deleted"] == project_ids[:-1]
+        assert result["locked"] == [locked_id]
+        assert result["not_found"] == [missing_id]
+        print(f"✓ Bulk delete result: {result}")
+
+        for project_id in project_ids[:-1]:
+            resp = requests.get(f"{BASE_URL}/projects/{project_id}")
+            assert resp.status_code == 404
+        print("✓ Deleted projects are gone (allocations removed by cascade)")
+
+        resp = requests.get(f"{BASE_URL}/projects/{locked_id}")
+        assert resp.status_code == 200
+        assert len(resp.json()["allocations"]) == 1
+        print("✓ Locked project kept its allocations")
+    finally:
+        requests.patch(f"{BASE_URL}/projects/{locked_id}", json={"locked": False})
+        requests.delete(f"{BASE_URL}/projects/{locked_id}")
+        requests.delete(f"{BASE_URL}/professionals/{prof_id}")
+
+    print("\n✅ Bulk project deletion works correctly!")
+
+
+if __name__ == "__main__":
+    try:
+        verify_bulk_delete()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        exit(1)
@@ -0,0 +1,67 @@
+import requests
+import datetime
+import time
+
+BASE_URL = "http://localhost:8080"
+
+
+def verify_csv_import_async():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+    pids = [f"ASYNC_{timestamp}_{index}" for index in range(3)]
+
+    # 1. Queue the import (the last line is invalid)
+    csv_content = "pid,name,role,level,is_template,hourly_cost\n"
+    csv_content += "".join(
+        f"{pid},Async Import {index},Desenvolvedor,Pleno,false,100.00\n"
+        for index, pid in enumerate(pids)
+    )
+    csv_content += ",Sem PID,Desenvolvedor,Pleno,false,100.00\n"
+
+    files = {"file": ("async_professionals.csv", csv_content, "text/csv")}
+    resp = requests.post(
+        f"{BASE_URL}/professionals/import-csv", params={"async": "true"}, files=files
+    )
+    assert resp.status_code == 202
+    job_id = resp.json()["job_id"]
+    print(f"✓ Import queued as job {job_id}")
+
+    try:
+        # 2. Poll until the job finishes
+        for _ in range(60):
+            job = requests.get(f"{BASE_URL}/jobs/{job_id}").json()
+            if job["status"] in ("succeeded", "failed"):
+                break
+            time.sleep(0.5)
+        assert job["status"] == "succeeded", job
+        print(f"✓ Job finished: {job['progress']}")
+
+        progress = job["progress"]
+        assert progress["rows_processed"] == 4
+        assert progress["created"] == 3
+        assert progress["errors"] == 1
+        assert progress["error_details"][0].startswith("Linha 5:")
+        print("✓ Counts and per-line errors reported")
+
+        resp = requests.get(f"{BASE_URL}/jobs/does-not-exist")
+        assert resp.status_code == 404
+        print("✓ Unknown job returns 404")
+    finally:
+        professionals = requests.get(
+            f"{BASE_URL}/professionals/", params={"search": f"ASYNC_{timestamp}"}
+        ).json()["items"]
+        for professional in professionals:
+            if professional["pid"] in pids:
+                requests.delete(f"{BASE_URL}/professionals/{professional['id']}")
+
+    print("\n✅ Background CSV import works correctly!")
+
+
+if __name__ == "__main__":
+    try:
+        verify_csv_import_async()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        exit(1)
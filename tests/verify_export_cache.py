@@ -0,0 +1,91 @@
+import requests
+import datetime
+
+BASE_URL = "http://localhost:8080"
+
+
+def verify_export_cache():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+
+    # 1. Create a project with one allocation
+    professional = requests.post(
+        f"{BASE_URL}/professionals/",
+        json={
+            "pid": f"CACHE_{timestamp}",
+            "name": "Export Cache",
+            "role": "Desenvolvedor",
+            "level": "Pleno",
+            "hourly_cost": 100.0,
+        },
+    ).json()
+    project = requests.post(
+        f"{BASE_URL}/projects/",
+        json={
+            "name": f"Export Cache {timestamp}",
+            "start_date": "2025-01-01",
+            "duration_months": 2,
+            "tax_rate": 11.0,
+            "margin_rate": 40.0,
+        },
+    ).json()
+    project_id = project["id"]
+
+    try:
+        resp = requests.post(
+            f"{BASE_URL}/projects/{project_id}/allocations/",
+            params={"professional_id": professional["id"]},
+        )
+        assert resp.status_code == 200
+        print("✓ Project created with one allocation")
+
+        # 2. Repeated exports share the ETag and answer 304 when it matches
+        first = requests.get(f"{BASE_URL}/projects/{project_id}/export")
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+        second = requests.get(f"{BASE_URL}/projects/{project_id}/export")
+        assert second.headers["ETag"] == etag
+        assert second.content == first.content
+        print(f"✓ Unchanged project served from cache: ETag {etag}")
+
+        resp = requests.get(
+            f"{BASE_URL}/projects/{project_id}/export",
+            headers={"If-None-Match": etag},
+        )
+        assert resp.status_code == 304
+        print("✓ If-None-Match returns 304")
+
+        png = requests.get(
+            f"{BASE_URL}/projects/{project_id}/export", params={"format": "png"}
+        )
+        assert png.status_code == 200
+        assert png.headers["ETag"] != etag
+        print("✓ Each format has its own ETag")
+
+        # 3. A pricing change produces a new export
+        resp = requests.patch(
+            f"{BASE_URL}/projects/{project_id}", json={"margin_rate": 35.0}
+        )
+        assert resp.status_code == 200
+        resp = requests.get(
+            f"{BASE_URL}/projects/{project_id}/export",
+            headers={"If-None-Match": etag},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etag
+        print("✓ Changed project is rendered again")
+    finally:
+        requests.delete(f"{BASE_URL}/projects/{project_id}")
+        requests.delete(f"{BASE_URL}/professionals/{professional['id']}")
+
+    print("\n✅ Export cache works correctly!")
+
+
+if __name__ == "__main__":
+    try:
+        verify_export_cache()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        exit(1)
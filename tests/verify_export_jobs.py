@@ -0,0 +1,91 @@
+import requests
+import datetime
+import time
+from io import BytesIO
+from openpyxl import load_workbook
+
+BASE_URL = "http://localhost:8080"
+
+
+def wait_for_export(job_id):
+    for _ in range(120):
+        job = requests.get(f"{BASE_URL}/exports/{job_id}").json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.5)
+    raise AssertionError(f"Export job {job_id} did not finish")
+
+
+def verify_export_jobs():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+
+    project = requests.post(
+        f"{BASE_URL}/projects/",
+        json={
+            "name": f"Export Job {timestamp}",
+            "start_date": "2025-01-01",
+            "duration_months": 3,
+            "tax_rate": 11.0,
+            "margin_rate": 40.0,
+        },
+    ).json()
+    project_id = project["id"]
+
+    try:
+        # 1. Queue XLSX and PNG exports
+        job_ids = {}
+        for export_format in ("xlsx", "png"):
+            resp = requests.post(
+                f"{BASE_URL}/projects/{project_id}/exports",
+                params={"format": export_format},
+            )
+            assert resp.status_code == 202
+            job_ids[export_format] = resp.json()["job_id"]
+        print(f"✓ Exports queued: {job_ids}")
+
+        # 2. Poll and download
+        for export_format, job_id in job_ids.items():
+            job = wait_for_export(job_id)
+            assert job["status"] == "succeeded", job
+            assert job["result"]["filename"].endswith(f".{export_format}")
+            resp = requests.get(f"{BASE_URL}/exports/{job_id}/download")
+            assert resp.status_code == 200
+            assert resp.headers["content-type"] == job["result"]["media_type"]
+            assert "attachment" in resp.headers["content-disposition"]
+            print(
+                f"✓ {export_format} rendered and downloaded ({len(resp.content)} bytes)"
+            )
+
+        workbook = load_workbook(
+            BytesIO(
+                requests.get(f"{BASE_URL}/exports/{job_ids['xlsx']}/download").content
+            )
+        )
+        assert workbook["Informações do Projeto"]["B2"].value == project["name"]
+        print("✓ Downloaded workbook has the project data")
+
+        # 3. Errors
+        resp = requests.post(
+            f"{BASE_URL}/projects/{project_id}/exports", params={"format": "pdf"}
+        )
+        assert resp.status_code == 400
+        resp = requests.post(f"{BASE_URL}/projects/999999999/exports")
+        assert resp.status_code == 404
+        resp = requests.get(f"{BASE_URL}/exports/does-not-exist")
+        assert resp.status_code == 404
+        print("✓ Invalid format, unknown project and unknown job rejected")
+    finally:
+        requests.delete(f"{BASE_URL}/projects/{project_id}")
+
+    print("\n✅ Export jobs work correctly!")
+
+
+if __name__ == "__main__":
+    try:
+        verify_export_jobs()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        exit(1)
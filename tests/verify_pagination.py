@@ -0,0 +1,90 @@
+import requests
+import datetime
+
+BASE_URL = "http://localhost:8080"
+
+
+def walk_pages(path, limit):
+    """Follow next_cursor until the last page, returning all ids in order."""
+    ids = []
+    cursor = None
+    while True:
+        params = {"limit": limit, "include_total": "false"}
+        if cursor:
+            params["cursor"] = cursor
+        resp = requests.get(f"{BASE_URL}{path}", params=params)
+        assert resp.status_code == 200
+        page = resp.json()
+        assert page["total"] is None
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return ids
+
+
+def verify_pagination():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+
+    # 1. Create professionals with colliding names (ties are broken by id)
+    prof_ids = []
+    for index, name in enumerate(["Zeca", "zeca", "ZECA", "Abel", "abel"]):
+        prof_data = {
+            "name": f"{name} Cursor {timestamp}",
+            "role": "Developer",
+            "level": "Senior",
+            "hourly_cost": 100.0,
+            "pid": f"CURSOR_{timestamp}_{index}",
+        }
+        resp = requests.post(f"{BASE_URL}/professionals/", json=prof_data)
+        assert resp.status_code == 200
+        prof_ids.append(resp.json()["id"])
+    print(f"✓ Created professionals with IDs: {prof_ids}")
+
+    try:
+        # 2. Walking the cursor returns the same sequence as one big page
+        resp = requests.get(f"{BASE_URL}/professionals/", params={"limit": 100000})
+        assert resp.status_code == 200
+        full = resp.json()
+        expected = [item["id"] for item in full["items"]]
+        assert full["total"] == len(expected)
+        assert full["next_cursor"] is None
+
+        for limit in (1, 2, 7):
+            assert walk_pages("/professionals/", limit) == expected
+        print(f"✓ Cursor pages match the full listing ({len(expected)} items)")
+
+        assert walk_pages("/projects/", 3) == [
+            item["id"]
+            for item in requests.get(
+                f"{BASE_URL}/projects/", params={"limit": 100000}
+            ).json()["items"]
+        ]
+        print("✓ Project cursor pages match the full listing")
+
+        # 3. Invalid cursors are rejected
+        resp = requests.get(f"{BASE_URL}/professionals/", params={"cursor": "nope"})
+        assert resp.status_code == 400
+        print("✓ Invalid cursor rejected")
+
+        # 4. Empty or negative pages are rejected instead of failing
+        for path in ("/professionals/", "/projects/"):
+            for params in ({"limit": 0}, {"limit": -1}, {"skip": -1}):
+                resp = requests.get(f"{BASE_URL}{path}", params=params)
+                assert resp.status_code == 422, (path, params, resp.status_code)
+        print("✓ limit < 1 and negative skip rejected")
+    finally:
+        for prof_id in prof_ids:
+            requests.delete(f"{BASE_URL}/professionals/{prof_id}")
+
+    print("\n✅ Cursor pagination works correctly!")
+
+
+if __name__ == "__main__":
+    try:
+        verify_pagination()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        exit(1)
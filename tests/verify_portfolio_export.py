@@ -0,0 +1,95 @@
+import requests
+import datetime
+from io import BytesIO
+from openpyxl import load_workbook
+
+BASE_URL = "http://localhost:8080"
+
+
+def verify_portfolio_export():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+
+    professional = requests.post(
+        f"{BASE_URL}/professionals/",
+        json={
+            "pid": f"PORTFOLIO_{timestamp}",
+            "name": "Portfolio Export",
+            "role": "Desenvolvedor",
+            "level": "Pleno",
+            "hourly_cost": 100.0,
+        },
+    ).json()
+    project_ids = []
+    for index in range(2):
+        project = requests.post(
+            f"{BASE_URL}/projects/",
+            json={
+                "name": f"Portfolio {timestamp} {index}",
+                "start_date": "2025-01-01",
+                "duration_months": 2,
+                "tax_rate": 11.0,
+                "margin_rate": 40.0,
+            },
+        ).json()
+        project_ids.append(project["id"])
+        resp = requests.post(
+            f"{BASE_URL}/projects/{project['id']}/allocations/",
+            params={"professional_id": professional["id"]},
+        )
+        assert resp.status_code == 200
+    print(f"✓ Projects created: {project_ids}")
+
+    try:
+        resp = requests.post(
+            f"{BASE_URL}/projects/exports/portfolio",
+            json={"project_ids": project_ids},
+        )
+        assert resp.status_code == 200
+        assert (
+            resp.headers["content-type"]
+            == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+        workbook = load_workbook(BytesIO(resp.content))
+        assert workbook.sheetnames[0] == "Resumo"
+        assert len(workbook.sheetnames) == 3
+        print(f"✓ Workbook sheets: {workbook.sheetnames}")
+
+        # Summary totals match the pricing endpoint
+        summary = list(workbook["Resumo"].iter_rows(min_row=2, values_only=True))
+        assert [row[0] for row in summary] == project_ids
+        for row in summary:
+            pricing = requests.get(f"{BASE_URL}/projects/{row[0]}/pricing").json()
+            assert abs(row[10] - pricing["final_price"]) < 0.01
+        print("✓ Summary rows match project pricing")
+
+        # One allocation table per project
+        for sheet_name in workbook.sheetnames[1:]:
+            sheet = workbook[sheet_name]
+            assert sheet["A1"].value == "ID"
+            assert sheet["B2"].value == professional["name"]
+        print("✓ Allocation sheets list the allocated professional")
+
+        resp = requests.post(
+            f"{BASE_URL}/projects/exports/portfolio",
+            json={"search": f"Portfolio {timestamp}"},
+        )
+        assert resp.status_code == 200
+        assert len(load_workbook(BytesIO(resp.content)).sheetnames) == 3
+        print("✓ Search filter selects the same projects")
+    finally:
+        for project_id in project_ids:
+            requests.delete(f"{BASE_URL}/projects/{project_id}")
+        requests.delete(f"{BASE_URL}/professionals/{professional['id']}")
+
+    print("\n✅ Portfolio workbook export works correctly!")
+
+
+if __name__ == "__main__":
+    try:
+        verify_portfolio_export()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        exit(1)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Verification script for the stored pricing totals (total_hours, total_cost,
+total_selling of projects and allocations).
+Changes a project through every write path that maintains the totals and
+checks them against the weekly allocations with PricingService.check_totals,
+then corrupts a total and checks that rebuild_totals repairs it.
+
+Run from the repository root with the server's DATABASE_URL, since the
+checks read the database directly.
+"""
+
+import datetime
+import os
+import sys
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import update  # noqa: E402
+
+from app import database  # noqa: E402
+from app.models import models  # noqa: E402
+from app.services.pricing_service import PricingService  # noqa: E402
+
+BASE_URL = "http://localhost:8080"
+
+
+def make_request(method, endpoint, data=None):
+    url = f"{BASE_URL}{endpoint}"
+    resp = requests.request(method, url, json=data)
+    if resp.status_code not in [200, 201]:
+        print(f"Error: {method} {endpoint} returned {resp.status_code}")
+        print(resp.text)
+        sys.exit(1)
+    return resp.json() if resp.text else {}
+
+
+def assert_totals_match(project_ids, step):
+    db = database.SessionLocal()
+    try:
+        mismatches = PricingService(db).check_totals(project_ids)
+    finally:
+        db.close()
+    if mismatches:
+        print(f"   ❌ Totais divergentes após {step}: {mismatches}")
+        sys.exit(1)
+    print(f"   ✓ Totais conferem após {step}")
+
+
+def verify_pricing_totals():
+    print("=" * 60)
+    print("VERIFICAÇÃO DOS TOTAIS DE PRECIFICAÇÃO ARMAZENADOS")
+    print("=" * 60)
+
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+    professional_ids = []
+    project_ids = []
+    offer_id = None
+
+    try:
+        # 1. Professionals and an offer
+        print("\n1. Criando profissionais e oferta...")
+        for index, hourly_cost in enumerate([100.0, 80.0]):
+            professional = make_request(
+                "POST",
+                "/professionals/",
+                data={
+                    "pid": f"TOTALS{timestamp}{index}",
+                    "name": f"Test Prof Totals {timestamp} {index}",
+                    "role": "Developer",
+                    "level": "Senior",
+                    "hourly_cost": hourly_cost,
+                },
+            )
+            professional_ids.append(professional["id"])
+        offer = make_request(
+            "POST",
+            "/offers/",
+            data={
+                "name": f"Test Offer Totals {timestamp}",
+                "items": [
+                    {
+                        "professional_id": professional_ids[1],
+                        "allocation_percentage": 50.0,
+                    }
+                ],
+            },
+        )
+        offer_id = offer["id"]
+        print(f"   ✓ Profissionais {professional_ids}, oferta {offer_id}")
+
+        # 2. Project with one allocation
+        print("\n2. Criando projeto com alocação...")
+        project = make_request(
+            "POST",
+            "/projects/",
+            data={
+                "name": f"Test Project Totals {timestamp}",
+                "start_date": "2025-01-06",
+                "duration_months": 3,
+                "tax_rate": 11.0,
+                "margin_rate": 40.0,
+                "allocations": [{"professional_id": professional_ids[0]}],
+            },
+        )
+        project_id = project["id"]
+        project_ids.append(project_id)
+        assert_totals_match(project_ids, "criação")
+
+        # 3. PATCH weekly hours and selling rate
+        print("\n3. Alterando horas semanais e taxa de venda...")
+        allocation = make_request("GET", f"/projects/{project_id}")["allocations"][0]
+        weeks = allocation["weekly_allocations"]
+        make_request(
+            "PATCH",
+            f"/projects/{project_id}/allocations",
+            data=[
+                {"weekly_allocation_id": weeks[0]["id"], "hours_allocated": 12.5},
+                {"weekly_allocation_id": weeks[1]["id"], "hours_allocated": 40.0},
+                {"allocation_id": allocation["id"], "selling_hourly_rate": 250.0},
+            ],
+        )
+        assert_totals_match(project_ids, "PATCH de horas e taxas")
+
+        # 4. Apply the offer
+        print("\n4. Aplicando oferta...")
+        make_request(
+            "POST", f"/projects/{project_id}/offers", data={"offer_id": offer_id}
+        )
+        assert_totals_match(project_ids, "aplicação de oferta")
+
+        # 5. Shift the dates and shorten the project
+        print("\n5. Deslocando datas e reduzindo a duração...")
+        make_request(
+            "PATCH",
+            f"/projects/{project_id}",
+            data={"start_date": "2025-02-03", "duration_months": 2},
+        )
+        assert_totals_match(project_ids, "deslocamento de datas")
+
+        # 6. Clone
+        print("\n6. Clonando projeto...")
+        clone = make_request(
+            "POST",
+            "/projects/",
+            data={
+                "name": f"Test Project Totals Clone {timestamp}",
+                "start_date": "2025-02-03",
+                "duration_months": 2,
+                "tax_rate": 11.0,
+                "margin_rate": 40.0,
+                "from_project_id": project_id,
+            },
+        )
+        project_ids.append(clone["id"])
+        assert_totals_match(project_ids, "clonagem")
+
+        # 7. Remove an allocation
+        print("\n7. Removendo alocação...")
+        make_request("DELETE", f"/projects/{project_id}/allocations/{allocation['id']}")
+        assert_totals_match(project_ids, "remoção de alocação")
+
+        # 8. Corrupt the stored totals and rebuild them
+        print("\n8. Corrompendo e reconstruindo os totais...")
+        db = database.SessionLocal()
+        try:
+            db.execute(
+                update(models.Project)
+                .where(models.Project.id == project_id)
+                .values(total_cost=models.Project.total_cost + 1000.0)
+            )
+            # Allocation totals only feed the project totals on rebuild
+            db.execute(
+                update(models.ProjectAllocation)
+                .where(models.ProjectAllocation.project_id == clone["id"])
+                .values(total_hours=0.0, total_selling=0.0)
+            )
+            db.commit()
+            pricing_service = PricingService(db)
+            mismatches = pricing_service.check_totals(project_ids)
+            if {m["project_id"] for m in mismatches} != {project_id}:
+                print(f"   ❌ Corrupção não detectada: {mismatches}")
+                sys.exit(1)
+            print("   ✓ check_totals detectou o total corrompido")
+            pricing_service.rebuild_totals(project_ids)
+            db.commit()
+        finally:
+            db.close()
+        assert_totals_match(project_ids, "rebuild_totals")
+    finally:
+        for cleanup_id in project_ids:
+            requests.delete(f"{BASE_URL}/projects/{cleanup_id}")
+        if offer_id is not None:
+            requests.delete(f"{BASE_URL}/offers/{offer_id}")
+        for professional_id in professional_ids:
+            requests.delete(f"{BASE_URL}/professionals/{professional_id}")
+
+    print("\n✅ Stored pricing totals stay consistent!")
+
+
+if __name__ == "__main__":
+    try:
+        verify_pricing_totals()
+    except Exception as e:
+        print(f"\n❌ Error during verification: {e}")
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
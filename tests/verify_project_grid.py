@@ -0,0 +1,84 @@
+import requests
+import datetime
+
+BASE_URL = "http://localhost:8080"
+
+
+def verify_project_grid():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+
+    # 1. Create a professional
+    prof_data = {
+        "name": f"Test Prof Grid {timestamp}",
+        "role": "Developer",
+        "level": "Senior",
+        "hourly_cost": 100.0,
+        "pid": f"GRID_{timestamp}",
+    }
+    resp = requests.post(f"{BASE_URL}/professionals/", json=prof_data)
+    prof_id = resp.json()["id"]
+    print(f"✓ Created professional with ID: {prof_id}")
+
+    # 2. Create a project with the professional allocated
+    project_data = {
+        "name": f"Grid Project {timestamp}",
+        "start_date": datetime.date.today().isoformat(),
+        "duration_months": 3,
+        "tax_rate": 10.0,
+        "margin_rate": 20.0,
+        "allocations": [{"professional_id": prof_id}],
+    }
+    resp = requests.post(f"{BASE_URL}/projects/", json=project_data)
+    assert resp.status_code == 200
+    project = resp.json()
+    project_id = project["id"]
+    print(f"✓ Created project with ID: {project_id}")
+
+    try:
+        # 3. Set hours on the second week
+        weekly = sorted(
+            project["allocations"][0]["weekly_allocations"],
+            key=lambda week: week["week_number"],
+        )
+        resp = requests.patch(
+            f"{BASE_URL}/projects/{project_id}/allocations",
+            json=[{"weekly_allocation_id": weekly[1]["id"], "hours_allocated": 12.5}],
+        )
+        assert resp.status_code == 200
+        print("✓ Updated hours of week 2")
+
+        # 4. Grid format carries the same data as flat arrays
+        resp = requests.get(f"{BASE_URL}/projects/{project_id}?format=grid")
+        assert resp.status_code == 200
+        grid = resp.json()
+        week_numbers = grid["weeks"]["week_number"]
+        assert week_numbers == [week["week_number"] for week in weekly]
+        assert len(grid["weeks"]["week_start"]) == len(week_numbers)
+        print(f"✓ Grid has {len(week_numbers)} week headers")
+
+        allocation = grid["allocations"][0]
+        assert allocation["professional"]["id"] == prof_id
+        assert allocation["weekly_allocation_ids"] == [week["id"] for week in weekly]
+        assert allocation["hours"][1] == 12.5
+        assert sum(allocation["hours"]) == 12.5
+        print(f"✓ Allocation hours array: {allocation['hours'][:4]}...")
+
+        resp = requests.get(f"{BASE_URL}/projects/{project_id}?format=xml")
+        assert resp.status_code == 422
+        print("✓ Unknown format rejected")
+    finally:
+        requests.delete(f"{BASE_URL}/projects/{project_id}")
+        requests.delete(f"{BASE_URL}/professionals/{prof_id}")
+
+    print("\n✅ Project grid format works correctly!")
+
+
+if __name__ == "__main__":
+    try:
+        verify_project_grid()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        exit(1)
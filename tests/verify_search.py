@@ -0,0 +1,72 @@
+import requests
+import datetime
+
+BASE_URL = "http://localhost:8080"
+
+
+def search(path, term, **params):
+    resp = requests.get(f"{BASE_URL}{path}", params={"search": term, **params})
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def verify_search():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+
+    # 1. Create professionals with distinctive names, roles and pids
+    prof_ids = []
+    for index, (name, role) in enumerate(
+        [("Quiteria Trigrama", "Developer"), ("Quiteria Trigramas", "Arquiteto")]
+    ):
+        prof_data = {
+            "name": f"{name} {timestamp}",
+            "role": role,
+            "level": "Senior",
+            "hourly_cost": 100.0,
+            "pid": f"TRGM_{timestamp}_{index}",
+        }
+        resp = requests.post(f"{BASE_URL}/professionals/", json=prof_data)
+        assert resp.status_code == 200
+        prof_ids.append(resp.json()["id"])
+    print(f"✓ Created professionals with IDs: {prof_ids}")
+
+    try:
+        # 2. Substring and fuzzy matches on name
+        result = search("/professionals/", "quiteria trigrama")
+        ids = [item["id"] for item in result["items"]]
+        assert set(prof_ids) <= set(ids)
+        print(f"✓ Name search found {result['total']} professional(s)")
+
+        result = search("/professionals/", "quitera trigrama")
+        assert set(prof_ids) <= {item["id"] for item in result["items"]}
+        print("✓ Misspelled search still matches")
+
+        # 3. pid and role are searchable too
+        result = search("/professionals/", f"TRGM_{timestamp}_1")
+        assert result["items"][0]["id"] == prof_ids[1]
+        print("✓ Search by pid ranks the exact professional first")
+
+        # 4. Search results are paginated with a cursor
+        first = search("/professionals/", "quiteria trigrama", limit=1)
+        assert len(first["items"]) == 1 and first["next_cursor"]
+        second = search(
+            "/professionals/", "quiteria trigrama", limit=1, cursor=first["next_cursor"]
+        )
+        assert second["items"][0]["id"] != first["items"][0]["id"]
+        print("✓ Search cursor returns the next ranked result")
+    finally:
+        for prof_id in prof_ids:
+            requests.delete(f"{BASE_URL}/professionals/{prof_id}")
+
+    print("\n✅ Fuzzy search works correctly!")
+
+
+if __name__ == "__main__":
+    try:
+        verify_search()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        exit(1)
@@ -0,0 +1,72 @@
+import requests
+import datetime
+import zipfile
+from io import BytesIO
+
+BASE_URL = "http://localhost:8080"
+
+
+def verify_zip_export():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+
+    project_ids = []
+    for index in range(3):
+        project = requests.post(
+            f"{BASE_URL}/projects/",
+            json={
+                "name": f"ZIP Export {timestamp} {index}",
+                "start_date": "2025-01-01",
+                "duration_months": 2,
+                "tax_rate": 11.0,
+                "margin_rate": 40.0,
+            },
+        ).json()
+        project_ids.append(project["id"])
+    print(f"✓ Projects created: {project_ids}")
+
+    try:
+        # 1. Export by ids (one unknown id)
+        resp = requests.post(
+            f"{BASE_URL}/projects/exports/zip",
+            json={"project_ids": project_ids + [999999999]},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/zip"
+        archive = zipfile.ZipFile(BytesIO(resp.content))
+        assert archive.testzip() is None
+        names = archive.namelist()
+        for project_id in project_ids:
+            assert any(name.startswith(f"projeto_{project_id}_") for name in names)
+        assert "999999999" in archive.read("erros.txt").decode("utf-8")
+        print(f"✓ ZIP by ids has one workbook per project: {names}")
+
+        # 2. Export by search filter
+        resp = requests.post(
+            f"{BASE_URL}/projects/exports/zip",
+            json={"search": f"ZIP Export {timestamp}", "format": "png"},
+        )
+        assert resp.status_code == 200
+        names = zipfile.ZipFile(BytesIO(resp.content)).namelist()
+        assert len([name for name in names if name.endswith(".png")]) == 3
+        print("✓ ZIP by search has one image per matching project")
+
+        # 3. Invalid selection
+        resp = requests.post(f"{BASE_URL}/projects/exports/zip", json={})
+        assert resp.status_code == 422
+        print("✓ Request without project_ids or search rejected")
+    finally:
+        for project_id in project_ids:
+            requests.delete(f"{BASE_URL}/projects/{project_id}")
+
+    print("\n✅ ZIP export works correctly!")
+
+
+if __name__ == "__main__":
+    try:
+        verify_zip_export()
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        exit(1)